@@ -0,0 +1,30 @@
+"""book filter indexes
+
+Revision ID: 8f07ef31f1c9
+Revises: a206e558d37f
+Create Date: 2026-10-18 18:52:40.107361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f07ef31f1c9'
+down_revision: Union[str, None] = 'a206e558d37f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_books_author_id'), 'books', ['author_id'], unique=False)
+    op.create_index('ix_books_date_published_id', 'books', ['date_published', 'id'], unique=False)
+    op.create_index('ix_books_title_id', 'books', ['title', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_title_id', table_name='books')
+    op.drop_index('ix_books_date_published_id', table_name='books')
+    op.drop_index(op.f('ix_books_author_id'), table_name='books')
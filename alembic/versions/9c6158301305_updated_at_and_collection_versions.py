@@ -0,0 +1,62 @@
+"""updated_at and collection versions
+
+Revision ID: 9c6158301305
+Revises: 8f07ef31f1c9
+Create Date: 2026-10-18 19:10:03.215874
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c6158301305'
+down_revision: Union[str, None] = '8f07ef31f1c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLLECTIONS = ('authors', 'books')
+
+
+def upgrade() -> None:
+    for table in COLLECTIONS:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+        op.execute(f"UPDATE {table} SET updated_at = date_created")
+
+    op.create_table('collection_versions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(
+        "INSERT INTO collection_versions (name) VALUES "
+        + ", ".join(f"('{table}')" for table in COLLECTIONS)
+    )
+    op.execute("""
+        CREATE FUNCTION bump_collection_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE collection_versions
+            SET version = version + 1, updated_at = now()
+            WHERE name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in COLLECTIONS:
+        op.execute(f"""
+            CREATE TRIGGER {table}_bump_collection_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_collection_version()
+        """)
+
+
+def downgrade() -> None:
+    for table in COLLECTIONS:
+        op.execute(f"DROP TRIGGER {table}_bump_collection_version ON {table}")
+    op.execute("DROP FUNCTION bump_collection_version()")
+    op.drop_table('collection_versions')
+    for table in reversed(COLLECTIONS):
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,43 @@
+"""trigram search indexes
+
+Revision ID: a206e558d37f
+Revises: 50b8da3f9cc3
+Create Date: 2026-10-18 18:30:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a206e558d37f'
+down_revision: Union[str, None] = '50b8da3f9cc3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_books_title_trgm',
+        'books',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_authors_full_name_trgm',
+        'authors',
+        ['full_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'full_name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_authors_full_name_trgm', table_name='authors')
+    op.drop_index('ix_books_title_trgm', table_name='books')
@@ -0,0 +1,30 @@
+"""books author on delete cascade
+
+Revision ID: c41d7e2a9b60
+Revises: 9c6158301305
+Create Date: 2026-10-18 20:05:11.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e2a9b60'
+down_revision: Union[str, None] = '9c6158301305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+    op.create_foreign_key(
+        'books_author_id_fkey', 'books', 'authors', ['author_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+    op.create_foreign_key('books_author_id_fkey', 'books', 'authors', ['author_id'], ['id'])
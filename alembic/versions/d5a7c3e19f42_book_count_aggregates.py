@@ -0,0 +1,126 @@
+"""book count aggregates
+
+Revision ID: d5a7c3e19f42
+Revises: c41d7e2a9b60
+Create Date: 2026-10-18 21:40:27.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7c3e19f42'
+down_revision: Union[str, None] = 'c41d7e2a9b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabla de agregados, columna de grupo y expresión del grupo sobre una fila de books.
+AGGREGATES = (
+    ('book_counts_by_year', 'year', 'EXTRACT(YEAR FROM date_published)::integer'),
+    ('book_counts_by_author', 'author_id', 'author_id'),
+)
+TRIGGERS = (
+    ('insert', 'INSERT', 'REFERENCING NEW TABLE AS new_rows'),
+    ('update', 'UPDATE', 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('delete', 'DELETE', 'REFERENCING OLD TABLE AS old_rows'),
+    ('truncate', 'TRUNCATE', ''),
+)
+
+
+def _apply_changes(table: str, column: str, expression: str) -> str:
+    # Suma los cambios de la sentencia por grupo (en orden, para que dos sentencias
+    # concurrentes bloqueen las filas en el mismo orden) y elimina los grupos vacíos.
+    return f"""
+        EXECUTE format($sql$
+            WITH changed AS (
+                INSERT INTO {table} AS counts ({column}, book_count)
+                SELECT {expression}, sum(delta)
+                FROM (%s) changes
+                WHERE {expression} IS NOT NULL
+                GROUP BY 1
+                HAVING sum(delta) <> 0
+                ORDER BY 1
+                ON CONFLICT ({column}) DO UPDATE
+                SET book_count = counts.book_count + EXCLUDED.book_count
+                RETURNING {column}, book_count
+            )
+            SELECT array_agg({column}) FROM changed WHERE book_count = 0
+        $sql$, changes) INTO emptied;
+        IF emptied IS NOT NULL THEN
+            DELETE FROM {table} WHERE {column} = ANY(emptied) AND book_count = 0;
+        END IF;
+    """
+
+
+def upgrade() -> None:
+    op.create_table('book_counts_by_year',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('book_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('year')
+    )
+    op.create_table('book_counts_by_author',
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('book_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('author_id')
+    )
+    op.create_index('ix_book_counts_by_author_book_count', 'book_counts_by_author', ['book_count', 'author_id'], unique=False)
+
+    # Los triggers usan las tablas de transición de cada sentencia: un INSERT, UPDATE o
+    # DELETE masivo (o el borrado en cascada de un autor) actualiza cada grupo una vez.
+    op.execute(f"""
+        CREATE FUNCTION update_book_counts() RETURNS trigger AS $$
+        DECLARE
+            changes text;
+            emptied integer[];
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                DELETE FROM book_counts_by_year;
+                DELETE FROM book_counts_by_author;
+                RETURN NULL;
+            END IF;
+            -- -1 por cada fila anterior y +1 por cada fila nueva; en un UPDATE que no
+            -- cambia el año ni el autor los cambios se anulan y no se escribe nada.
+            changes := CASE TG_OP
+                WHEN 'INSERT' THEN
+                    'SELECT author_id, date_published, 1 AS delta FROM new_rows'
+                WHEN 'DELETE' THEN
+                    'SELECT author_id, date_published, -1 AS delta FROM old_rows'
+                ELSE
+                    'SELECT author_id, date_published, -1 AS delta FROM old_rows
+                     UNION ALL SELECT author_id, date_published, 1 FROM new_rows'
+            END;
+            {''.join(_apply_changes(*aggregate) for aggregate in AGGREGATES)}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Se bloquean las escrituras en books (no las lecturas) hasta el final de la
+    # migración, para que ningún cambio quede fuera del cálculo inicial ni se cuente
+    # dos veces.
+    op.execute("LOCK TABLE books IN SHARE ROW EXCLUSIVE MODE")
+    for name, event, referencing in TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER books_update_counts_{name}
+            AFTER {event} ON books {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION update_book_counts()
+        """)
+    for table, column, expression in AGGREGATES:
+        op.execute(f"""
+            INSERT INTO {table} ({column}, book_count)
+            SELECT {expression}, count(*) FROM books
+            WHERE {expression} IS NOT NULL
+            GROUP BY 1
+        """)
+
+
+def downgrade() -> None:
+    for name, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER books_update_counts_{name} ON books")
+    op.execute("DROP FUNCTION update_book_counts()")
+    op.drop_index('ix_book_counts_by_author_book_count', table_name='book_counts_by_author')
+    op.drop_table('book_counts_by_author')
+    op.drop_table('book_counts_by_year')
@@ -0,0 +1,125 @@
+"""collection version slots
+
+Revision ID: e8b4f0a6c2d1
+Revises: d5a7c3e19f42
+Create Date: 2026-10-18 23:05:41.602913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4f0a6c2d1'
+down_revision: Union[str, None] = 'd5a7c3e19f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLLECTIONS = ('authors', 'books')
+# Filas por colección: cada conexión incrementa la de su proceso (pg_backend_pid() %
+# SLOTS), de modo que dos escrituras concurrentes casi nunca esperan la misma fila.
+SLOTS = 64
+# Las tablas de transición solo se pueden declarar en triggers de un solo evento.
+TRIGGERS = (
+    ('insert', 'INSERT', 'REFERENCING NEW TABLE AS new_rows'),
+    ('update', 'UPDATE', 'REFERENCING NEW TABLE AS new_rows'),
+    ('delete', 'DELETE', 'REFERENCING OLD TABLE AS old_rows'),
+    ('truncate', 'TRUNCATE', ''),
+)
+
+
+def upgrade() -> None:
+    op.create_table('collection_version_slots',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('slot', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name', 'slot')
+    )
+    for table in COLLECTIONS:
+        # Bloquea las escrituras hasta el final de la migración: ningún cambio queda
+        # sin contar entre la copia de la versión y los triggers nuevos.
+        op.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        op.execute(f"DROP TRIGGER {table}_bump_collection_version ON {table}")
+    op.execute("DROP FUNCTION bump_collection_version()")
+    op.execute("""
+        INSERT INTO collection_version_slots (name, slot, version, updated_at)
+        SELECT name, 0, version, updated_at FROM collection_versions
+    """)
+    op.drop_table('collection_versions')
+    # La versión es la suma de las filas: crece con cada sentencia confirmada y, como
+    # las filas siguen MVCC, nunca se ve antes de que sus cambios sean visibles.
+    op.execute("""
+        CREATE VIEW collection_versions AS
+        SELECT name, sum(version)::bigint AS version, max(updated_at) AS updated_at
+        FROM collection_version_slots
+        GROUP BY name
+    """)
+
+    op.execute(f"""
+        CREATE FUNCTION bump_collection_version() RETURNS trigger AS $$
+        BEGIN
+            -- Una sentencia que no modificó filas no cambia la versión.
+            IF TG_OP = 'DELETE' THEN
+                IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+                    RETURN NULL;
+                END IF;
+            ELSIF TG_OP <> 'TRUNCATE' THEN
+                IF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            INSERT INTO collection_version_slots AS slots (name, slot, version)
+            VALUES (TG_TABLE_NAME, pg_backend_pid() % {SLOTS}, 1)
+            ON CONFLICT (name, slot) DO UPDATE
+            SET version = slots.version + 1, updated_at = now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in COLLECTIONS:
+        for name, event, referencing in TRIGGERS:
+            op.execute(f"""
+                CREATE TRIGGER {table}_bump_collection_version_{name}
+                AFTER {event} ON {table} {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_collection_version()
+            """)
+
+
+def downgrade() -> None:
+    for table in COLLECTIONS:
+        op.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        for name, _, _ in TRIGGERS:
+            op.execute(f"DROP TRIGGER {table}_bump_collection_version_{name} ON {table}")
+    op.execute("DROP FUNCTION bump_collection_version()")
+    op.execute("ALTER VIEW collection_versions RENAME TO collection_versions_slots_sum")
+    op.create_table('collection_versions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("""
+        INSERT INTO collection_versions (name, version, updated_at)
+        SELECT name, version, updated_at FROM collection_versions_slots_sum
+    """)
+    op.execute("DROP VIEW collection_versions_slots_sum")
+    op.drop_table('collection_version_slots')
+    op.execute("""
+        CREATE FUNCTION bump_collection_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE collection_versions
+            SET version = version + 1, updated_at = now()
+            WHERE name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in COLLECTIONS:
+        op.execute(f"""
+            CREATE TRIGGER {table}_bump_collection_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_collection_version()
+        """)
@@ -0,0 +1,144 @@
+"""book count slots
+
+Revision ID: f2c7d81b4e06
+Revises: e8b4f0a6c2d1
+Create Date: 2026-10-19 10:12:36.480215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7d81b4e06'
+down_revision: Union[str, None] = 'e8b4f0a6c2d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Vista (el nombre anterior de la tabla), tabla por filas, columna de grupo y expresión
+# del grupo sobre una fila de books.
+AGGREGATES = (
+    ('book_counts_by_year', 'book_counts_by_year_slots', 'year', 'EXTRACT(YEAR FROM date_published)::integer'),
+    ('book_counts_by_author', 'book_counts_by_author_slots', 'author_id', 'author_id'),
+)
+# Filas por grupo: cada conexión suma sus cambios en la de su proceso
+# (mod(pg_backend_pid(), SLOTS)), como collection_version_slots (migración e8b4f0a6c2d1),
+# de modo que dos escrituras concurrentes del mismo año o autor casi nunca esperan la
+# misma fila.
+SLOTS = 64
+
+
+def _apply_changes(table: str, column: str, expression: str, slotted: bool) -> str:
+    # Suma los cambios de la sentencia por grupo (en orden, para que dos sentencias
+    # concurrentes bloqueen las filas en el mismo orden) y elimina las filas en cero.
+    # Una fila por slot puede quedar negativa (un libro contado en otro slot se borró
+    # desde este); la vista suma todas.
+    slot = f'mod(pg_backend_pid(), {SLOTS})'
+    return f"""
+        EXECUTE format($sql$
+            WITH changed AS (
+                INSERT INTO {table} AS counts ({column}, {'slot, ' if slotted else ''}book_count)
+                SELECT {expression}, {f'{slot}, ' if slotted else ''}sum(delta)
+                FROM (%s) changes
+                WHERE {expression} IS NOT NULL
+                GROUP BY 1
+                HAVING sum(delta) <> 0
+                ORDER BY 1
+                ON CONFLICT ({column}{', slot' if slotted else ''}) DO UPDATE
+                SET book_count = counts.book_count + EXCLUDED.book_count
+                RETURNING {column}, book_count
+            )
+            SELECT array_agg({column}) FROM changed WHERE book_count = 0
+        $sql$, changes) INTO emptied;
+        IF emptied IS NOT NULL THEN
+            DELETE FROM {table} WHERE {column} = ANY(emptied)
+                {f'AND slot = {slot} ' if slotted else ''}AND book_count = 0;
+        END IF;
+    """
+
+
+def _update_book_counts(slotted: bool) -> str:
+    tables = [(slots if slotted else view, column, expression) for view, slots, column, expression in AGGREGATES]
+    return f"""
+        CREATE OR REPLACE FUNCTION update_book_counts() RETURNS trigger AS $$
+        DECLARE
+            changes text;
+            emptied integer[];
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                {' '.join(f'DELETE FROM {table};' for table, _, _ in tables)}
+                RETURN NULL;
+            END IF;
+            -- -1 por cada fila anterior y +1 por cada fila nueva; en un UPDATE que no
+            -- cambia el año ni el autor los cambios se anulan y no se escribe nada.
+            changes := CASE TG_OP
+                WHEN 'INSERT' THEN
+                    'SELECT author_id, date_published, 1 AS delta FROM new_rows'
+                WHEN 'DELETE' THEN
+                    'SELECT author_id, date_published, -1 AS delta FROM old_rows'
+                ELSE
+                    'SELECT author_id, date_published, -1 AS delta FROM old_rows
+                     UNION ALL SELECT author_id, date_published, 1 FROM new_rows'
+            END;
+            {''.join(_apply_changes(*table, slotted) for table in tables)}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    # Bloquea las escrituras en books hasta el final de la migración: ningún cambio
+    # queda fuera de la copia de los conteos.
+    op.execute("LOCK TABLE books IN SHARE ROW EXCLUSIVE MODE")
+    op.create_table('book_counts_by_year_slots',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('slot', sa.Integer(), nullable=False),
+    sa.Column('book_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('year', 'slot')
+    )
+    op.create_table('book_counts_by_author_slots',
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('slot', sa.Integer(), nullable=False),
+    sa.Column('book_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('author_id', 'slot')
+    )
+    for view, table, column, _ in AGGREGATES:
+        op.execute(f"""
+            INSERT INTO {table} ({column}, slot, book_count)
+            SELECT {column}, 0, book_count FROM {view}
+        """)
+    op.drop_index('ix_book_counts_by_author_book_count', table_name='book_counts_by_author')
+    for view, table, column, _ in AGGREGATES:
+        op.drop_table(view)
+        # Los conteos se suman al leer: el costo depende del número de grupos (por
+        # hasta SLOTS filas cada uno), no del de libros.
+        op.execute(f"""
+            CREATE VIEW {view} AS
+            SELECT {column}, sum(book_count)::bigint AS book_count
+            FROM {table}
+            GROUP BY {column}
+            HAVING sum(book_count) <> 0
+        """)
+    op.execute(_update_book_counts(slotted=True))
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE books IN SHARE ROW EXCLUSIVE MODE")
+    for view, table, column, _ in AGGREGATES:
+        op.execute(f"ALTER VIEW {view} RENAME TO {view}_sum")
+        op.create_table(view,
+        sa.Column(column, sa.Integer(), nullable=False),
+        sa.Column('book_count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint(column)
+        )
+        op.execute(f"""
+            INSERT INTO {view} ({column}, book_count)
+            SELECT {column}, book_count FROM {view}_sum
+        """)
+        op.execute(f"DROP VIEW {view}_sum")
+        op.drop_table(table)
+    op.create_index('ix_book_counts_by_author_book_count', 'book_counts_by_author', ['book_count', 'author_id'], unique=False)
+    op.execute(_update_book_counts(slotted=False))
@@ -0,0 +1,7 @@
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Se carga al importar cualquier módulo de la aplicación, antes de que los módulos lean
+# su configuración del entorno, y desde la raíz del repositorio (no desde el
+# directorio de trabajo). Las variables ya definidas en el entorno tienen prioridad.
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
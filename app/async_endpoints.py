@@ -0,0 +1,332 @@
+from fastapi import APIRouter, Depends, FastAPI, Query, Request, Response, status
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas import *
+from app.crud import async_authors, async_books
+from app.database import get_async_session
+from app.pagination import DEFAULT_PAGE_LIMIT, add_pagination_headers
+from app.conditional import collection_response, conditional_response, make_etag
+from app.crud.authors import parse_author_include
+from app.crud.versions import get_collection_version_async
+from app.serialization import list_response
+
+router = APIRouter()
+
+# Endpoints Autores
+
+
+@router.post(
+    "/authors/",
+    response_model=SchemaAuthorResponse,
+    status_code=status.HTTP_201_CREATED,
+    description="Crea un nuevo autor en la base de datos, utilizando su nombre completo.",
+    summary="Crear un autor",
+)
+async def create_author_endpoint(
+    author: SchemaAuthor, session: AsyncSession = Depends(get_async_session)
+):
+    return await async_authors.create_author(session, author)
+
+
+@router.delete(
+    "/authors/bulk",
+    response_model=SchemaBulkDeleteResult,
+    status_code=status.HTTP_200_OK,
+    summary="Eliminar autores en lote",
+    description="Elimina los autores indicados en `ids` con una sola sentencia DELETE. "
+    "Sus libros se eliminan en cascada en la base de datos. Devuelve los IDs de los "
+    "autores eliminados; los que no existen se omiten.",
+)
+async def delete_authors_endpoint(
+    body: SchemaBulkDelete, session: AsyncSession = Depends(get_async_session)
+):
+    return {"deleted": await async_authors.delete_authors(session, body.ids)}
+
+
+@router.get(
+    "/authors/",
+    response_model=list[SchemaAuthorDetailResponse],
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener todos los autores",
+    description="Obtiene una página de los autores registrados en la base de datos. "
+    "Con `include=books` se incluyen los libros de cada autor y con "
+    "`include=book_count` su número de libros (se pueden combinar separados por "
+    "comas). Si existen más resultados, la respuesta incluye los encabezados `Link` "
+    '(rel="next") y `X-Next-Cursor` con el cursor para el parámetro `after`.',
+)
+async def get_authors_endpoint(
+    request: Request,
+    response: Response,
+    after: str = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    include: str = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    include = parse_author_include(include)
+    versions = [await get_collection_version_async(session, "authors")]
+    if include:
+        versions.append(await get_collection_version_async(session, "books"))
+    not_modified = collection_response(request, response, *versions)
+    if not_modified:
+        return not_modified
+    authors, next_cursor = await async_authors.get_authors(
+        session, after, limit, include
+    )
+    add_pagination_headers(request, response, next_cursor)
+    return list_response(
+        authors, SchemaAuthorDetailResponse, response, exclude_unset=True
+    )
+
+
+@router.get(
+    "/authors/{author_id}",
+    response_model=SchemaAuthorDetailResponse,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener un autor específico",
+    description="Obtiene un autor específico por su ID. Con `include=books` se "
+    "incluyen sus libros y con `include=book_count` su número de libros.",
+)
+async def get_author_endpoint(
+    author_id: int,
+    request: Request,
+    response: Response,
+    include: str = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    include = parse_author_include(include)
+    author = await async_authors.get_author(session, author_id, include)
+    etag_parts = ["author", author.id, author.updated_at]
+    last_modified = author.updated_at
+    if include:
+        books_version = await get_collection_version_async(session, "books")
+        etag_parts += [*sorted(include), books_version.version]
+        last_modified = max(last_modified, books_version.updated_at)
+    etag = make_etag(*etag_parts)
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    return author
+
+
+@router.put(
+    "/authors/{author_id}",
+    response_model=SchemaAuthorResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar un autor",
+    description="Actualiza el nombre completo de un autor específico con su ID.",
+)
+async def update_author_endpoint(
+    author_id: int,
+    author: SchemaAuthor,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await async_authors.update_author(session, author_id, author)
+
+
+@router.patch(
+    "/authors/{author_id}",
+    response_model=SchemaAuthorResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar parcialmente un autor",
+    description="Actualiza solo los campos enviados de un autor específico con su ID.",
+)
+async def patch_author_endpoint(
+    author_id: int,
+    author: SchemaAuthorUpdate,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await async_authors.patch_author(session, author_id, author)
+
+
+@router.delete(
+    "/authors/{author_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Eliminar un autor",
+    description="Elimina un autor específico por su ID.",
+)
+async def delete_author_endpoint(
+    author_id: int, session: AsyncSession = Depends(get_async_session)
+):
+    await async_authors.delete_author(session, author_id)
+
+
+# Endpoints Libros
+
+
+@router.post(
+    "/books/",
+    response_model=SchemaBookResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Crear un libro",
+    description="Crea un nuevo libro en la base de datos, utilizando su título, ID de autor, ISBN y fecha de publicación.",
+)
+async def create_book_endpoint(
+    book: SchemaBook, session: AsyncSession = Depends(get_async_session)
+):
+    return await async_books.create_book(session, book)
+
+
+@router.delete(
+    "/books/bulk",
+    response_model=SchemaBulkDeleteResult,
+    status_code=status.HTTP_200_OK,
+    summary="Eliminar libros en lote",
+    description="Elimina los libros indicados en `ids` con una sola sentencia DELETE. "
+    "Devuelve los IDs de los libros eliminados; los que no existen se omiten.",
+)
+async def delete_books_endpoint(
+    body: SchemaBulkDelete, session: AsyncSession = Depends(get_async_session)
+):
+    return {"deleted": await async_books.delete_books(session, body.ids)}
+
+
+@router.get(
+    "/books/",
+    response_model=list[SchemaBookResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Obtener todos los libros",
+    description="Obtiene una página de los libros registrados en la base de datos, "
+    "opcionalmente filtrada por autores (`author_id`), años (`year_from`, `year_to`) o "
+    "fechas de publicación (`published_from`, `published_before`) y ordenada según "
+    "`sort`. Si existen más resultados, la respuesta incluye los encabezados `Link` "
+    '(rel="next") y `X-Next-Cursor` con el cursor para el parámetro `after`.',
+)
+async def get_books_endpoint(
+    request: Request,
+    response: Response,
+    after: str = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    session: AsyncSession = Depends(get_async_session),
+    filters: SchemaBookFilters = Depends(SchemaBookFilters.as_query),
+):
+    version = await get_collection_version_async(session, "books")
+    not_modified = collection_response(request, response, version)
+    if not_modified:
+        return not_modified
+    books, next_cursor = await async_books.get_books(session, after, limit, filters)
+    add_pagination_headers(request, response, next_cursor)
+    return list_response(books, SchemaBookResponse, response)
+
+
+@router.get(
+    "/books/{book_id}",
+    response_model=SchemaBookResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener un libro específico",
+    description="Obtiene un libro específico por su ID.",
+)
+async def get_book_endpoint(
+    book_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    book = await async_books.get_book(session, book_id)
+    etag = make_etag("book", book.id, book.updated_at)
+    not_modified = conditional_response(request, response, etag, book.updated_at)
+    if not_modified:
+        return not_modified
+    return book
+
+
+@router.put(
+    "/books/{book_id}",
+    response_model=SchemaBookResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar un libro",
+    description="Actualiza los datos de un libro específico por su ID.",
+)
+async def update_book_endpoint(
+    book_id: int,
+    book: SchemaBook,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await async_books.update_book(session, book_id, book)
+
+
+@router.patch(
+    "/books/{book_id}",
+    response_model=SchemaBookResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar parcialmente un libro",
+    description="Actualiza solo los campos enviados de un libro específico por su ID.",
+)
+async def patch_book_endpoint(
+    book_id: int,
+    book: SchemaBookUpdate,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await async_books.patch_book(session, book_id, book)
+
+
+@router.delete(
+    "/books/{book_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Eliminar un libro",
+    description="Elimina un libro específico por su ID.",
+)
+async def delete_book_endpoint(
+    book_id: int, session: AsyncSession = Depends(get_async_session)
+):
+    await async_books.delete_book(session, book_id)
+
+
+@router.get(
+    "/books/search/",
+    response_model=list[SchemaBookResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Buscar libros",
+    description="Busca libros por nombre de autor y/o año de publicación. Con el "
+    "parámetro `q` se hace una búsqueda aproximada por título y nombre de autor, "
+    "ordenada por relevancia y limitada a `limit` resultados.",
+)
+async def search_books_endpoint(
+    response: Response,
+    author_name: str = None,
+    # Mismos límites que year_from/year_to: date(year + 1, 1, 1) debe ser válida.
+    year: int = Query(None, ge=1, le=9998),
+    q: str = None,
+    limit: int = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    books = await async_books.search_books(session, author_name, year, q, limit)
+    return list_response(books, SchemaBookResponse, response)
+
+
+def use_async_endpoints(app: FastAPI):
+    """
+    Reemplaza los endpoints síncronos de la aplicación por sus versiones asíncronas
+    (mismo método y ruta), conservando el orden de registro de las rutas para que las
+    rutas estáticas como /books/export sigan teniendo prioridad sobre /books/{book_id}.
+
+    Args:
+        app (FastAPI): Aplicación cuyas rutas se reemplazan.
+    """
+    replace_routes(app, router)
+
+
+def replace_routes(app: FastAPI, replacements: APIRouter):
+    """
+    Reemplaza las rutas de la aplicación que tienen el mismo método y ruta que las de
+    `replacements`, en su misma posición. Las rutas nuevas se agregan al final.
+
+    Args:
+        app (FastAPI): Aplicación cuyas rutas se reemplazan.
+        replacements (APIRouter): Router con las rutas de reemplazo.
+    """
+    new_routes = {
+        (route.path, frozenset(route.methods)): route
+        for route in replacements.routes
+        if isinstance(route, APIRoute)
+    }
+    app.router.routes[:] = [
+        (
+            new_routes.pop((route.path, frozenset(route.methods)), route)
+            if isinstance(route, APIRoute)
+            else route
+        )
+        for route in app.router.routes
+    ]
+    app.router.routes.extend(new_routes.values())
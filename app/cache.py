@@ -0,0 +1,555 @@
+import functools
+import itertools
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+
+
+class LRUCache:
+    """
+    Caché en memoria del proceso, acotada por número de entradas (LRU) y con TTL.
+    Es segura entre hilos, ya que los endpoints síncronos se ejecutan en el threadpool.
+    Cada worker tiene su propia copia, por lo que no es coherente entre procesos.
+
+    Args:
+        max_entries (int): Número máximo de entradas; 0 desactiva la caché.
+        ttl (float): Segundos de vida de cada entrada.
+    """
+
+    name = "memory"
+    # Las operaciones no hacen E/S: se pueden llamar desde el event loop.
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Lease vigente de cada clave, acotado igual que las entradas.
+        self._leases: OrderedDict[str, int] = OrderedDict()
+        self._lease_tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str):
+        """
+        Obtiene el valor de una entrada vigente.
+
+        Args:
+            key (str): Clave de la entrada.
+
+        Returns:
+            Any | None: El valor almacenado, o None si no existe o expiró.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def lease(self, key: str) -> int:
+        """
+        Entrega un lease sobre una clave antes de leer su valor de la base de datos;
+        una invalidación posterior lo revoca (ver EntityCache.lease).
+
+        Args:
+            key (str): Clave de la entrada.
+
+        Returns:
+            int: Token del lease.
+        """
+        with self._lock:
+            token = next(self._lease_tokens)
+            self._leases[key] = token
+            self._leases.move_to_end(key)
+            while len(self._leases) > max(self.max_entries, 1):
+                self._leases.popitem(last=False)
+            return token
+
+    def set(self, key: str, value: Any, lease: int = None):
+        """
+        Guarda una entrada, desalojando la menos usada recientemente si la caché está
+        llena.
+
+        Args:
+            key (str): Clave de la entrada.
+            value (Any): Valor a guardar.
+            lease (int, optional): Lease obtenido antes de leer el valor; si ya no es
+                el vigente, la entrada no se guarda.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if lease is not None:
+                if self._leases.get(key) != lease:
+                    return
+                del self._leases[key]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str):
+        """
+        Invalida una o varias entradas.
+
+        Args:
+            *keys (str): Claves de las entradas a invalidar.
+        """
+        with self._lock:
+            for key in keys:
+                self._leases.pop(key, None)
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        """Elimina todas las entradas."""
+        with self._lock:
+            self._entries.clear()
+            self._leases.clear()
+
+    def stats(self) -> dict:
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, desalojos, expiraciones, invalidaciones y tamaño.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+            }
+
+
+class SQLiteCache:
+    """
+    Caché compartida por todos los workers de una misma máquina, guardada en un archivo
+    SQLite en modo WAL. Las invalidaciones de un worker son visibles de inmediato para
+    los demás. Se acota por número de entradas, desalojando las escritas hace más tiempo.
+
+    Los contadores de aciertos y fallos son del proceso que responde.
+
+    Args:
+        path (str): Ruta del archivo SQLite (por ejemplo, en /dev/shm).
+        max_entries (int): Número máximo de entradas; 0 desactiva la caché.
+        ttl (float): Segundos de vida de cada entrada.
+    """
+
+    name = "sqlite"
+    blocking = True
+    PRUNE_EVERY = 256
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS leases "
+            "(key TEXT PRIMARY KEY, token INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _count(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def get(self, key: str) -> bytes | None:
+        row = (
+            self._connection()
+            .execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            self._count(misses=1)
+            return None
+        if row[1] <= time.time():
+            self._connection().execute(
+                "DELETE FROM cache WHERE key = ? AND expires_at <= ?",
+                (key, time.time()),
+            )
+            self._count(misses=1, expirations=1)
+            return None
+        self._count(hits=1)
+        return row[0]
+
+    def lease(self, key: str) -> int:
+        token = secrets.randbits(62)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO leases (key, token, expires_at) VALUES (?, ?, ?)",
+            (key, token, time.time() + self.ttl),
+        )
+        return token
+
+    def set(self, key: str, value: bytes, lease: int = None):
+        if self.max_entries <= 0:
+            return
+        connection = self._connection()
+        # El lease se consume y la entrada se escribe en la misma transacción: una
+        # invalidación de otro worker ocurre antes (y la entrada no se guarda) o
+        # después (y la borra).
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if lease is not None:
+                consumed = connection.execute(
+                    "DELETE FROM leases WHERE key = ? AND token = ? AND expires_at > ?",
+                    (key, lease, time.time()),
+                ).rowcount
+                if not consumed:
+                    connection.execute("ROLLBACK")
+                    return
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Elimina las entradas expiradas y las más antiguas que excedan el límite."""
+        connection = self._connection()
+        expired = connection.execute(
+            "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+        connection.execute("DELETE FROM leases WHERE expires_at <= ?", (time.time(),))
+        evicted = connection.execute(
+            "DELETE FROM cache WHERE rowid IN "
+            "(SELECT rowid FROM cache ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        self._count(expirations=expired, evictions=evicted)
+
+    def delete(self, *keys: str):
+        if not keys:
+            return
+        placeholders = ", ".join("?" * len(keys))
+        connection = self._connection()
+        # Primero los leases: un set concurrente ya no puede guardar el valor anterior.
+        connection.execute(f"DELETE FROM leases WHERE key IN ({placeholders})", keys)
+        deleted = connection.execute(
+            f"DELETE FROM cache WHERE key IN ({placeholders})", keys
+        ).rowcount
+        self._count(invalidations=deleted)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM leases")
+        self._connection().execute("DELETE FROM cache")
+
+    def stats(self) -> dict:
+        size = self._connection().execute("SELECT count(*) FROM cache").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+            }
+
+
+class RedisCache:
+    """
+    Caché compartida entre workers y máquinas sobre un servidor que hable el protocolo
+    de Redis. La expiración y el desalojo (maxmemory-policy) los maneja el servidor.
+
+    Los contadores de aciertos y fallos son del proceso que responde.
+
+    Args:
+        client: Cliente compatible con redis.Redis (por ejemplo, fakeredis en pruebas).
+        ttl (float): Segundos de vida de cada entrada.
+        prefix (str): Prefijo de las claves, para compartir el servidor.
+    """
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client, ttl: float, prefix: str = "biblioteca:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float):
+        import redis
+
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def get(self, key: str) -> bytes | None:
+        value = self.client.get(self.prefix + key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _lease_key(self, key: str) -> str:
+        return f"{self.prefix}lease:{key}"
+
+    def lease(self, key: str) -> int:
+        token = secrets.randbits(62)
+        self.client.set(self._lease_key(key), token, px=int(self.ttl * 1000))
+        return token
+
+    def set(self, key: str, value: bytes, lease: int = None):
+        if lease is None:
+            self.client.set(self.prefix + key, value, px=int(self.ttl * 1000))
+            return
+        from redis.exceptions import WatchError
+
+        lease_key = self._lease_key(key)
+        # WATCH/MULTI: si una invalidación borra el lease entre la comprobación y la
+        # escritura, la transacción no se ejecuta.
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(lease_key)
+                if pipe.get(lease_key) != str(lease).encode():
+                    return
+                pipe.multi()
+                pipe.set(self.prefix + key, value, px=int(self.ttl * 1000))
+                pipe.delete(lease_key)
+                pipe.execute()
+            except WatchError:
+                pass
+
+    def delete(self, *keys: str):
+        if not keys:
+            return
+        with self.client.pipeline() as pipe:
+            pipe.delete(*map(self._lease_key, keys))
+            pipe.delete(*(self.prefix + key for key in keys))
+            _, deleted = pipe.execute()
+        with self._lock:
+            self.invalidations += deleted
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": None,
+                "expirations": None,
+                "invalidations": self.invalidations,
+                "size": None,
+                "max_entries": None,
+                "ttl_seconds": self.ttl,
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(type_) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+class EntityCache:
+    """
+    Caché de lecturas de la API sobre un backend intercambiable. Los valores se guardan
+    como JSON, de modo que los backends compartidos entre procesos (SQLite, Redis)
+    reciben bytes y cada lectura entrega una copia nueva del valor.
+
+    Args:
+        backend: LRUCache, SQLiteCache o RedisCache.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, key: str, type_: Any):
+        """
+        Obtiene un valor de la caché.
+
+        Args:
+            key (str): Clave de la entrada.
+            type_ (Any): Tipo del valor (por ejemplo, SchemaBookResponse).
+
+        Returns:
+            Any | None: El valor validado como type_, o None si no está en la caché.
+        """
+        raw = self.backend.get(key)
+        return None if raw is None else _adapter(type_).validate_json(raw)
+
+    def lease(self, key: str) -> int:
+        """
+        Obtiene un lease sobre una clave. Una lectura que no encontró la entrada lo
+        pide antes de consultar la base de datos y lo entrega a set: si una escritura
+        invalidó la clave entretanto, el valor leído puede ser anterior a ella y no se
+        guarda. Un lease perdido (expirado, desalojado o reemplazado por el de otra
+        lectura) solo hace que no se guarde el valor.
+
+        Args:
+            key (str): Clave de la entrada.
+
+        Returns:
+            int: Token del lease.
+        """
+        return self.backend.lease(key)
+
+    def set(self, key: str, value: Any, type_: Any, lease: int = None):
+        """
+        Guarda un valor en la caché.
+
+        Args:
+            key (str): Clave de la entrada.
+            value (Any): Valor a guardar.
+            type_ (Any): Tipo con el que se serializa el valor.
+            lease (int, optional): Lease obtenido con lease() antes de leer el valor;
+                si ya no es el vigente, el valor no se guarda.
+        """
+        self.backend.set(key, _adapter(type_).dump_json(value), lease)
+
+    def delete(self, *keys: str):
+        """
+        Invalida una o varias entradas en el backend, visible para todos los procesos
+        que lo compartan.
+
+        Args:
+            *keys (str): Claves de las entradas a invalidar.
+        """
+        self.backend.delete(*keys)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+    async def run_async(self, func: Callable, *args):
+        """
+        Ejecuta desde una ruta asíncrona una función que usa la caché: en el
+        threadpool si el backend hace E/S bloqueante (SQLite, Redis), para no detener
+        el event loop, o directamente con la caché en memoria.
+
+        Args:
+            func (Callable): Función a ejecutar (por ejemplo, self.get).
+            *args: Argumentos de la función.
+
+        Returns:
+            Any: El resultado de la función.
+        """
+        if self.backend.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    async def get_async(self, key: str, type_: Any):
+        """Versión de get para rutas asíncronas (ver run_async)."""
+        return await self.run_async(self.get, key, type_)
+
+    async def lease_async(self, key: str) -> int:
+        """Versión de lease para rutas asíncronas (ver run_async)."""
+        return await self.run_async(self.lease, key)
+
+    async def delete_async(self, *keys: str):
+        """Versión de delete para rutas asíncronas (ver run_async)."""
+        await self.run_async(self.delete, *keys)
+
+
+def create_cache_backend():
+    """
+    Crea el backend de caché configurado en CACHE_BACKEND: "memory" (por proceso),
+    "sqlite" (compartido por los workers de una máquina, en CACHE_SQLITE_PATH) o "redis"
+    (compartido entre máquinas, en CACHE_REDIS_URL).
+
+    Returns:
+        LRUCache | SQLiteCache | RedisCache: El backend configurado.
+
+    Raises:
+        ValueError: Si CACHE_BACKEND tiene un valor desconocido.
+    """
+    backend = os.getenv("CACHE_BACKEND", "memory").lower()
+    max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    ttl = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    if backend == "memory":
+        return LRUCache(max_entries, ttl)
+    if backend == "sqlite":
+        path = os.getenv("CACHE_SQLITE_PATH", "/dev/shm/biblioteca-cache.sqlite3")
+        return SQLiteCache(path, max_entries, ttl)
+    if backend == "redis":
+        url = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        return RedisCache.from_url(url, ttl)
+    raise ValueError(f"Invalid CACHE_BACKEND: {backend}")
+
+
+entity_cache = EntityCache(create_cache_backend())
+
+
+def book_key(book_id: int) -> str:
+    return f"book:{book_id}"
+
+
+def author_key(author_id: int) -> str:
+    return f"author:{author_id}"
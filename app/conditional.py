@@ -0,0 +1,108 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Genera un ETag débil a partir de las partes que identifican una representación
+    (por ejemplo, el ID y la fecha de actualización de un libro).
+
+    Args:
+        *parts: Valores que identifican la versión de la representación.
+
+    Returns:
+        str: ETag débil, por ejemplo W/"3f2a...".
+    """
+    digest = hashlib.sha1(":".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """
+    Agrega los encabezados ETag y Last-Modified a la respuesta y evalúa las
+    precondiciones If-None-Match / If-Modified-Since de la petición (RFC 9110).
+
+    Args:
+        request (Request): Petición actual.
+        response (Response): Respuesta a la que se agregan los encabezados.
+        etag (str): ETag de la representación actual.
+        last_modified (datetime, optional): Fecha de la última modificación.
+
+    Returns:
+        Response | None: Una respuesta 304 Not Modified si el cliente ya tiene la
+            representación actual, o None si se debe enviar el cuerpo completo.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif last_modified is not None and "if-modified-since" in request.headers:
+        not_modified = _not_modified_since(
+            request.headers["if-modified-since"], last_modified
+        )
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+def collection_response(
+    request: Request, response: Response, *versions
+) -> Response | None:
+    """
+    Evalúa las precondiciones de un listado a partir de la versión de sus colecciones,
+    sin consultar sus filas. El ETag incluye los parámetros de consulta, ya que cada
+    página o filtro es una representación distinta.
+
+    Args:
+        request (Request): Petición actual.
+        response (Response): Respuesta a la que se agregan los encabezados.
+        *versions (CollectionVersion | None): Versión actual de cada colección de la
+            que depende el listado (por ejemplo, "authors" y "books" si se incluyen
+            los libros de cada autor).
+
+    Returns:
+        Response | None: Una respuesta 304 Not Modified, o None si se debe enviar el
+            cuerpo completo.
+    """
+    if not versions or any(version is None for version in versions):
+        return None
+    parts = [part for version in versions for part in (version.name, version.version)]
+    etag = make_etag(*parts, request.url.query)
+    last_modified = max(version.updated_at for version in versions)
+    return conditional_response(request, response, etag, last_modified)
@@ -0,0 +1,274 @@
+from app.models import *
+from app.schemas import *
+from app.pagination import clamp_limit, decode_id_cursor, encode_cursor
+from app.cache import author_key, entity_cache
+from app.suggest import author_index
+from app.crud.authors import (
+    AUTHOR_RESPONSE_COLUMNS,
+    BULK_MAX_ITEMS,
+    _author_integrity_error,
+    _cache_author,
+    _invalidate_deleted_authors,
+    author_details,
+    author_details_statement,
+    delete_authors_statement,
+)
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+
+async def create_author(session: AsyncSession, author: SchemaAuthor):
+    """
+    Versión asíncrona de create_author.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        author (SchemaAuthor): Objeto con los datos del autor.
+
+    Returns:
+        SchemaAuthorResponse: El autor recién creado.
+
+    Raises:
+        HTTPException:
+            - 400: Si el autor ya existe en la base de datos.
+            - 500: Si ocurre un error inesperado durante la creación.
+    """
+    stmt = insert(Author).values(**author.model_dump())
+    try:
+        row = (await session.execute(stmt.returning(*AUTHOR_RESPONSE_COLUMNS))).one()
+        with author_index.own_write():
+            await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise _author_integrity_error(e)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error creating author: {str(e)}")
+    author_index.add(row.id, row.full_name)
+    return SchemaAuthorResponse.model_validate(row, from_attributes=True)
+
+
+async def get_authors(
+    session: AsyncSession,
+    after: str = None,
+    limit: int = None,
+    include: frozenset = frozenset(),
+):
+    """
+    Versión asíncrona de get_authors (paginación por cursor sobre el ID).
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        after (str, optional): Cursor opaco devuelto en la página anterior.
+        limit (int, optional): Número máximo de autores a devolver.
+        include (frozenset, optional): Datos adicionales ("books", "book_count").
+
+    Returns:
+        tuple[list, str | None]: Los autores de la página y el cursor de la página
+            siguiente.
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
+            - 500: Si ocurre un error inesperado al obtener los autores.
+    """
+    last_id = decode_id_cursor(after)
+    limit = clamp_limit(limit)
+    try:
+        if include:
+            stmt = author_details_statement(include)
+        else:
+            stmt = select(*AUTHOR_RESPONSE_COLUMNS)
+        if last_id is not None:
+            stmt = stmt.where(Author.id > last_id)
+        stmt = stmt.order_by(Author.id).limit(limit + 1)
+        authors = (await session.execute(stmt)).all()
+        has_more = len(authors) > limit
+        authors = authors[:limit]
+        if include:
+            authors = author_details(authors, include)
+        next_cursor = encode_cursor([authors[-1].id]) if has_more else None
+        return authors, next_cursor
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching authors: {str(e)}",
+        )
+
+
+async def get_author(
+    session: AsyncSession, author_id: int, include: frozenset = frozenset()
+):
+    """
+    Versión asíncrona de get_author.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        author_id (int): ID del autor a buscar.
+        include (frozenset, optional): Datos adicionales ("books", "book_count").
+
+    Returns:
+        SchemaAuthorResponse | SchemaAuthorDetailResponse: El autor correspondiente al
+            ID.
+
+    Raises:
+        HTTPException:
+            - 404: Si el autor no se encuentra en la base de datos.
+    """
+    if include:
+        stmt = author_details_statement(include).where(Author.id == author_id)
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
+            )
+        return author_details([row], include)[0]
+    cached = await entity_cache.get_async(author_key(author_id), SchemaAuthorResponse)
+    if cached is not None:
+        return cached
+    lease = await entity_cache.lease_async(author_key(author_id))
+    author = await session.get(Author, author_id)
+    if not author:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
+        )
+    return await entity_cache.run_async(_cache_author, author, lease)
+
+
+async def update_author(session: AsyncSession, author_id: int, author: SchemaAuthor):
+    """
+    Versión asíncrona de update_author.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        author_id (int): ID del autor a actualizar.
+        author (SchemaAuthor): Datos actualizados del autor.
+
+    Returns:
+        SchemaAuthorResponse: El autor actualizado.
+
+    Raises:
+        HTTPException:
+            - 404: Si el autor no existe en la base de datos.
+            - 400: Si otro autor ya tiene el mismo nombre.
+            - 500: Si ocurre un error inesperado durante la actualización.
+    """
+    return await patch_author(session, author_id, author)
+
+
+async def patch_author(
+    session: AsyncSession, author_id: int, author: SchemaAuthorUpdate | SchemaAuthor
+):
+    """
+    Versión asíncrona de patch_author (UPDATE ... RETURNING de los campos enviados).
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        author_id (int): ID del autor a actualizar.
+        author (SchemaAuthorUpdate | SchemaAuthor): Campos a modificar.
+
+    Returns:
+        SchemaAuthorResponse: El autor actualizado.
+
+    Raises:
+        HTTPException:
+            - 404: Si el autor no existe en la base de datos.
+            - 400: Si otro autor ya tiene el mismo nombre.
+            - 500: Si ocurre un error inesperado durante la actualización.
+    """
+    values = author.model_dump(exclude_unset=True)
+    if not values:
+        return await get_author(session, author_id)
+    stmt = (
+        update(Author)
+        .where(Author.id == author_id)
+        .values(**values)
+        .returning(*AUTHOR_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        row = (await session.execute(stmt)).one_or_none()
+        with author_index.own_write(row is not None):
+            await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise _author_integrity_error(e)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error updating author: {str(e)}",
+        )
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
+        )
+    await entity_cache.delete_async(author_key(author_id))
+    author_index.add(row.id, row.full_name)
+    return SchemaAuthorResponse.model_validate(row, from_attributes=True)
+
+
+async def delete_author(session: AsyncSession, author_id: int):
+    """
+    Versión asíncrona de delete_author.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        author_id (int): ID del autor a eliminar.
+
+    Raises:
+        HTTPException:
+            - 404: Si el autor no existe en la base de datos.
+            - 500: Si ocurre un error inesperado durante la eliminación.
+    """
+    deleted = await delete_authors(session, [author_id])
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
+        )
+
+
+async def delete_authors(session: AsyncSession, author_ids: list[int]) -> list[int]:
+    """
+    Versión asíncrona de delete_authors.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        author_ids (list[int]): IDs de los autores a eliminar.
+
+    Returns:
+        list[int]: IDs de los autores eliminados.
+
+    Raises:
+        HTTPException:
+            - 413: Si la lista supera BULK_MAX_ITEMS IDs.
+            - 500: Si ocurre un error inesperado durante la eliminación.
+    """
+    if len(author_ids) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many authors in one request (max {BULK_MAX_ITEMS})",
+        )
+    if not author_ids:
+        return []
+    try:
+        locked = list(
+            await session.scalars(
+                select(Author.id).where(Author.id.in_(author_ids)).with_for_update()
+            )
+        )
+        if not locked:
+            await session.rollback()
+            return []
+        rows = (await session.execute(delete_authors_statement(locked))).all()
+        with author_index.own_write(bool(rows)):
+            await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error deleting authors: {str(e)}",
+        )
+    return await entity_cache.run_async(_invalidate_deleted_authors, rows)
@@ -0,0 +1,272 @@
+from app.models import *
+from app.schemas import *
+from app.pagination import clamp_limit
+from app.cache import book_key, entity_cache
+from app.crud.books import (
+    BOOK_RESPONSE_COLUMNS,
+    BULK_MAX_ITEMS,
+    _book_integrity_error,
+    _cache_book,
+    books_page_statement,
+    search_books_statement,
+    split_books_page,
+)
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def create_book(session: AsyncSession, book: SchemaBook):
+    """
+    Versión asíncrona de create_book.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        book (SchemaBook): Objeto que contiene los datos del libro.
+
+    Returns:
+        SchemaBookResponse: El libro recién creado con su ID asignado por la base de datos.
+
+    Raises:
+        HTTPException:
+            - 404: Si el autor no existe en la base de datos.
+            - 400: Si ya existe un libro con el mismo ISBN.
+            - 500: Si ocurre un error inesperado al intentar guardar el libro.
+    """
+    stmt = insert(Book).values(**book.model_dump()).returning(*BOOK_RESPONSE_COLUMNS)
+    try:
+        row = (await session.execute(stmt)).one()
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise _book_integrity_error(e, book.ISBN)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error creating book: {str(e)}")
+    return SchemaBookResponse.model_validate(row, from_attributes=True)
+
+
+async def get_books(
+    session: AsyncSession,
+    after: str = None,
+    limit: int = None,
+    filters: SchemaBookFilters = None,
+):
+    """
+    Versión asíncrona de get_books (paginación por cursor con filtros y orden).
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        after (str, optional): Cursor opaco devuelto en la página anterior.
+        limit (int, optional): Número máximo de libros a devolver.
+        filters (SchemaBookFilters, optional): Filtros y orden del listado.
+
+    Returns:
+        tuple[list[Row], str | None]: Los libros de la página y el cursor de la
+            página siguiente.
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
+    """
+    filters = filters or SchemaBookFilters()
+    limit = clamp_limit(limit)
+    books = (await session.execute(books_page_statement(filters, after, limit))).all()
+    return split_books_page(books, limit, filters.sort)
+
+
+async def get_book(session: AsyncSession, book_id: int):
+    """
+    Versión asíncrona de get_book.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        book_id (int): ID del libro a buscar.
+
+    Returns:
+        SchemaBookResponse: El libro correspondiente al ID.
+
+    Raises:
+        HTTPException:
+            - 404: Si el libro no se encuentra en la base de datos.
+    """
+    cached = await entity_cache.get_async(book_key(book_id), SchemaBookResponse)
+    if cached is not None:
+        return cached
+    lease = await entity_cache.lease_async(book_key(book_id))
+    book = await session.get(Book, book_id)
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return await entity_cache.run_async(_cache_book, book, lease)
+
+
+async def update_book(session: AsyncSession, book_id: int, book: SchemaBook):
+    """
+    Versión asíncrona de update_book.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        book_id (int): ID del libro a actualizar.
+        book (SchemaBook): Datos actualizados del libro.
+
+    Returns:
+        SchemaBookResponse: El libro actualizado.
+
+    Raises:
+        HTTPException:
+            - 404: Si el libro o el autor no existen en la base de datos.
+            - 400: Si otro libro con el mismo ISBN ya existe.
+            - 500: Si ocurre un error inesperado durante la actualización.
+    """
+    return await patch_book(session, book_id, book)
+
+
+async def patch_book(
+    session: AsyncSession, book_id: int, book: SchemaBookUpdate | SchemaBook
+):
+    """
+    Versión asíncrona de patch_book (UPDATE ... RETURNING de los campos enviados).
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        book_id (int): ID del libro a actualizar.
+        book (SchemaBookUpdate | SchemaBook): Campos a modificar.
+
+    Returns:
+        SchemaBookResponse: El libro actualizado.
+
+    Raises:
+        HTTPException:
+            - 404: Si el libro o el autor no existen en la base de datos.
+            - 400: Si otro libro con el mismo ISBN ya existe.
+            - 500: Si ocurre un error inesperado durante la actualización.
+    """
+    values = book.model_dump(exclude_unset=True)
+    if not values:
+        return await get_book(session, book_id)
+    stmt = (
+        update(Book)
+        .where(Book.id == book_id)
+        .values(**values)
+        .returning(*BOOK_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        row = (await session.execute(stmt)).one_or_none()
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise _book_integrity_error(e, values.get("ISBN"))
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error updating book: {str(e)}")
+    if row is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    await entity_cache.delete_async(book_key(book_id))
+    return SchemaBookResponse.model_validate(row, from_attributes=True)
+
+
+async def delete_book(session: AsyncSession, book_id: int):
+    """
+    Versión asíncrona de delete_book (un solo DELETE ... RETURNING).
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        book_id (int): ID del libro a eliminar.
+
+    Raises:
+        HTTPException:
+            - 404: Si el libro no existe en la base de datos.
+            - 500: Si ocurre un error inesperado durante la eliminación.
+    """
+    stmt = (
+        delete(Book)
+        .where(Book.id == book_id)
+        .returning(Book.id)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        deleted = await session.scalar(stmt)
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error deleting book: {str(e)}")
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    await entity_cache.delete_async(book_key(book_id))
+
+
+async def delete_books(session: AsyncSession, book_ids: list[int]) -> list[int]:
+    """
+    Versión asíncrona de delete_books.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        book_ids (list[int]): IDs de los libros a eliminar.
+
+    Returns:
+        list[int]: IDs de los libros eliminados.
+
+    Raises:
+        HTTPException:
+            - 413: Si la lista supera BULK_MAX_ITEMS IDs.
+            - 500: Si ocurre un error inesperado durante la eliminación.
+    """
+    if len(book_ids) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many books in one request (max {BULK_MAX_ITEMS})",
+        )
+    if not book_ids:
+        return []
+    try:
+        deleted = list(
+            await session.scalars(
+                delete(Book)
+                .where(Book.id.in_(book_ids))
+                .returning(Book.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error deleting books: {str(e)}")
+    await entity_cache.delete_async(*map(book_key, deleted))
+    return sorted(deleted)
+
+
+async def search_books(
+    session: AsyncSession,
+    author_name: str = None,
+    year: int = None,
+    q: str = None,
+    limit: int = None,
+):
+    """
+    Versión asíncrona de search_books.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        author_name (str, optional): Nombre del autor (parcial o completo).
+        year (int, optional): Año de publicación del libro.
+        q (str, optional): Texto a buscar en el título o el nombre del autor.
+        limit (int, optional): Número máximo de libros a devolver en la búsqueda por `q`.
+
+    Returns:
+        list[Row]: Lista de libros que coinciden con los criterios de búsqueda.
+
+    Raises:
+        HTTPException:
+            - 404: Si no se encuentran libros con los criterios proporcionados.
+    """
+    stmt = search_books_statement(author_name, year, q, limit)
+    books = (await session.execute(stmt)).all()
+
+    if not books:
+        raise HTTPException(
+            status_code=404, detail="No books found with the given criteria"
+        )
+
+    return books
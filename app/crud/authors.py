@@ -1,8 +1,35 @@
 from app.models import *
 from app.schemas import *
+from app.pagination import clamp_limit, decode_id_cursor, encode_cursor
+from app.cache import author_key, book_key, entity_cache
+from app.replicas import read_from_replica
+from app.suggest import author_index
+from app.crud.errors import UNIQUE_VIOLATION, integrity_error_code
+from sqlalchemy import delete, false, func, insert, select, true, union_all
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from fastapi_sqlalchemy import db
 from fastapi import HTTPException, status
+import os
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+# Columnas que necesita SchemaAuthorResponse, consultadas como filas (Row) en los
+# listados.
+AUTHOR_RESPONSE_COLUMNS = tuple(
+    getattr(Author, name) for name in SchemaAuthorResponse.model_fields
+)
+AUTHOR_INCLUDES = ("books", "book_count")
+# Número de libros de cada autor: un COUNT correlacionado que se resuelve con el
+# índice ix_books_author_id, en la misma consulta que los autores.
+BOOK_COUNT = (
+    select(func.count(Book.id))
+    .where(Book.author_id == Author.id)
+    .correlate(Author)
+    .scalar_subquery()
+    .label("book_count")
+)
 
 
 def create_author(author: SchemaAuthor):
@@ -14,40 +41,147 @@ def create_author(author: SchemaAuthor):
             full_name (str): Nombre completo del autor.
 
     Returns:
-        Author: El objeto del autor recién creado.
+        SchemaAuthorResponse: El autor recién creado.
 
     Raises:
         HTTPException:
             - 400: Si el autor ya existe en la base de datos.
             - 500: Si ocurre un error inesperado durante la creación.
     """
-    db_author = Author(full_name=author.full_name)
+    stmt = insert(Author).values(**author.model_dump())
     try:
-        db.session.add(db_author)
-        db.session.commit()
-        return db_author
+        row = db.session.execute(stmt.returning(*AUTHOR_RESPONSE_COLUMNS)).one()
+        with author_index.own_write():
+            db.session.commit()
     except IntegrityError as e:
         db.session.rollback()
-        raise HTTPException(status_code=400, detail=f"Author already exists")
+        raise _author_integrity_error(e)
     except Exception as e:
         db.session.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating author: {str(e)}")
+    author_index.add(row.id, row.full_name)
+    # No se guarda en la caché: una escritura confirmada entre este commit y el set
+    # quedaría tapada por esta fila. La primera lectura la guarda con un lease.
+    return SchemaAuthorResponse.model_validate(row, from_attributes=True)
 
 
-def get_authors():
+def create_authors(authors: list[SchemaAuthor]):
     """
-    Obtiene la lista de todos los autores en la base de datos.
+    Crea varios autores en una sola sentencia y resuelve los IDs de los que ya existían.
+
+    Usa INSERT ... ON CONFLICT (full_name) DO NOTHING RETURNING dentro de un CTE, unido
+    con la consulta de los autores existentes, para que los duplicados no provoquen una
+    transacción fallida ni una consulta adicional por autor.
+
+    Args:
+        authors (list[SchemaAuthor]): Autores a crear.
 
     Returns:
-        list[Author]: Una lista de todos los autores registrados.
+        list[dict]: Un resultado por autor, en el mismo orden de entrada, con su nombre,
+            ID y si fue creado en esta petición.
 
     Raises:
         HTTPException:
+            - 413: Si el lote supera BULK_MAX_ITEMS autores.
+            - 500: Si ocurre un error inesperado durante la creación.
+    """
+    if len(authors) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many authors in one request (max {BULK_MAX_ITEMS})",
+        )
+    names = list(dict.fromkeys(author.full_name for author in authors))
+    if not names:
+        return []
+
+    table = Author.__table__
+    inserted = (
+        pg_insert(table)
+        .values([{"full_name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=["full_name"])
+        .returning(table.c.id, table.c.full_name)
+        .cte("inserted")
+    )
+    stmt = union_all(
+        select(inserted.c.id, inserted.c.full_name, true().label("created")),
+        select(table.c.id, table.c.full_name, false()).where(
+            table.c.full_name.in_(names)
+        ),
+    )
+    try:
+        resolved = {
+            full_name: (author_id, created)
+            for author_id, full_name, created in db.session.execute(stmt)
+        }
+        missing = [name for name in names if name not in resolved]
+        if missing:
+            # Autores confirmados por otra transacción después de iniciada la sentencia.
+            resolved.update(
+                (full_name, (author_id, False))
+                for author_id, full_name in db.session.execute(
+                    select(table.c.id, table.c.full_name).where(
+                        table.c.full_name.in_(missing)
+                    )
+                )
+            )
+        with author_index.own_write(any(created for _, created in resolved.values())):
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating authors: {str(e)}",
+        )
+    for full_name, (author_id, created) in resolved.items():
+        if created:
+            author_index.add(author_id, full_name)
+    return [
+        {
+            "full_name": author.full_name,
+            "id": resolved[author.full_name][0],
+            "created": resolved[author.full_name][1],
+        }
+        for author in authors
+    ]
+
+
+def get_authors(after: str = None, limit: int = None, include: frozenset = frozenset()):
+    """
+    Obtiene una página de autores ordenados por ID, usando paginación por cursor
+    (keyset): cada página es un recorrido por rango sobre el índice de la llave primaria.
+
+    Args:
+        after (str, optional): Cursor opaco devuelto en la página anterior.
+        limit (int, optional): Número máximo de autores a devolver.
+        include (frozenset, optional): Datos adicionales ("books", "book_count"), ver
+            parse_author_include.
+
+    Returns:
+        tuple[list, str | None]: Los autores de la página (filas con las columnas de
+            SchemaAuthorResponse, o SchemaAuthorDetailResponse si se pide `include`) y
+            el cursor de la página siguiente (None si no hay más resultados).
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
             - 500: Si ocurre un error inesperado al obtener los autores.
     """
+    last_id = decode_id_cursor(after)
+    limit = clamp_limit(limit)
     try:
-        authors = db.session.query(Author).all()
-        return authors
+        if include:
+            stmt = author_details_statement(include)
+        else:
+            stmt = select(*AUTHOR_RESPONSE_COLUMNS)
+        if last_id is not None:
+            stmt = stmt.where(Author.id > last_id)
+        authors = db.session.execute(stmt.order_by(Author.id).limit(limit + 1)).all()
+        has_more = len(authors) > limit
+        authors = authors[:limit]
+        if include:
+            authors = author_details(authors, include)
+        next_cursor = encode_cursor([authors[-1].id]) if has_more else None
+        return authors, next_cursor
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -55,26 +189,135 @@ def get_authors():
         )
 
 
-def get_author(author_id: int):
+def get_author(author_id: int, include: frozenset = frozenset()):
     """
     Obtiene un autor específico por su ID.
 
     Args:
         author_id (int): ID del autor a buscar.
+        include (frozenset, optional): Datos adicionales ("books", "book_count"), ver
+            parse_author_include.
+
+    Las lecturas sin `include` pasan por la caché de entidades (app.cache).
 
     Returns:
-        Author: El objeto del autor correspondiente al ID.
+        SchemaAuthorResponse | SchemaAuthorDetailResponse: El autor correspondiente al
+            ID, con sus libros y/o su número de libros si se piden en `include`.
 
     Raises:
         HTTPException:
             - 404: Si el autor no se encuentra en la base de datos.
     """
+    if include:
+        stmt = author_details_statement(include).where(Author.id == author_id)
+        row = db.session.execute(stmt).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
+            )
+        return author_details([row], include)[0]
+    cached = entity_cache.get(author_key(author_id), SchemaAuthorResponse)
+    if cached is not None:
+        return cached
+    # El lease se pide antes de la consulta: si el autor se modifica entretanto, la
+    # fila leída no se guarda en la caché.
+    lease = entity_cache.lease(author_key(author_id))
     author = db.session.get(Author, author_id)
     if not author:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
         )
-    return author
+    return _cache_author(author, lease)
+
+
+def parse_author_include(include: str = None) -> frozenset:
+    """
+    Interpreta el parámetro `include` de los endpoints de autores: una lista separada
+    por comas con "books" (los libros de cada autor) y/o "book_count" (su número).
+
+    Args:
+        include (str, optional): Valor del parámetro, por ejemplo "books,book_count".
+
+    Returns:
+        frozenset: Los valores pedidos.
+
+    Raises:
+        HTTPException:
+            - 400: Si se pide un valor desconocido.
+    """
+    if not include:
+        return frozenset()
+    values = frozenset(value.strip() for value in include.split(",") if value.strip())
+    unknown = values.difference(AUTHOR_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid include: {', '.join(sorted(unknown))}",
+        )
+    return values
+
+
+def author_details_statement(include: frozenset):
+    """
+    Construye la consulta de autores con los datos de `include`. El número de libros se
+    calcula en la misma consulta (BOOK_COUNT) y los libros se cargan con selectinload:
+    una sola consulta adicional (author_id IN ...) para toda la página, sin importar
+    cuántos autores tenga.
+
+    Args:
+        include (frozenset): Datos adicionales pedidos.
+
+    Returns:
+        Select: Consulta de SQLAlchemy sobre Author (y book_count).
+    """
+    stmt = select(Author)
+    if "book_count" in include:
+        stmt = stmt.add_columns(BOOK_COUNT)
+    if "books" in include:
+        stmt = stmt.options(selectinload(Author.books))
+    return stmt
+
+
+def author_details(rows: list, include: frozenset) -> list[SchemaAuthorDetailResponse]:
+    """
+    Convierte las filas de author_details_statement en SchemaAuthorDetailResponse.
+    Solo se asignan los campos pedidos, de modo que los demás se omiten de la respuesta
+    (response_model_exclude_unset).
+
+    Args:
+        rows (list[Row]): Filas con el autor (y book_count).
+        include (frozenset): Datos adicionales pedidos.
+
+    Returns:
+        list[SchemaAuthorDetailResponse]: Los autores con sus datos adicionales.
+    """
+    details = []
+    for row in rows:
+        author = row[0]
+        data = {
+            name: getattr(author, name) for name in SchemaAuthorResponse.model_fields
+        }
+        if "book_count" in include:
+            data["book_count"] = row.book_count
+        if "books" in include:
+            data["books"] = sorted(author.books, key=lambda book: book.id)
+        details.append(
+            SchemaAuthorDetailResponse.model_validate(data, from_attributes=True)
+        )
+    return details
+
+
+def _cache_author(author: Author, lease: int) -> SchemaAuthorResponse:
+    """
+    Guarda en la caché de entidades la representación de un autor leído de la base de
+    datos y la devuelve, con el lease pedido antes de la consulta (EntityCache.lease).
+    """
+    result = SchemaAuthorResponse.model_validate(author, from_attributes=True)
+    # Una lectura de réplica puede ser anterior a la última invalidación de la
+    # entrada; no se guarda para no reintroducir datos desactualizados.
+    if not read_from_replica.get():
+        entity_cache.set(author_key(author.id), result, SchemaAuthorResponse, lease)
+    return result
 
 
 def update_author(author_id: int, author: SchemaAuthor):
@@ -87,34 +330,82 @@ def update_author(author_id: int, author: SchemaAuthor):
             full_name (str): Nombre completo del autor.
 
     Returns:
-        Author: El objeto del autor actualizado.
+        SchemaAuthorResponse: El autor actualizado.
 
     Raises:
         HTTPException:
             - 404: Si el autor no existe en la base de datos.
+            - 400: Si otro autor ya tiene el mismo nombre.
             - 500: Si ocurre un error inesperado durante la actualización.
     """
-    db_author = db.session.get(Author, author_id)
-    if not db_author:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
-        )
+    return patch_author(author_id, author)
+
 
+def patch_author(author_id: int, author: SchemaAuthorUpdate | SchemaAuthor):
+    """
+    Actualiza solo los campos enviados de un autor con un solo UPDATE ... RETURNING,
+    sin consultarlo antes.
+
+    Args:
+        author_id (int): ID del autor a actualizar.
+        author (SchemaAuthorUpdate | SchemaAuthor): Campos a modificar.
+
+    Returns:
+        SchemaAuthorResponse: El autor actualizado.
+
+    Raises:
+        HTTPException:
+            - 404: Si el autor no existe en la base de datos.
+            - 400: Si otro autor ya tiene el mismo nombre.
+            - 500: Si ocurre un error inesperado durante la actualización.
+    """
+    values = author.model_dump(exclude_unset=True)
+    if not values:
+        return get_author(author_id)
+    stmt = (
+        update(Author)
+        .where(Author.id == author_id)
+        .values(**values)
+        .returning(*AUTHOR_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
     try:
-        db_author.full_name = author.full_name
-        db.session.commit()
-        return db_author
+        row = db.session.execute(stmt).one_or_none()
+        with author_index.own_write(row is not None):
+            db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        raise _author_integrity_error(e)
     except Exception as e:
         db.session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating author: {str(e)}",
         )
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
+        )
+    entity_cache.delete(author_key(author_id))
+    author_index.add(row.id, row.full_name)
+    return SchemaAuthorResponse.model_validate(row, from_attributes=True)
+
+
+def _author_integrity_error(error: IntegrityError) -> HTTPException:
+    """Traduce una violación de restricción al escribir un autor en un error HTTP."""
+    if integrity_error_code(error) == UNIQUE_VIOLATION:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Author already exists"
+        )
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid author data"
+    )
 
 
 def delete_author(author_id: int):
     """
-    Elimina un autor de la base de datos por su ID.
+    Elimina un autor de la base de datos por su ID. Sus libros los elimina la base de
+    datos (ON DELETE CASCADE), sin cargarlos en la sesión.
 
     Args:
         author_id (int): ID del autor a eliminar.
@@ -124,18 +415,84 @@ def delete_author(author_id: int):
             - 404: Si el autor no existe en la base de datos.
             - 500: Si ocurre un error inesperado durante la eliminación.
     """
-    db_author = db.session.get(Author, author_id)
-    if not db_author:
+    deleted = delete_authors([author_id])
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
         )
 
+
+def delete_authors(author_ids: list[int]) -> list[int]:
+    """
+    Elimina varios autores con un solo DELETE; sus libros se eliminan en cascada en la
+    base de datos.
+
+    Los autores se bloquean (FOR UPDATE) antes del DELETE, de modo que no se les pueden
+    agregar libros hasta el commit y los IDs de libros devueltos por el DELETE (para
+    invalidar la caché de entidades) están completos.
+
+    Args:
+        author_ids (list[int]): IDs de los autores a eliminar.
+
+    Returns:
+        list[int]: IDs de los autores eliminados (los que no existían se omiten).
+
+    Raises:
+        HTTPException:
+            - 413: Si la lista supera BULK_MAX_ITEMS IDs.
+            - 500: Si ocurre un error inesperado durante la eliminación.
+    """
+    if len(author_ids) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many authors in one request (max {BULK_MAX_ITEMS})",
+        )
+    if not author_ids:
+        return []
     try:
-        db.session.delete(db_author)
-        db.session.commit()
+        locked = db.session.scalars(
+            select(Author.id).where(Author.id.in_(author_ids)).with_for_update()
+        ).all()
+        if not locked:
+            db.session.rollback()
+            return []
+        rows = db.session.execute(delete_authors_statement(locked)).all()
+        with author_index.own_write(bool(rows)):
+            db.session.commit()
     except Exception as e:
         db.session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error deleting author: {str(e)}",
+            detail=f"Error deleting authors: {str(e)}",
         )
+    return _invalidate_deleted_authors(rows)
+
+
+def delete_authors_statement(author_ids: list[int]):
+    """
+    DELETE de autores que devuelve, por cada autor eliminado, su ID y los IDs de sus
+    libros (que la base de datos elimina en cascada al final de la sentencia).
+    """
+    book_ids = (
+        select(func.array_agg(Book.id))
+        .where(Book.author_id == Author.id)
+        .scalar_subquery()
+    )
+    return (
+        delete(Author)
+        .where(Author.id.in_(author_ids))
+        .returning(Author.id, book_ids.label("book_ids"))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _invalidate_deleted_authors(rows: list) -> list[int]:
+    """
+    Invalida en la caché los autores eliminados y sus libros, y los quita del índice de
+    sugerencias; devuelve sus IDs.
+    """
+    book_ids = [book_id for row in rows for book_id in row.book_ids or ()]
+    deleted = sorted(row.id for row in rows)
+    entity_cache.delete(*map(author_key, deleted), *map(book_key, book_ids))
+    author_index.remove(*deleted)
+    return deleted
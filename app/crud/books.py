@@ -1,15 +1,49 @@
 from app.models import *
 from app.schemas import *
+from app.pagination import clamp_limit, decode_cursor, decode_id_cursor, encode_cursor
+from app.cache import book_key, entity_cache
+from app.replicas import read_from_replica
+from app.crud.errors import (
+    FOREIGN_KEY_VIOLATION,
+    UNIQUE_VIOLATION,
+    integrity_error_code,
+)
 from fastapi_sqlalchemy import db
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Query
-from sqlalchemy import extract
+from sqlalchemy import and_, delete, func, insert, select, tuple_, union_all
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+from datetime import date
+import csv
+import io
+import json
+import os
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "author_id",
+    "author_full_name",
+    "ISBN",
+    "date_published",
+    "date_created",
+)
+# Columnas que necesita SchemaBookResponse. Los listados las consultan como filas
+# (Row), sin construir instancias de Book ni registrarlas en la sesión.
+BOOK_RESPONSE_COLUMNS = tuple(
+    getattr(Book, name) for name in SchemaBookResponse.model_fields
+)
 
 
 def create_book(book: SchemaBook):
     """
-    Crea un nuevo libro en la base de datos.
+    Crea un nuevo libro en la base de datos con un solo INSERT ... RETURNING. La
+    existencia del autor la verifica la llave foránea.
 
     Args:
         book (SchemaBook): Objeto que contiene los datos del libro. Debe incluir:
@@ -19,7 +53,7 @@ def create_book(book: SchemaBook):
             date_published (date): Fecha de publicación del libro.
 
     Returns:
-        Book: El objeto del libro recién creado con su ID asignado por la base de datos.
+        SchemaBookResponse: El libro recién creado con su ID asignado por la base de datos.
 
     Raises:
         HTTPException:
@@ -27,37 +61,263 @@ def create_book(book: SchemaBook):
             - 400: Si ya existe un libro con el mismo ISBN.
             - 500: Si ocurre un error inesperado al intentar guardar el libro.
     """
-    db_author = db.session.get(Author, book.author_id)
-    if db_author is None:
-        raise HTTPException(status_code=404, detail="Author not found")
-    db_book = Book(
-        title=book.title,
-        author_id=book.author_id,
-        ISBN=book.ISBN,
-        date_published=book.date_published,
-    )
+    stmt = insert(Book).values(**book.model_dump()).returning(*BOOK_RESPONSE_COLUMNS)
     try:
-        db.session.add(db_book)
+        row = db.session.execute(stmt).one()
         db.session.commit()
-        return db_book
     except IntegrityError as e:
         db.session.rollback()
-        raise HTTPException(
-            status_code=400, detail=f"Book already exists with ISBN: {book.ISBN}"
-        )
+        raise _book_integrity_error(e, book.ISBN)
     except Exception as e:
         db.session.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating book: {str(e)}")
+    # No se guarda en la caché: una escritura confirmada entre este commit y el set
+    # quedaría tapada por esta fila. La primera lectura la guarda con un lease.
+    return SchemaBookResponse.model_validate(row, from_attributes=True)
+
+
+def _book_integrity_error(error: IntegrityError, isbn: str = None) -> HTTPException:
+    """Traduce una violación de restricción al escribir un libro en un error HTTP."""
+    code = integrity_error_code(error)
+    if code == FOREIGN_KEY_VIOLATION:
+        return HTTPException(status_code=404, detail="Author not found")
+    if code == UNIQUE_VIOLATION:
+        return HTTPException(
+            status_code=400, detail=f"Book already exists with ISBN: {isbn}"
+        )
+    return HTTPException(status_code=400, detail="Invalid book data")
 
 
-def get_books():
+def create_books(books: list[SchemaBook]):
     """
-    Obtiene la lista de todos los libros en la base de datos.
+    Crea varios libros en una sola operación. Los autores referenciados se validan con
+    una sola consulta y los libros válidos se insertan con un INSERT de varias filas
+    (ON CONFLICT DO NOTHING sobre el ISBN), de modo que una fila inválida no revierte
+    el resto del lote.
+
+    Args:
+        books (list[SchemaBook]): Libros a crear.
 
     Returns:
-        list[Book]: Una lista de todos los libros disponibles en la base de datos.
+        list[dict]: Un resultado por libro, en el mismo orden de entrada, con su índice,
+            ISBN, estado ("created", "duplicate_isbn" o "unknown_author") e ID asignado.
+
+    Raises:
+        HTTPException:
+            - 413: Si el lote supera BULK_MAX_ITEMS libros.
+            - 409: Si un autor fue eliminado mientras se insertaba el lote.
+            - 500: Si ocurre un error inesperado al intentar guardar los libros.
     """
-    return db.session.query(Book).all()
+    if len(books) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many books in one request (max {BULK_MAX_ITEMS})",
+        )
+    results = [
+        {"index": index, "ISBN": book.ISBN, "status": None, "id": None}
+        for index, book in enumerate(books)
+    ]
+    author_ids = {book.author_id for book in books}
+    existing_author_ids = set(
+        db.session.scalars(select(Author.id).where(Author.id.in_(author_ids)))
+    )
+
+    pending = {}
+    rows = []
+    for result, book in zip(results, books):
+        if book.author_id not in existing_author_ids:
+            result["status"] = "unknown_author"
+        elif book.ISBN in pending:
+            result["status"] = "duplicate_isbn"
+        else:
+            pending[book.ISBN] = result
+            rows.append(
+                {
+                    "title": book.title,
+                    "author_id": book.author_id,
+                    "ISBN": book.ISBN,
+                    "date_published": book.date_published,
+                }
+            )
+
+    if rows:
+        stmt = (
+            pg_insert(Book.__table__)
+            .on_conflict_do_nothing(index_elements=["ISBN"])
+            .returning(Book.__table__.c.id, Book.__table__.c.ISBN)
+        )
+        try:
+            inserted = db.session.connection().execute(stmt, rows).all()
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise HTTPException(
+                status_code=409, detail="Authors changed during the import, retry"
+            )
+        except Exception as e:
+            db.session.rollback()
+            raise HTTPException(
+                status_code=500, detail=f"Error creating books: {str(e)}"
+            )
+        for book_id, isbn in inserted:
+            pending[isbn]["id"] = book_id
+            pending[isbn]["status"] = "created"
+
+    for result in results:
+        if result["status"] is None:
+            result["status"] = "duplicate_isbn"
+    return results
+
+
+def get_books(after: str = None, limit: int = None, filters: SchemaBookFilters = None):
+    """
+    Obtiene una página de libros usando paginación por cursor (keyset): cada página es
+    un recorrido por rango sobre el índice de la clave de ordenamiento.
+
+    Args:
+        after (str, optional): Cursor opaco devuelto en la página anterior.
+        limit (int, optional): Número máximo de libros a devolver.
+        filters (SchemaBookFilters, optional): Filtros (autores, rangos de años y
+            fechas) y orden del listado.
+
+    Returns:
+        tuple[list[Row], str | None]: Los libros de la página (filas con las columnas
+            de SchemaBookResponse) y el cursor de la página siguiente (None si no hay
+            más resultados).
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
+    """
+    filters = filters or SchemaBookFilters()
+    limit = clamp_limit(limit)
+    books = db.session.execute(books_page_statement(filters, after, limit)).all()
+    return split_books_page(books, limit, filters.sort)
+
+
+_SORT_COLUMNS = {"id": None, "title": Book.title, "date_published": Book.date_published}
+
+
+def books_page_statement(filters: SchemaBookFilters, after: str, limit: int):
+    """
+    Construye la consulta de una página de libros. Los rangos de años y fechas se
+    expresan como rangos semiabiertos sobre date_published y el orden siempre termina
+    en el ID, de modo que los filtros y el cursor usan los índices B-tree
+    (ix_books_author_id, ix_books_date_published_id, ix_books_title_id).
+
+    Args:
+        filters (SchemaBookFilters): Filtros y orden del listado.
+        after (str, optional): Cursor opaco devuelto en la página anterior.
+        limit (int): Tamaño de la página (se consulta una fila extra).
+
+    Returns:
+        Select: Consulta de SQLAlchemy sobre BOOK_RESPONSE_COLUMNS.
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido para el orden solicitado.
+    """
+    stmt = select(*BOOK_RESPONSE_COLUMNS)
+    if filters.author_id:
+        stmt = stmt.where(Book.author_id.in_(filters.author_id))
+    if filters.year_from is not None:
+        stmt = stmt.where(Book.date_published >= date(filters.year_from, 1, 1))
+    if filters.year_to is not None:
+        stmt = stmt.where(Book.date_published < date(filters.year_to + 1, 1, 1))
+    if filters.published_from is not None:
+        stmt = stmt.where(Book.date_published >= filters.published_from)
+    if filters.published_before is not None:
+        stmt = stmt.where(Book.date_published < filters.published_before)
+
+    descending = filters.sort.startswith("-")
+    key = filters.sort.lstrip("-")
+    if after is None:
+        return stmt.order_by(*_page_order(Book, key, descending)).limit(limit + 1)
+    ranges = _after_cursor(_SORT_COLUMNS[key], descending, after)
+    if len(ranges) == 1:
+        stmt = stmt.where(ranges[0])
+        return stmt.order_by(*_page_order(Book, key, descending)).limit(limit + 1)
+    # La página cruza el límite entre las fechas y los NULLs: cada fase es un rango del
+    # índice con su propio LIMIT, y la unión (a lo sumo 2 * (limit + 1) filas) se
+    # ordena de nuevo.
+    phases = [
+        stmt.where(condition)
+        .order_by(*_page_order(Book, key, descending))
+        .limit(limit + 1)
+        .subquery()
+        for condition in ranges
+    ]
+    page = union_all(*(select(phase) for phase in phases)).subquery("page")
+    return select(page).order_by(*_page_order(page.c, key, descending)).limit(limit + 1)
+
+
+def _page_order(columns, key: str, descending: bool) -> list:
+    """Orden de la página sobre las columnas de Book o de la subconsulta de fases."""
+    order = [columns.id] if key == "id" else [getattr(columns, key), columns.id]
+    order = [item.desc() if descending else item for item in order]
+    if key != "id" and _SORT_COLUMNS[key].nullable:
+        # El orden por defecto de PostgreSQL, explícito para que el snapshot SQLite
+        # (app.snapshot) pagine igual.
+        order[0] = order[0].nulls_first() if descending else order[0].nulls_last()
+    return order
+
+
+def _after_cursor(column, descending: bool, after: str) -> list:
+    """
+    Condiciones de keyset para continuar después del cursor, una por fase del recorrido.
+    Con date_published se respeta el orden por defecto de PostgreSQL (NULLs al final en
+    orden ascendente y al principio en orden descendente) y el recorrido tiene dos
+    fases, las fechas y los NULLs: cada condición es un solo rango de
+    ix_books_date_published_id, sin OR, y el cursor indica la fase con su valor (None
+    en la fase de NULLs).
+    """
+    if column is None:
+        last_id = decode_id_cursor(after)
+        return [Book.id < last_id if descending else Book.id > last_id]
+
+    value, last_id = decode_cursor(after, size=2)
+    try:
+        if not isinstance(last_id, int) or isinstance(last_id, bool):
+            raise ValueError
+        if column is Book.date_published and value is not None:
+            value = date.fromisoformat(value)
+        elif column is Book.title and not isinstance(value, str):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if value is None:
+        if descending:
+            # Después de los NULLs vienen todas las fechas.
+            return [and_(column.is_(None), Book.id < last_id), column.is_not(None)]
+        return [and_(column.is_(None), Book.id > last_id)]
+    # La comparación de tuplas excluye los NULLs por sí sola.
+    if descending:
+        return [tuple_(column, Book.id) < (value, last_id)]
+    after_value = tuple_(column, Book.id) > (value, last_id)
+    return [after_value, column.is_(None)] if column.nullable else [after_value]
+
+
+def split_books_page(books: list, limit: int, sort: str = "id"):
+    """
+    Separa la fila extra consultada por books_page_statement y genera el cursor de la
+    página siguiente.
+
+    Args:
+        books (list[Row]): Libros consultados (hasta limit + 1).
+        limit (int): Tamaño de la página.
+        sort (str): Orden del listado.
+
+    Returns:
+        tuple[list[Row], str | None]: Los libros de la página y el cursor siguiente.
+    """
+    if len(books) <= limit:
+        return list(books), None
+    books = list(books[:limit])
+    key = sort.lstrip("-")
+    last = books[-1]
+    values = [last.id] if key == "id" else [getattr(last, key), last.id]
+    return books, encode_cursor(values)
 
 
 def get_book(book_id: int):
@@ -67,17 +327,38 @@ def get_book(book_id: int):
     Args:
         book_id (int): ID del libro a buscar.
 
+    Las lecturas pasan por la caché de entidades del proceso (app.cache).
+
     Returns:
-        Book: El objeto del libro correspondiente al ID.
+        SchemaBookResponse: El libro correspondiente al ID.
 
     Raises:
         HTTPException:
             - 404: Si el libro no se encuentra en la base de datos.
     """
+    cached = entity_cache.get(book_key(book_id), SchemaBookResponse)
+    if cached is not None:
+        return cached
+    # El lease se pide antes de la consulta: si el libro se modifica entretanto, la
+    # fila leída no se guarda en la caché.
+    lease = entity_cache.lease(book_key(book_id))
     book = db.session.get(Book, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
-    return book
+    return _cache_book(book, lease)
+
+
+def _cache_book(book: Book, lease: int) -> SchemaBookResponse:
+    """
+    Guarda en la caché de entidades la representación de un libro leído de la base de
+    datos y la devuelve, con el lease pedido antes de la consulta (EntityCache.lease).
+    """
+    result = SchemaBookResponse.model_validate(book, from_attributes=True)
+    # Una lectura de réplica puede ser anterior a la última invalidación de la
+    # entrada; no se guarda para no reintroducir datos desactualizados.
+    if not read_from_replica.get():
+        entity_cache.set(book_key(book.id), result, SchemaBookResponse, lease)
+    return result
 
 
 def update_book(book_id: int, book: SchemaBook):
@@ -93,7 +374,7 @@ def update_book(book_id: int, book: SchemaBook):
             date_published (date): Fecha de publicación.
 
     Returns:
-        Book: El objeto del libro actualizado.
+        SchemaBookResponse: El libro actualizado.
 
     Raises:
         HTTPException:
@@ -101,32 +382,56 @@ def update_book(book_id: int, book: SchemaBook):
             - 400: Si otro libro con el mismo ISBN ya existe.
             - 500: Si ocurre un error inesperado durante la actualización.
     """
-    db_book = db.session.get(Book, book_id)
-    db_author = db.session.get(Author, book.author_id)
-    if not db_book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    if db_author is None:
-        raise HTTPException(status_code=404, detail="Author not found")
+    return patch_book(book_id, book)
+
+
+def patch_book(book_id: int, book: SchemaBookUpdate | SchemaBook):
+    """
+    Actualiza solo los campos enviados de un libro con un solo UPDATE ... RETURNING.
+    La existencia del libro se deduce de la fila devuelta y la del autor la verifica la
+    llave foránea, sin consultas previas.
+
+    Args:
+        book_id (int): ID del libro a actualizar.
+        book (SchemaBookUpdate | SchemaBook): Campos a modificar.
+
+    Returns:
+        SchemaBookResponse: El libro actualizado.
+
+    Raises:
+        HTTPException:
+            - 404: Si el libro o el autor no existen en la base de datos.
+            - 400: Si otro libro con el mismo ISBN ya existe.
+            - 500: Si ocurre un error inesperado durante la actualización.
+    """
+    values = book.model_dump(exclude_unset=True)
+    if not values:
+        return get_book(book_id)
+    stmt = (
+        update(Book)
+        .where(Book.id == book_id)
+        .values(**values)
+        .returning(*BOOK_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
     try:
-        db_book.title = book.title
-        db_book.author_id = book.author_id
-        db_book.ISBN = book.ISBN
-        db_book.date_published = book.date_published
+        row = db.session.execute(stmt).one_or_none()
         db.session.commit()
-        return db_book
     except IntegrityError as e:
         db.session.rollback()
-        raise HTTPException(
-            status_code=400, detail=f"Book already exists with ISBN: {book.ISBN}"
-        )
+        raise _book_integrity_error(e, values.get("ISBN"))
     except Exception as e:
         db.session.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating book: {str(e)}")
+    if row is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    entity_cache.delete(book_key(book_id))
+    return SchemaBookResponse.model_validate(row, from_attributes=True)
 
 
 def delete_book(book_id: int):
     """
-    Elimina un libro de la base de datos por su ID.
+    Elimina un libro de la base de datos por su ID con un solo DELETE ... RETURNING.
 
     Args:
         book_id (int): ID del libro a eliminar.
@@ -136,39 +441,86 @@ def delete_book(book_id: int):
             - 404: Si el libro no existe en la base de datos.
             - 500: Si ocurre un error inesperado durante la eliminación.
     """
-    db_book = db.session.get(Book, book_id)
-    if not db_book:
-        raise HTTPException(status_code=404, detail="Book not found")
+    stmt = (
+        delete(Book)
+        .where(Book.id == book_id)
+        .returning(Book.id)
+        .execution_options(synchronize_session=False)
+    )
     try:
-        db.session.delete(db_book)
+        deleted = db.session.scalar(stmt)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting book: {str(e)}")
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    entity_cache.delete(book_key(book_id))
+
+
+def delete_books(book_ids: list[int]) -> list[int]:
+    """
+    Elimina varios libros con un solo DELETE por sus IDs.
+
+    Args:
+        book_ids (list[int]): IDs de los libros a eliminar.
+
+    Returns:
+        list[int]: IDs de los libros eliminados (los que no existían se omiten).
+
+    Raises:
+        HTTPException:
+            - 413: Si la lista supera BULK_MAX_ITEMS IDs.
+            - 500: Si ocurre un error inesperado durante la eliminación.
+    """
+    if len(book_ids) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many books in one request (max {BULK_MAX_ITEMS})",
+        )
+    if not book_ids:
+        return []
+    try:
+        deleted = db.session.scalars(
+            delete(Book)
+            .where(Book.id.in_(book_ids))
+            .returning(Book.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise HTTPException(status_code=500, detail=f"Error deleting books: {str(e)}")
+    entity_cache.delete(*map(book_key, deleted))
+    return sorted(deleted)
 
 
-def search_books(author_name: str = None, year: int = None):
+def search_books(
+    author_name: str = None, year: int = None, q: str = None, limit: int = None
+):
     """
     Busca libros en la base de datos filtrando por nombre del autor o año de publicación.
 
+    Si se indica `q`, se hace una búsqueda aproximada (trigramas de pg_trgm) sobre el
+    título del libro y el nombre del autor, y los resultados se ordenan por relevancia.
+
     Args:
         author_name (str, optional): Nombre del autor (parcial o completo).
         year (int, optional): Año de publicación del libro.
+        q (str, optional): Texto a buscar en el título o el nombre del autor.
+        limit (int, optional): Número máximo de libros a devolver en la búsqueda por `q`.
 
     Returns:
-        list[Book]: Lista de libros que coinciden con los criterios de búsqueda.
+        list[Row]: Lista de libros (filas con las columnas de SchemaBookResponse) que
+            coinciden con los criterios de búsqueda.
 
     Raises:
         HTTPException:
             - 404: Si no se encuentran libros con los criterios proporcionados.
     """
-    query: Query = db.session.query(Book).join(Author)
-    if author_name:
-        query = query.filter(Author.full_name.ilike(f"%{author_name}%"))
-    if year:
-        query = query.filter(extract("year", Book.date_published) == year)
-
-    books = query.all()
+    books = db.session.execute(
+        search_books_statement(author_name, year, q, limit)
+    ).all()
 
     if not books:
         raise HTTPException(
@@ -176,3 +528,123 @@ def search_books(author_name: str = None, year: int = None):
         )
 
     return books
+
+
+def search_books_statement(
+    author_name: str = None, year: int = None, q: str = None, limit: int = None
+):
+    """
+    Construye la consulta de search_books sobre BOOK_RESPONSE_COLUMNS.
+
+    Args:
+        author_name (str, optional): Nombre del autor (parcial o completo).
+        year (int, optional): Año de publicación del libro.
+        q (str, optional): Texto a buscar en el título o el nombre del autor.
+        limit (int, optional): Número máximo de libros a devolver en la búsqueda por `q`.
+
+    Returns:
+        Select: Consulta de SQLAlchemy.
+    """
+    stmt = select(*BOOK_RESPONSE_COLUMNS).join(Author, Book.author_id == Author.id)
+    if author_name:
+        stmt = stmt.where(Author.full_name.ilike(f"%{author_name}%"))
+    if year:
+        stmt = stmt.where(
+            Book.date_published >= date(year, 1, 1),
+            Book.date_published < date(year + 1, 1, 1),
+        )
+    if q:
+        ranked = _ranked_matches(q)
+        stmt = (
+            stmt.join(ranked, Book.id == ranked.c.book_id)
+            .order_by(ranked.c.rank.desc(), Book.id)
+            .limit(clamp_limit(limit or SEARCH_DEFAULT_LIMIT))
+        )
+    return stmt
+
+
+def _ranked_matches(q: str):
+    """
+    Construye la subconsulta de libros cuyo título o autor coincide aproximadamente con
+    `q`, con su relevancia (word_similarity). Cada rama de la unión usa su propio índice
+    GIN de trigramas (ix_books_title_trgm, ix_authors_full_name_trgm).
+    """
+    title_matches = select(
+        Book.id.label("book_id"), func.word_similarity(q, Book.title).label("rank")
+    ).where(Book.title.op("%>")(q))
+    author_matches = (
+        select(
+            Book.id.label("book_id"),
+            func.word_similarity(q, Author.full_name).label("rank"),
+        )
+        .join(Author, Book.author_id == Author.id)
+        .where(Author.full_name.op("%>")(q))
+    )
+    matches = union_all(title_matches, author_matches).subquery()
+    return (
+        select(matches.c.book_id, func.max(matches.c.rank).label("rank"))
+        .group_by(matches.c.book_id)
+        .subquery("ranked")
+    )
+
+
+def _export_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def export_books(engine: Engine, export_format: str = "ndjson"):
+    """
+    Genera el catálogo completo de libros (con el nombre del autor) en formato NDJSON o
+    CSV, leyendo la tabla con un cursor del lado del servidor en lotes de tamaño fijo.
+
+    La consulta usa su propia conexión, ya que el cuerpo de la respuesta se envía después
+    de que termina la sesión de la petición.
+
+    Args:
+        engine (Engine): Engine de SQLAlchemy desde el cual se abre la conexión.
+        export_format (str): "ndjson" o "csv".
+
+    Yields:
+        str: Fragmentos del archivo exportado, uno por lote de filas.
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+    stmt = (
+        select(
+            Book.id,
+            Book.title,
+            Book.author_id,
+            Author.full_name.label("author_full_name"),
+            Book.ISBN,
+            Book.date_published,
+            Book.date_created,
+        )
+        .outerjoin(Author, Book.author_id == Author.id)
+        .order_by(Book.id)
+    )
+    with engine.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=EXPORT_BATCH_SIZE
+        ).execute(stmt)
+        for rows in result.partitions():
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(
+                    [_export_value(value) for value in row] for row in rows
+                )
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(
+                        dict(zip(EXPORT_COLUMNS, row)),
+                        default=_export_value,
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                    for row in rows
+                )
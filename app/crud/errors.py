@@ -0,0 +1,19 @@
+from sqlalchemy.exc import IntegrityError
+
+# SQLSTATE de PostgreSQL
+FOREIGN_KEY_VIOLATION = "23503"
+UNIQUE_VIOLATION = "23505"
+
+
+def integrity_error_code(error: IntegrityError) -> str | None:
+    """
+    Obtiene el SQLSTATE de una violación de restricción, tanto con psycopg2 como con
+    asyncpg, para responder 404/400 sin consultar antes la base de datos.
+
+    Args:
+        error (IntegrityError): Error lanzado por SQLAlchemy.
+
+    Returns:
+        str | None: El código (por ejemplo, "23505"), o None si el driver no lo expone.
+    """
+    return getattr(error.orig, "pgcode", None)
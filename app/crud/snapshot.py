@@ -0,0 +1,183 @@
+from app.models import *
+from app.schemas import *
+from app.pagination import clamp_limit, decode_id_cursor, encode_cursor
+from app.crud.authors import (
+    AUTHOR_RESPONSE_COLUMNS,
+    author_details,
+    author_details_statement,
+)
+from app.crud.books import (
+    BOOK_RESPONSE_COLUMNS,
+    books_page_statement,
+    search_books_statement,
+    split_books_page,
+)
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def get_collection_version(session: Session, name: str):
+    """
+    Versión de get_collection_version sobre el snapshot: la versión de la colección en
+    el momento en que se exportó.
+
+    Args:
+        session (Session): Sesión sobre el snapshot.
+        name (str): Nombre de la colección (tabla).
+
+    Returns:
+        CollectionVersion | None: Versión y fecha de la última modificación.
+    """
+    return session.get(CollectionVersion, name)
+
+
+def get_authors(
+    session: Session,
+    after: str = None,
+    limit: int = None,
+    include: frozenset = frozenset(),
+):
+    """
+    Versión de get_authors sobre el snapshot.
+
+    Args:
+        session (Session): Sesión sobre el snapshot.
+        after (str, optional): Cursor opaco devuelto en la página anterior.
+        limit (int, optional): Número máximo de autores a devolver.
+        include (frozenset, optional): Datos adicionales ("books", "book_count").
+
+    Returns:
+        tuple[list, str | None]: Los autores de la página y el cursor de la página
+            siguiente (None si no hay más resultados).
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
+    """
+    last_id = decode_id_cursor(after)
+    limit = clamp_limit(limit)
+    if include:
+        stmt = author_details_statement(include)
+    else:
+        stmt = select(*AUTHOR_RESPONSE_COLUMNS)
+    if last_id is not None:
+        stmt = stmt.where(Author.id > last_id)
+    authors = session.execute(stmt.order_by(Author.id).limit(limit + 1)).all()
+    has_more = len(authors) > limit
+    authors = authors[:limit]
+    if include:
+        authors = author_details(authors, include)
+    next_cursor = encode_cursor([authors[-1].id]) if has_more else None
+    return authors, next_cursor
+
+
+def get_author(session: Session, author_id: int, include: frozenset = frozenset()):
+    """
+    Versión de get_author sobre el snapshot (sin la caché de entidades: la lectura es
+    una búsqueda por llave primaria en el archivo mapeado en memoria).
+
+    Args:
+        session (Session): Sesión sobre el snapshot.
+        author_id (int): ID del autor a buscar.
+        include (frozenset, optional): Datos adicionales ("books", "book_count").
+
+    Returns:
+        SchemaAuthorResponse | SchemaAuthorDetailResponse: El autor correspondiente al
+            ID.
+
+    Raises:
+        HTTPException:
+            - 404: Si el autor no se encuentra en el snapshot.
+    """
+    if include:
+        stmt = author_details_statement(include).where(Author.id == author_id)
+        row = session.execute(stmt).first()
+        if row is not None:
+            return author_details([row], include)[0]
+    else:
+        row = session.execute(
+            select(*AUTHOR_RESPONSE_COLUMNS).where(Author.id == author_id)
+        ).first()
+        if row is not None:
+            return SchemaAuthorResponse.model_validate(row, from_attributes=True)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Author not found"
+    )
+
+
+def get_books(
+    session: Session,
+    after: str = None,
+    limit: int = None,
+    filters: SchemaBookFilters = None,
+):
+    """
+    Versión de get_books sobre el snapshot (paginación por cursor con filtros y orden).
+
+    Args:
+        session (Session): Sesión sobre el snapshot.
+        after (str, optional): Cursor opaco devuelto en la página anterior.
+        limit (int, optional): Número máximo de libros a devolver.
+        filters (SchemaBookFilters, optional): Filtros y orden del listado.
+
+    Returns:
+        tuple[list[Row], str | None]: Los libros de la página y el cursor siguiente.
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
+    """
+    filters = filters or SchemaBookFilters()
+    limit = clamp_limit(limit)
+    books = session.execute(books_page_statement(filters, after, limit)).all()
+    return split_books_page(books, limit, filters.sort)
+
+
+def get_book(session: Session, book_id: int):
+    """
+    Versión de get_book sobre el snapshot.
+
+    Args:
+        session (Session): Sesión sobre el snapshot.
+        book_id (int): ID del libro a buscar.
+
+    Returns:
+        SchemaBookResponse: El libro correspondiente al ID.
+
+    Raises:
+        HTTPException:
+            - 404: Si el libro no se encuentra en el snapshot.
+    """
+    row = session.execute(
+        select(*BOOK_RESPONSE_COLUMNS).where(Book.id == book_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return SchemaBookResponse.model_validate(row, from_attributes=True)
+
+
+def search_books(session: Session, author_name: str = None, year: int = None):
+    """
+    Versión de search_books sobre el snapshot, para los filtros por autor y año. La
+    búsqueda aproximada (`q`) necesita los índices de trigramas de PostgreSQL y no se
+    resuelve aquí.
+
+    Args:
+        session (Session): Sesión sobre el snapshot.
+        author_name (str, optional): Nombre del autor (parcial o completo).
+        year (int, optional): Año de publicación del libro.
+
+    Returns:
+        list[Row]: Libros que coinciden con los criterios de búsqueda.
+
+    Raises:
+        HTTPException:
+            - 404: Si no se encuentran libros con los criterios proporcionados.
+    """
+    books = session.execute(search_books_statement(author_name, year)).all()
+    if not books:
+        raise HTTPException(
+            status_code=404, detail="No books found with the given criteria"
+        )
+    return books
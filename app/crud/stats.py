@@ -0,0 +1,74 @@
+from app.models import Author, Book, BookCountByAuthor, BookCountByYear
+from app.crud.books import BOOK_RESPONSE_COLUMNS
+from app.pagination import clamp_limit
+from fastapi_sqlalchemy import db
+from sqlalchemy import select
+
+STATS_DEFAULT_LIMIT = 10
+
+
+def get_books_by_year(year_from: int = None, year_to: int = None):
+    """
+    Obtiene el número de libros por año de publicación desde la vista
+    book_counts_by_year, que suma los conteos que los triggers de books mantienen al
+    día: el costo depende del número de años, no del de libros. Los libros sin fecha de
+    publicación no se cuentan.
+
+    Args:
+        year_from (int, optional): Primer año a incluir.
+        year_to (int, optional): Último año a incluir.
+
+    Returns:
+        list[Row]: Años con al menos un libro y su número de libros, en orden.
+    """
+    stmt = select(BookCountByYear.year, BookCountByYear.book_count)
+    if year_from is not None:
+        stmt = stmt.where(BookCountByYear.year >= year_from)
+    if year_to is not None:
+        stmt = stmt.where(BookCountByYear.year <= year_to)
+    return db.session.execute(stmt.order_by(BookCountByYear.year)).all()
+
+
+def get_books_by_author(limit: int = None):
+    """
+    Obtiene los autores con más libros desde la vista book_counts_by_author: el costo
+    depende del número de autores con libros (se suman sus conteos y se eligen los
+    `limit` mayores), no del de libros.
+
+    Args:
+        limit (int, optional): Número de autores a devolver (10 por defecto).
+
+    Returns:
+        list[Row]: Autores con su nombre y número de libros, de mayor a menor.
+    """
+    limit = clamp_limit(limit or STATS_DEFAULT_LIMIT)
+    stmt = (
+        select(
+            BookCountByAuthor.author_id,
+            Author.full_name,
+            BookCountByAuthor.book_count,
+        )
+        .join(Author, Author.id == BookCountByAuthor.author_id)
+        .order_by(
+            BookCountByAuthor.book_count.desc(), BookCountByAuthor.author_id.desc()
+        )
+        .limit(limit)
+    )
+    return db.session.execute(stmt).all()
+
+
+def get_newest_books(limit: int = None):
+    """
+    Obtiene los últimos libros agregados al catálogo, en orden inverso de creación (los
+    IDs son secuenciales), leyendo solo `limit` entradas del índice de la llave
+    primaria.
+
+    Args:
+        limit (int, optional): Número de libros a devolver (10 por defecto).
+
+    Returns:
+        list[Row]: Libros con las columnas de SchemaBookResponse.
+    """
+    limit = clamp_limit(limit or STATS_DEFAULT_LIMIT)
+    stmt = select(*BOOK_RESPONSE_COLUMNS).order_by(Book.id.desc()).limit(limit)
+    return db.session.execute(stmt).all()
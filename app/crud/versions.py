@@ -0,0 +1,32 @@
+from app.models import CollectionVersion
+from fastapi_sqlalchemy import db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def get_collection_version(name: str):
+    """
+    Obtiene la versión actual de una colección ("authors" o "books"), mantenida por
+    triggers en la base de datos. Es una lectura por llave primaria, sin recorrer la
+    colección.
+
+    Args:
+        name (str): Nombre de la colección (tabla).
+
+    Returns:
+        CollectionVersion | None: Versión y fecha de la última modificación.
+    """
+    return db.session.get(CollectionVersion, name)
+
+
+async def get_collection_version_async(session: AsyncSession, name: str):
+    """
+    Versión asíncrona de get_collection_version.
+
+    Args:
+        session (AsyncSession): Sesión asíncrona de la petición.
+        name (str): Nombre de la colección (tabla).
+
+    Returns:
+        CollectionVersion | None: Versión y fecha de la última modificación.
+    """
+    return await session.get(CollectionVersion, name)
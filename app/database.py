@@ -0,0 +1,286 @@
+import os
+import threading
+import time
+from collections import deque
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.metrics import install_query_hooks
+from app.diagnostics import diagnostics
+from app.replicas import ReplicaSet
+
+DB_MODE_SYNC = "sync"
+DB_MODE_ASYNC = "async"
+
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker | None = None
+_replica_set: ReplicaSet | None = None
+
+
+class PoolStats:
+    """
+    Acumula las estadísticas de checkout de un pool de conexiones: número de checkouts,
+    timeouts y tiempos de espera (total, máximo y percentiles de las esperas recientes).
+    El tiempo de espera incluye la apertura de una conexión nueva cuando el pool crece.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent_waits.append(wait)
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.timeouts += 1
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        """
+        Devuelve las estadísticas acumuladas, con los tiempos en milisegundos.
+
+        Returns:
+            dict: Contadores y tiempos de espera del pool.
+        """
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            checkouts, timeouts = self.checkouts, self.timeouts
+            total_wait, max_wait = self.total_wait, self.max_wait
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))] * 1000
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_avg": total_wait / checkouts * 1000 if checkouts else 0.0,
+            "wait_ms_max": max_wait * 1000,
+            "wait_ms_p50": percentile(0.50),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_p99": percentile(0.99),
+        }
+
+
+def _instrumented_pool_class(base: type[QueuePool], stats: PoolStats):
+    """
+    Crea una subclase del pool que mide el tiempo de espera de cada checkout. Las
+    estadísticas quedan en la clase para sobrevivir a Pool.recreate() (engine.dispose()).
+    """
+
+    class InstrumentedPool(base):
+        pool_stats = stats
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                self.pool_stats.record_timeout(time.perf_counter() - start)
+                raise
+            self.pool_stats.record_checkout(time.perf_counter() - start)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+sync_pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+def get_pool_options() -> dict:
+    """
+    Lee la configuración del pool de conexiones desde las variables de entorno:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (segundos), DB_POOL_RECYCLE
+    (segundos, -1 para desactivar) y DB_POOL_PRE_PING (true/false).
+
+    Returns:
+        dict: Argumentos del pool para create_engine/create_async_engine.
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "-1")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "false").lower()
+        in ("1", "true", "yes"),
+    }
+
+
+def get_engine() -> Engine:
+    """
+    Obtiene el engine síncrono de la aplicación, creándolo en el primer uso con el pool
+    configurado por entorno.
+
+    Returns:
+        Engine: Engine de SQLAlchemy para DATABASE_URL.
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            os.getenv("DATABASE_URL"),
+            poolclass=_instrumented_pool_class(QueuePool, sync_pool_stats),
+            **get_pool_options(),
+        )
+        install_query_hooks(_engine)
+        diagnostics.install(_engine)
+    return _engine
+
+
+def get_replica_set() -> ReplicaSet:
+    """
+    Obtiene las réplicas de lectura de DATABASE_REPLICA_URLS (URLs separadas por comas),
+    creando en el primer uso un engine por réplica con la misma configuración de pool
+    que el primario e iniciando el monitoreo de su retraso. Las réplicas solo se usan
+    en el modo síncrono (DB_MODE=sync).
+
+    Returns:
+        ReplicaSet: Las réplicas configuradas (vacío si no hay ninguna).
+    """
+    global _replica_set
+    if _replica_set is None:
+        _replica_set = ReplicaSet.from_env()
+        urls = os.getenv("DATABASE_REPLICA_URLS", "")
+        if get_db_mode() == DB_MODE_SYNC:
+            for url in filter(None, (url.strip() for url in urls.split(","))):
+                stats = PoolStats()
+                engine = create_engine(
+                    url,
+                    poolclass=_instrumented_pool_class(QueuePool, stats),
+                    **get_pool_options(),
+                )
+                install_query_hooks(engine)
+                diagnostics.install(engine)
+                _replica_set.add(engine, stats)
+        _replica_set.start()
+    return _replica_set
+
+
+def describe_pool(engine: Engine, stats: PoolStats) -> dict:
+    """
+    Describe el estado actual de un pool junto con sus estadísticas acumuladas.
+
+    Args:
+        engine (Engine): Engine cuyo pool se describe.
+        stats (PoolStats): Estadísticas de checkout del pool.
+
+    Returns:
+        dict: Tamaño, conexiones en uso, overflow y tiempos de espera del pool.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        **stats.snapshot(),
+    }
+
+
+def get_pool_status() -> dict:
+    """
+    Obtiene el estado de los pools de conexiones creados por la aplicación.
+
+    Returns:
+        dict: Estado del pool síncrono y, si existen, del asíncrono y de las réplicas.
+    """
+    pools = {"sync": describe_pool(get_engine(), sync_pool_stats)}
+    if _async_engine is not None:
+        pools["async"] = describe_pool(_async_engine.sync_engine, async_pool_stats)
+    if _replica_set is not None and _replica_set.replicas:
+        pools["replicas"] = [
+            {
+                "name": replica.name,
+                # Infinito si no replica del primario; JSON no lo admite.
+                "lag_seconds": (replica.lag if replica.lag != float("inf") else None),
+                "available": replica in _replica_set.available(),
+                **describe_pool(replica.engine, replica.stats or PoolStats()),
+            }
+            for replica in _replica_set.replicas
+        ]
+    return pools
+
+
+def get_db_mode() -> str:
+    """
+    Obtiene el modo de acceso a la base de datos configurado en la variable de entorno
+    DB_MODE ("sync" o "async").
+
+    Returns:
+        str: El modo configurado, "sync" por defecto.
+
+    Raises:
+        ValueError: Si DB_MODE tiene un valor distinto de "sync" o "async".
+    """
+    mode = os.getenv("DB_MODE", DB_MODE_SYNC).lower()
+    if mode not in (DB_MODE_SYNC, DB_MODE_ASYNC):
+        raise ValueError(f"Invalid DB_MODE: {mode}")
+    return mode
+
+
+def get_async_database_url() -> str:
+    """
+    Construye la URL de conexión asíncrona a partir de DATABASE_URL, reemplazando el
+    driver por asyncpg (por ejemplo, postgresql+psycopg2 -> postgresql+asyncpg).
+
+    Returns:
+        str: URL de conexión para el engine asíncrono.
+    """
+    url = make_url(os.getenv("DATABASE_URL"))
+    return url.set(drivername="postgresql+asyncpg").render_as_string(
+        hide_password=False
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Obtiene el engine asíncrono de la aplicación, creándolo en el primer uso.
+
+    Returns:
+        AsyncEngine: Engine de SQLAlchemy que usa asyncpg.
+    """
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            poolclass=_instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_stats),
+            **get_pool_options(),
+        )
+        install_query_hooks(_async_engine.sync_engine)
+        diagnostics.install(_async_engine.sync_engine)
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_session():
+    """
+    Dependencia de FastAPI que entrega una AsyncSession por petición y la cierra al
+    finalizar.
+
+    Yields:
+        AsyncSession: Sesión asíncrona ligada al engine de la aplicación.
+    """
+    get_async_engine()
+    async with _async_sessionmaker() as session:
+        yield session
@@ -0,0 +1,231 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.diagnostics")
+
+
+class RequestQueries:
+    """Formas de sentencia (SQL con parámetros sin sustituir) ejecutadas en una petición."""
+
+    __slots__ = ("_route", "scope", "statements")
+
+    def __init__(self, route: str = None, scope: dict = None):
+        self._route = route
+        self.scope = scope
+        self.statements: Counter[str] = Counter()
+
+    @property
+    def route(self) -> str | None:
+        """Método y plantilla de la ruta de FastAPI, por ejemplo "GET /books/{book_id}"."""
+        if self.scope is None:
+            return self._route
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {getattr(route, 'path', self.scope['path'])}"
+
+
+current_request_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "current_request_queries", default=None
+)
+
+
+class QueryDiagnostics:
+    """
+    Diagnóstico opcional de consultas, pensado para detectar regresiones antes de que
+    lleguen a los usuarios:
+
+    - Registra las sentencias que superan `slow_query_ms`, con sus parámetros y, para
+      una fracción `explain_sample_rate` de los SELECT, su plan EXPLAIN (ANALYZE,
+      BUFFERS) obtenido en la misma conexión.
+    - Marca las peticiones que ejecutan la misma forma de sentencia más de
+      `n_plus_one_threshold` veces (patrón N+1), con la ruta que las causó.
+
+    Los hallazgos se escriben en el logger "app.diagnostics" y se conservan los más
+    recientes para GET /admin/diagnostics.
+
+    Args:
+        enabled (bool): Si se registran los eventos en los engines.
+        slow_query_ms (float): Duración a partir de la cual una sentencia es lenta.
+        explain_sample_rate (float): Fracción (0 a 1) de SELECT lentos a los que se
+            les captura el plan.
+        n_plus_one_threshold (int): Repeticiones de una sentencia por petición a
+            partir de las cuales se reporta un N+1.
+        history (int): Número de hallazgos recientes que se conservan.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        slow_query_ms: float = 200,
+        explain_sample_rate: float = 0.1,
+        n_plus_one_threshold: int = 10,
+        history: int = 100,
+    ):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self.slow_queries = deque(maxlen=history)
+        self.n_plus_one = deque(maxlen=history)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Crea la configuración a partir de DIAGNOSTICS_ENABLED, SLOW_QUERY_MS,
+        EXPLAIN_SAMPLE_RATE y N_PLUS_ONE_THRESHOLD.
+        """
+        return cls(
+            enabled=os.getenv("DIAGNOSTICS_ENABLED", "false").lower()
+            in ("1", "true", "yes"),
+            slow_query_ms=float(os.getenv("SLOW_QUERY_MS", "200")),
+            explain_sample_rate=float(os.getenv("EXPLAIN_SAMPLE_RATE", "0.1")),
+            n_plus_one_threshold=int(os.getenv("N_PLUS_ONE_THRESHOLD", "10")),
+        )
+
+    def install(self, engine: Engine):
+        """
+        Registra los eventos de diagnóstico en un engine, si el modo está activo.
+
+        Args:
+            engine (Engine): Engine síncrono (o AsyncEngine.sync_engine).
+        """
+        if not self.enabled:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if context is not None:
+            context._diagnostics_start_time = time.perf_counter()
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        request = current_request_queries.get()
+        if request is not None:
+            request.statements[statement] += 1
+        if context is None:
+            return
+        duration_ms = (time.perf_counter() - context._diagnostics_start_time) * 1000
+        if duration_ms < self.slow_query_ms:
+            return
+
+        plan = None
+        if (
+            not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and not context.execution_options.get("stream_results")
+            and random.random() < self.explain_sample_rate
+        ):
+            plan = self._explain(conn, statement, parameters)
+        finding = {
+            "route": request.route if request is not None else None,
+            "duration_ms": round(duration_ms, 3),
+            "statement": statement,
+            "parameters": repr(parameters)[:1000],
+            "plan": plan,
+        }
+        with self._lock:
+            self.slow_queries.append(finding)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s\nParameters: %s%s",
+            duration_ms,
+            finding["route"],
+            statement,
+            finding["parameters"],
+            f"\nPlan:\n{plan}" if plan else "",
+        )
+
+    def _explain(self, conn, statement: str, parameters) -> str | None:
+        # Se ejecuta con un cursor DBAPI de la misma conexión (misma transacción y
+        # configuración de sesión), sin pasar por los eventos de SQLAlchemy.
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            logger.warning("Could not EXPLAIN slow query: %s", e)
+            return None
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def track_request(self, route: str = None, scope: dict = None):
+        """
+        Cuenta las sentencias ejecutadas dentro del bloque y, al terminar, reporta las
+        que se repitieron más de n_plus_one_threshold veces.
+
+        Args:
+            route (str, optional): Ruta con la que se etiquetan los hallazgos.
+            scope (dict, optional): Scope ASGI de la petición; la ruta se toma de la
+                ruta de FastAPI que la atiende.
+
+        Yields:
+            RequestQueries: Sentencias contadas.
+        """
+        request = RequestQueries(route, scope)
+        token = current_request_queries.set(request)
+        try:
+            yield request
+        finally:
+            current_request_queries.reset(token)
+            self._report_n_plus_one(request)
+
+    def _report_n_plus_one(self, request: RequestQueries):
+        for statement, count in request.statements.items():
+            if count <= self.n_plus_one_threshold:
+                continue
+            finding = {"route": request.route, "statement": statement, "count": count}
+            with self._lock:
+                self.n_plus_one.append(finding)
+            logger.warning(
+                "Possible N+1 on %s: statement executed %d times: %s",
+                request.route,
+                count,
+                statement,
+            )
+
+    def findings(self) -> dict:
+        """
+        Devuelve los hallazgos recientes.
+
+        Returns:
+            dict: Consultas lentas y patrones N+1 recientes.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "slow_queries": list(self.slow_queries),
+                "n_plus_one": list(self.n_plus_one),
+            }
+
+
+diagnostics = QueryDiagnostics.from_env()
+
+
+class DiagnosticsMiddleware:
+    """
+    Middleware ASGI que agrupa por petición las sentencias ejecutadas y etiqueta los
+    hallazgos con la plantilla de la ruta de FastAPI (por ejemplo, /books/{book_id}).
+    """
+
+    def __init__(self, app, query_diagnostics: QueryDiagnostics = diagnostics):
+        self.app = app
+        self.diagnostics = query_diagnostics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.diagnostics.enabled:
+            await self.app(scope, receive, send)
+            return
+        with self.diagnostics.track_request(scope=scope):
+            await self.app(scope, receive, send)
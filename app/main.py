@@ -1,21 +1,79 @@
-import os
-from fastapi import FastAPI, HTTPException, status
+from contextlib import asynccontextmanager
+from typing import Literal
+from fastapi import APIRouter, Depends, FastAPI, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi_sqlalchemy import DBSessionMiddleware, db
-from dotenv import load_dotenv
-from app.models import *
-from app.schemas import *
-from app.crud.authors import *
-from app.crud.books import *
-from sqlalchemy.exc import IntegrityError
+from app.schemas import (
+    SchemaAuthor,
+    SchemaAuthorDetailResponse,
+    SchemaAuthorResponse,
+    SchemaAuthorSuggestion,
+    SchemaAuthorUpdate,
+    SchemaBook,
+    SchemaBookFilters,
+    SchemaBookResponse,
+    SchemaBooksByAuthor,
+    SchemaBooksByYear,
+    SchemaBookUpdate,
+    SchemaBulkAuthorResult,
+    SchemaBulkBookResult,
+    SchemaBulkDelete,
+    SchemaBulkDeleteResult,
+    SchemaCacheStats,
+    SchemaPoolStatusResponse,
+)
+from app.crud.authors import (
+    create_author,
+    create_authors,
+    delete_author,
+    delete_authors,
+    get_author,
+    get_authors,
+    parse_author_include,
+    patch_author,
+    update_author,
+)
+from app.crud.books import (
+    create_book,
+    create_books,
+    delete_book,
+    delete_books,
+    export_books,
+    get_book,
+    get_books,
+    patch_book,
+    search_books,
+    update_book,
+)
+from app.crud.stats import get_books_by_author, get_books_by_year, get_newest_books
+from app.pagination import DEFAULT_PAGE_LIMIT, add_pagination_headers
+from app.database import (
+    DB_MODE_ASYNC,
+    get_db_mode,
+    get_engine,
+    get_pool_status,
+    get_replica_set,
+)
+from app.async_endpoints import use_async_endpoints
+from app.snapshot import READ_MODE_SNAPSHOT, get_read_mode
+from app.snapshot_endpoints import use_snapshot_endpoints
+from app.cache import entity_cache
+from app.conditional import collection_response, conditional_response, make_etag
+from app.crud.versions import get_collection_version
+from app.serialization import list_response
+from app.metrics import MetricsMiddleware, render_metrics
+from app.diagnostics import DiagnosticsMiddleware, diagnostics
+from app.replicas import ReplicaRoutingMiddleware, RoutingSession
+from app.suggest import author_index
+from app.warmup import warm_up, warmup_enabled
 
-load_dotenv(".env")
-app = FastAPI(title="Biblioteca API", version="0.1.0")
-app.add_middleware(DBSessionMiddleware, db_url=os.getenv("DATABASE_URL"))
+router = APIRouter()
 
 # Endpoints Autores
 
 
-@app.post(
+@router.post(
     "/authors/",
     response_model=SchemaAuthorResponse,
     status_code=status.HTTP_201_CREATED,
@@ -26,29 +84,109 @@ def create_author_endpoint(author: SchemaAuthor):
     return create_author(author)
 
 
-@app.get(
+@router.post(
+    "/authors/bulk",
+    response_model=list[SchemaBulkAuthorResult],
+    status_code=status.HTTP_200_OK,
+    summary="Importar autores en lote",
+    description="Crea los autores que no existen y devuelve el ID de todos los autores "
+    "recibidos (nuevos y existentes) en una sola sentencia, indicando cuáles fueron "
+    "creados.",
+)
+def create_authors_endpoint(authors: list[SchemaAuthor]):
+    return create_authors(authors)
+
+
+@router.delete(
+    "/authors/bulk",
+    response_model=SchemaBulkDeleteResult,
+    status_code=status.HTTP_200_OK,
+    summary="Eliminar autores en lote",
+    description="Elimina los autores indicados en `ids` con una sola sentencia DELETE. "
+    "Sus libros se eliminan en cascada en la base de datos. Devuelve los IDs de los "
+    "autores eliminados; los que no existen se omiten.",
+)
+def delete_authors_endpoint(body: SchemaBulkDelete):
+    return {"deleted": delete_authors(body.ids)}
+
+
+@router.get(
     "/authors/",
-    response_model=list[SchemaAuthorResponse],
+    response_model=list[SchemaAuthorDetailResponse],
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
     summary="Obtener todos los autores",
-    description="Obtiene una lista de todos los autores registrados en la base de datos.",
+    description="Obtiene una página de los autores registrados en la base de datos. "
+    "Con `include=books` se incluyen los libros de cada autor y con "
+    "`include=book_count` su número de libros (se pueden combinar separados por "
+    "comas). Si existen más resultados, la respuesta incluye los encabezados `Link` "
+    '(rel="next") y `X-Next-Cursor` con el cursor para el parámetro `after`.',
+)
+def get_authors_endpoint(
+    request: Request,
+    response: Response,
+    after: str = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    include: str = None,
+):
+    include = parse_author_include(include)
+    versions = [get_collection_version("authors")]
+    if include:
+        versions.append(get_collection_version("books"))
+    not_modified = collection_response(request, response, *versions)
+    if not_modified:
+        return not_modified
+    authors, next_cursor = get_authors(after, limit, include)
+    add_pagination_headers(request, response, next_cursor)
+    return list_response(
+        authors, SchemaAuthorDetailResponse, response, exclude_unset=True
+    )
+
+
+# Registrada antes de /authors/{author_id}, que de lo contrario tomaría "suggest" como
+# un ID.
+@router.get(
+    "/authors/suggest",
+    response_model=list[SchemaAuthorSuggestion],
+    status_code=status.HTTP_200_OK,
+    summary="Sugerir autores",
+    description="Autocompletado de autores: devuelve hasta `limit` autores cuyo nombre, "
+    "o alguna de sus palabras, empieza por `prefix`, sin distinguir mayúsculas ni "
+    "acentos. Se resuelve con un índice en memoria, sin consultar la base de datos.",
 )
-def get_authors_endpoint():
-    return get_authors()
+def suggest_authors_endpoint(prefix: str, limit: int = 10):
+    author_index.ensure_loaded(get_engine())
+    return author_index.suggest(prefix, limit)
 
 
-@app.get(
+@router.get(
     "/authors/{author_id}",
-    response_model=SchemaAuthorResponse,
+    response_model=SchemaAuthorDetailResponse,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
     summary="Obtener un autor específico",
-    description="Obtiene un autor específico por su ID.",
+    description="Obtiene un autor específico por su ID. Con `include=books` se "
+    "incluyen sus libros y con `include=book_count` su número de libros.",
 )
-def get_author_endpoint(author_id: int):
-    return get_author(author_id)
+def get_author_endpoint(
+    author_id: int, request: Request, response: Response, include: str = None
+):
+    include = parse_author_include(include)
+    author = get_author(author_id, include)
+    etag_parts = ["author", author.id, author.updated_at]
+    last_modified = author.updated_at
+    if include:
+        books_version = get_collection_version("books")
+        etag_parts += [*sorted(include), books_version.version]
+        last_modified = max(last_modified, books_version.updated_at)
+    etag = make_etag(*etag_parts)
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    return author
 
 
-@app.put(
+@router.put(
     "/authors/{author_id}",
     response_model=SchemaAuthorResponse,
     status_code=status.HTTP_200_OK,
@@ -59,7 +197,18 @@ def update_author_endpoint(author_id: int, author: SchemaAuthor):
     return update_author(author_id, author)
 
 
-@app.delete(
+@router.patch(
+    "/authors/{author_id}",
+    response_model=SchemaAuthorResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar parcialmente un autor",
+    description="Actualiza solo los campos enviados de un autor específico con su ID.",
+)
+def patch_author_endpoint(author_id: int, author: SchemaAuthorUpdate):
+    return patch_author(author_id, author)
+
+
+@router.delete(
     "/authors/{author_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Eliminar un autor",
@@ -72,7 +221,7 @@ def delete_author_endpoint(author_id: int):
 # Endpoints Libros
 
 
-@app.post(
+@router.post(
     "/books/",
     response_model=SchemaBookResponse,
     status_code=status.HTTP_201_CREATED,
@@ -83,29 +232,94 @@ def create_book_endpoint(book: SchemaBook):
     return create_book(book)
 
 
-@app.get(
+@router.post(
+    "/books/bulk",
+    response_model=list[SchemaBulkBookResult],
+    status_code=status.HTTP_200_OK,
+    summary="Crear libros en lote",
+    description="Crea varios libros en una sola petición. Devuelve un resultado por "
+    "libro, en el mismo orden de entrada, con el estado `created`, `duplicate_isbn` o "
+    "`unknown_author`. Los libros inválidos no impiden la creación del resto del lote.",
+)
+def create_books_endpoint(books: list[SchemaBook]):
+    return create_books(books)
+
+
+@router.delete(
+    "/books/bulk",
+    response_model=SchemaBulkDeleteResult,
+    status_code=status.HTTP_200_OK,
+    summary="Eliminar libros en lote",
+    description="Elimina los libros indicados en `ids` con una sola sentencia DELETE. "
+    "Devuelve los IDs de los libros eliminados; los que no existen se omiten.",
+)
+def delete_books_endpoint(body: SchemaBulkDelete):
+    return {"deleted": delete_books(body.ids)}
+
+
+@router.get(
     "/books/",
     response_model=list[SchemaBookResponse],
     status_code=status.HTTP_200_OK,
     summary="Obtener todos los libros",
-    description="Obtiene una lista de todos los libros registrados en la base de datos.",
+    description="Obtiene una página de los libros registrados en la base de datos, "
+    "opcionalmente filtrada por autores (`author_id`), años (`year_from`, `year_to`) o "
+    "fechas de publicación (`published_from`, `published_before`) y ordenada según "
+    "`sort`. Si existen más resultados, la respuesta incluye los encabezados `Link` "
+    '(rel="next") y `X-Next-Cursor` con el cursor para el parámetro `after`.',
 )
-def get_books_endpoint():
-    return get_books()
+def get_books_endpoint(
+    request: Request,
+    response: Response,
+    after: str = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    filters: SchemaBookFilters = Depends(SchemaBookFilters.as_query),
+):
+    not_modified = collection_response(
+        request, response, get_collection_version("books")
+    )
+    if not_modified:
+        return not_modified
+    books, next_cursor = get_books(after, limit, filters)
+    add_pagination_headers(request, response, next_cursor)
+    return list_response(books, SchemaBookResponse, response)
 
 
-@app.get(
+@router.get(
+    "/books/export",
+    status_code=status.HTTP_200_OK,
+    summary="Exportar el catálogo de libros",
+    description="Exporta todos los libros, junto con el nombre completo de su autor, "
+    "en formato NDJSON o CSV. Las filas se transmiten por lotes desde un cursor del "
+    "servidor, por lo que el uso de memoria no depende del tamaño de la tabla.",
+    response_class=StreamingResponse,
+)
+def export_books_endpoint(format: Literal["ndjson", "csv"] = "ndjson"):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_books(db.session.get_bind(), format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'},
+    )
+
+
+@router.get(
     "/books/{book_id}",
     response_model=SchemaBookResponse,
     status_code=status.HTTP_200_OK,
     summary="Obtener un libro específico",
     description="Obtiene un libro específico por su ID.",
 )
-def get_book_endpoint(book_id: int):
-    return get_book(book_id)
+def get_book_endpoint(book_id: int, request: Request, response: Response):
+    book = get_book(book_id)
+    etag = make_etag("book", book.id, book.updated_at)
+    not_modified = conditional_response(request, response, etag, book.updated_at)
+    if not_modified:
+        return not_modified
+    return book
 
 
-@app.put(
+@router.put(
     "/books/{book_id}",
     response_model=SchemaBookResponse,
     status_code=status.HTTP_200_OK,
@@ -116,7 +330,18 @@ def update_book_endpoint(book_id: int, book: SchemaBook):
     return update_book(book_id, book)
 
 
-@app.delete(
+@router.patch(
+    "/books/{book_id}",
+    response_model=SchemaBookResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Actualizar parcialmente un libro",
+    description="Actualiza solo los campos enviados de un libro específico por su ID.",
+)
+def patch_book_endpoint(book_id: int, book: SchemaBookUpdate):
+    return patch_book(book_id, book)
+
+
+@router.delete(
     "/books/{book_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Eliminar un libro",
@@ -126,12 +351,185 @@ def delete_book_endpoint(book_id: int):
     delete_book(book_id)
 
 
-@app.get(
+@router.get(
     "/books/search/",
     response_model=list[SchemaBookResponse],
     status_code=status.HTTP_200_OK,
     summary="Buscar libros",
-    description="Busca libros por nombre de autor y/o año de publicación.",
+    description="Busca libros por nombre de autor y/o año de publicación. Con el "
+    "parámetro `q` se hace una búsqueda aproximada por título y nombre de autor, "
+    "ordenada por relevancia y limitada a `limit` resultados.",
 )
-def search_books_endpoint(author_name: str = None, year: int = None):
-    return search_books(author_name, year)
+def search_books_endpoint(
+    response: Response,
+    author_name: str = None,
+    # Mismos límites que year_from/year_to: date(year + 1, 1, 1) debe ser válida.
+    year: int = Query(None, ge=1, le=9998),
+    q: str = None,
+    limit: int = None,
+):
+    books = search_books(author_name, year, q, limit)
+    return list_response(books, SchemaBookResponse, response)
+
+
+# Endpoints Estadísticas
+
+
+@router.get(
+    "/stats/books-by-year",
+    response_model=list[SchemaBooksByYear],
+    status_code=status.HTTP_200_OK,
+    summary="Libros por año de publicación",
+    description="Número de libros por año de publicación, opcionalmente entre "
+    "`year_from` y `year_to`. Se lee de una tabla de agregados que la base de datos "
+    "mantiene al crear, modificar o eliminar libros, sin recorrer el catálogo.",
+)
+def get_books_by_year_endpoint(
+    request: Request, response: Response, year_from: int = None, year_to: int = None
+):
+    not_modified = collection_response(
+        request, response, get_collection_version("books")
+    )
+    if not_modified:
+        return not_modified
+    return list_response(
+        get_books_by_year(year_from, year_to), SchemaBooksByYear, response
+    )
+
+
+@router.get(
+    "/stats/books-by-author",
+    response_model=list[SchemaBooksByAuthor],
+    status_code=status.HTTP_200_OK,
+    summary="Autores con más libros",
+    description="Los `limit` autores con más libros (10 por defecto), de mayor a "
+    "menor, leídos de una tabla de agregados mantenida por la base de datos.",
+)
+def get_books_by_author_endpoint(
+    request: Request, response: Response, limit: int = None
+):
+    not_modified = collection_response(
+        request,
+        response,
+        get_collection_version("authors"),
+        get_collection_version("books"),
+    )
+    if not_modified:
+        return not_modified
+    return list_response(get_books_by_author(limit), SchemaBooksByAuthor, response)
+
+
+@router.get(
+    "/stats/newest-books",
+    response_model=list[SchemaBookResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Últimos libros agregados",
+    description="Los `limit` libros agregados más recientemente al catálogo (10 por "
+    "defecto), del más nuevo al más antiguo.",
+)
+def get_newest_books_endpoint(request: Request, response: Response, limit: int = None):
+    not_modified = collection_response(
+        request, response, get_collection_version("books")
+    )
+    if not_modified:
+        return not_modified
+    return list_response(get_newest_books(limit), SchemaBookResponse, response)
+
+
+# Endpoints Administración
+
+
+@router.get(
+    "/admin/pool",
+    response_model=SchemaPoolStatusResponse,
+    response_model_by_alias=True,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+    summary="Estado del pool de conexiones",
+    description="Muestra el estado actual del pool de conexiones (conexiones en uso, "
+    "overflow) y los tiempos de espera de checkout, para dimensionar el pool por worker.",
+)
+def get_pool_status_endpoint():
+    return get_pool_status()
+
+
+@router.get(
+    "/admin/cache",
+    response_model=SchemaCacheStats,
+    status_code=status.HTTP_200_OK,
+    summary="Estadísticas de la caché de entidades",
+    description="Muestra los aciertos, fallos, desalojos e invalidaciones de la caché "
+    "en memoria usada por la consulta de libros y autores por ID.",
+)
+def get_cache_stats_endpoint():
+    return entity_cache.stats()
+
+
+@router.get(
+    "/admin/diagnostics",
+    status_code=status.HTTP_200_OK,
+    summary="Consultas lentas y patrones N+1",
+    description="Muestra las consultas lentas recientes (con su plan EXPLAIN cuando se "
+    "capturó) y las peticiones que repitieron una misma sentencia más veces que el "
+    "umbral (N+1), con la ruta que las causó. Requiere DIAGNOSTICS_ENABLED=true.",
+)
+def get_diagnostics_endpoint():
+    return diagnostics.findings()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Métricas en formato Prometheus",
+    description="Histogramas de latencia por método, plantilla de ruta y código de "
+    "estado, y número de consultas y tiempo de base de datos por ruta, en el formato "
+    "de texto de Prometheus. Las métricas son del worker que responde.",
+)
+def get_metrics_endpoint():
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida del worker: antes de aceptar tráfico construye el índice de
+    sugerencias de autores y ejecuta app.warmup.warm_up (desactivable con
+    APP_WARMUP=false).
+    """
+    await run_in_threadpool(author_index.load, get_engine())
+    author_index.start(get_engine())
+    if warmup_enabled():
+        app.state.warmup = await warm_up(app)
+    yield
+
+
+def create_app() -> FastAPI:
+    """
+    Crea la aplicación con sus middlewares y endpoints, según el modo de acceso a la
+    base de datos (DB_MODE) y el origen de las lecturas (READ_MODE).
+
+    Returns:
+        FastAPI: La aplicación configurada.
+    """
+    app = FastAPI(title="Biblioteca API", version="0.1.0", lifespan=lifespan)
+    app.add_middleware(
+        DBSessionMiddleware,
+        custom_engine=get_engine(),
+        session_args={"class_": RoutingSession, "replicas": get_replica_set()},
+    )
+    app.add_middleware(ReplicaRoutingMiddleware, replicas=get_replica_set())
+    app.add_middleware(DiagnosticsMiddleware)
+    # Último en agregarse, por lo que es el más externo: mide también la sesión de BD.
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+    if get_db_mode() == DB_MODE_ASYNC:
+        use_async_endpoints(app)
+    if get_read_mode() == READ_MODE_SNAPSHOT:
+        use_snapshot_endpoints(app)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Límites superiores (segundos) de los buckets de los histogramas.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class RequestStats:
+    """Consultas y tiempo de base de datos acumulados durante una petición."""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+# Los endpoints síncronos corren en el threadpool y las consultas asíncronas en greenlets;
+# ambos heredan el contexto de la petición, por lo que comparten este objeto.
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+class Histogram:
+    """
+    Histograma acumulativo con buckets fijos, por combinación de etiquetas. Registrar
+    una observación es O(log buckets) bajo un lock.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [conteo por bucket..., +Inf], suma
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> list[tuple[tuple, list[int], float]]:
+        with self._lock:
+            return [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    """Contador por combinación de etiquetas."""
+
+    def __init__(self):
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, value: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + value
+
+    def collect(self) -> list[tuple[tuple, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+request_latency = Histogram()
+request_db_queries = Counter()
+request_db_seconds = Counter()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    if stats is not None and context is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - context._query_start_time
+
+
+def install_query_hooks(engine: Engine):
+    """
+    Registra en el engine los eventos before/after_cursor_execute que cuentan las
+    consultas y el tiempo de base de datos de la petición en curso.
+
+    Args:
+        engine (Engine): Engine síncrono (o AsyncEngine.sync_engine).
+    """
+    if not METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide la latencia de cada petición por método, plantilla de ruta
+    (por ejemplo, /books/{book_id}) y código de estado, junto con las consultas y el
+    tiempo de base de datos. Agrega el encabezado Server-Timing a la respuesta.
+
+    Es un middleware ASGI puro (no BaseHTTPMiddleware), por lo que no agrega una tarea
+    ni copia el cuerpo de la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = (time.perf_counter() - start) * 1000
+                timing = (
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+                    f"app;dur={elapsed:.2f}"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_stats.reset(token)
+            labels = (scope["method"], _route_template(scope), str(status_code))
+            request_latency.observe(labels, time.perf_counter() - start)
+            request_db_queries.inc(labels[:2], stats.queries)
+            request_db_seconds.inc(labels[:2], stats.db_time)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, **extra) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs)
+
+
+def render_metrics() -> str:
+    """
+    Genera las métricas acumuladas en el formato de texto de Prometheus (0.0.4).
+
+    Returns:
+        str: Cuerpo de la respuesta de /metrics.
+    """
+    lines = [
+        "# HELP http_request_duration_seconds Latencia de las peticiones HTTP.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    names = ("method", "route", "status")
+    for labels, counts, total in sorted(request_latency.collect()):
+        cumulative = 0
+        for bound, count in zip((*request_latency.buckets, "+Inf"), counts):
+            cumulative += count
+            label_text = _format_labels(names, labels, le=bound)
+            lines.append(
+                f"http_request_duration_seconds_bucket{{{label_text}}} {cumulative}"
+            )
+        label_text = _format_labels(names, labels)
+        lines.append(f"http_request_duration_seconds_sum{{{label_text}}} {total}")
+        lines.append(
+            f"http_request_duration_seconds_count{{{label_text}}} {cumulative}"
+        )
+
+    for metric, counter, help_text in (
+        (
+            "http_request_db_queries_total",
+            request_db_queries,
+            "Consultas SQL ejecutadas por las peticiones.",
+        ),
+        (
+            "http_request_db_seconds_total",
+            request_db_seconds,
+            "Tiempo en la base de datos de las peticiones.",
+        ),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for labels, value in sorted(counter.collect()):
+            lines.append(f"{metric}{{{_format_labels(names[:2], labels)}}} {value}")
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, DateTime, Date, ForeignKey, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,8 +21,28 @@ class Author(Base):
     id = Column(Integer, primary_key=True, index=True)
     date_created = Column(DateTime(timezone=True), server_default=func.now())
     full_name = Column(String, nullable=False, unique=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
 
-    books = relationship("Book", back_populates="author", cascade="all, delete-orphan")
+    # El borrado en cascada lo hace la base de datos (ON DELETE CASCADE), sin cargar
+    # los libros en la sesión.
+    books = relationship(
+        "Book",
+        back_populates="author",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index(
+            "ix_authors_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
 
 
 class Book(Base):
@@ -21,8 +50,78 @@ class Book(Base):
     id = Column(Integer, primary_key=True, index=True)
     date_created = Column(DateTime(timezone=True), server_default=func.now())
     title = Column(String, nullable=False)
-    author_id = Column(Integer, ForeignKey("authors.id"))
+    author_id = Column(
+        Integer, ForeignKey("authors.id", ondelete="CASCADE"), index=True
+    )
     ISBN = Column(String, nullable=False, unique=True)
     date_published = Column(Date, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
 
     author = relationship("Author", back_populates="books")
+
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index("ix_books_date_published_id", "date_published", "id"),
+        Index("ix_books_title_id", "title", "id"),
+    )
+
+
+class CollectionVersion(Base):
+    # En PostgreSQL es una vista que suma las filas de CollectionVersionSlot (ver
+    # migración e8b4f0a6c2d1); en el snapshot SQLite es una tabla con esa suma.
+
+    __tablename__ = "collection_versions"
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CollectionVersionSlot(Base):
+    # La incrementan triggers por sentencia en authors y books, en la fila de la
+    # conexión que escribe (ver migración e8b4f0a6c2d1).
+
+    __tablename__ = "collection_version_slots"
+    name = Column(String, primary_key=True)
+    slot = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class BookCountByYear(Base):
+    # Vistas que suman las filas de BookCountByYearSlot y BookCountByAuthorSlot (ver
+    # migración f2c7d81b4e06). Solo tienen filas los grupos con al menos un libro.
+
+    __tablename__ = "book_counts_by_year"
+    year = Column(Integer, primary_key=True)
+    book_count = Column(BigInteger, nullable=False)
+
+
+class BookCountByAuthor(Base):
+    __tablename__ = "book_counts_by_author"
+    author_id = Column(Integer, primary_key=True)
+    book_count = Column(BigInteger, nullable=False)
+
+
+class BookCountByYearSlot(Base):
+    # Agregados que mantienen triggers por sentencia en books, en la fila de la conexión
+    # que escribe (ver migraciones d5a7c3e19f42 y f2c7d81b4e06).
+
+    __tablename__ = "book_counts_by_year_slots"
+    year = Column(Integer, primary_key=True)
+    slot = Column(Integer, primary_key=True)
+    book_count = Column(BigInteger, nullable=False)
+
+
+class BookCountByAuthorSlot(Base):
+    __tablename__ = "book_counts_by_author_slots"
+    author_id = Column(Integer, primary_key=True)
+    slot = Column(Integer, primary_key=True)
+    book_count = Column(BigInteger, nullable=False)
@@ -0,0 +1,108 @@
+import base64
+import json
+import os
+
+from fastapi import HTTPException, Request, Response, status
+
+DEFAULT_PAGE_LIMIT = int(os.getenv("DEFAULT_PAGE_LIMIT", "100"))
+MAX_PAGE_LIMIT = int(os.getenv("MAX_PAGE_LIMIT", "1000"))
+
+
+def clamp_limit(limit: int | None) -> int:
+    """
+    Ajusta el tamaño de página solicitado al máximo permitido por el servidor.
+
+    Args:
+        limit (int, optional): Tamaño de página solicitado por el cliente.
+
+    Returns:
+        int: Tamaño de página entre 1 y MAX_PAGE_LIMIT.
+    """
+    if limit is None:
+        return DEFAULT_PAGE_LIMIT
+    return max(1, min(limit, MAX_PAGE_LIMIT))
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Codifica los valores de la clave de ordenamiento del último elemento de una página
+    en un cursor opaco.
+
+    Args:
+        values (list): Valores de la clave de ordenamiento (por ejemplo, [id]).
+
+    Returns:
+        str: Cursor en base64 url-safe, sin relleno.
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int = 1) -> list:
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Args:
+        cursor (str): Cursor opaco recibido en el parámetro `after`.
+        size (int): Número de valores que debe contener el cursor.
+
+    Returns:
+        list: Valores de la clave de ordenamiento.
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return values
+
+
+def decode_id_cursor(cursor: str | None) -> int | None:
+    """
+    Decodifica un cursor cuya única clave de ordenamiento es el ID.
+
+    Args:
+        cursor (str, optional): Cursor opaco recibido en el parámetro `after`.
+
+    Returns:
+        int | None: ID del último elemento de la página anterior, o None si no hay cursor.
+
+    Raises:
+        HTTPException:
+            - 400: Si el cursor no es válido.
+    """
+    if cursor is None:
+        return None
+    (last_id,) = decode_cursor(cursor)
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return last_id
+
+
+def add_pagination_headers(
+    request: Request, response: Response, next_cursor: str | None
+):
+    """
+    Agrega los encabezados `Link` (rel="next") y `X-Next-Cursor` a la respuesta
+    cuando existe una página siguiente.
+
+    Args:
+        request (Request): Petición actual, usada para construir la URL siguiente.
+        response (Response): Respuesta a la que se agregan los encabezados.
+        next_cursor (str, optional): Cursor de la página siguiente.
+    """
+    if next_cursor is None:
+        return
+    next_url = request.url.include_query_params(after=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = next_cursor
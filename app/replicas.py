@@ -0,0 +1,262 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("app.replicas")
+
+REPLICA_SELECTION_ROUND_ROBIN = "round_robin"
+REPLICA_SELECTION_LEAST_BUSY = "least_busy"
+# Cookie (o encabezado) que indica que el cliente escribió hace poco y debe leer del
+# primario para ver sus propios cambios.
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = b"x-read-primary"
+
+# Retraso de la réplica en segundos: 0 si ya aplicó todo lo que recibió del primario,
+# o el tiempo desde la última transacción aplicada. Es infinito (la réplica no se usa)
+# si el servidor no está en recuperación (un primario, o una réplica promovida) o si su
+# WAL receiver no está transmitiendo: sin conexión con el primario, la réplica aplica
+# todo lo que recibió y parecería al día mientras el primario sigue avanzando.
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 'Infinity'::float8
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN 'Infinity'::float8
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8, 0
+        )
+    END
+    """)
+
+# La petición en curso es una lectura que se puede servir desde una réplica. Lo
+# asigna ReplicaRoutingMiddleware y lo consulta RoutingSession.get_bind.
+read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+class Replica:
+    """Engine de una réplica de lectura y su último retraso medido."""
+
+    def __init__(self, engine: Engine, stats=None):
+        self.engine = engine
+        self.stats = stats
+        self.name = engine.url.render_as_string(hide_password=True)
+        self.lag: float | None = None
+        self.checked_at = 0.0
+
+
+class ReplicaSet:
+    """
+    Réplicas de lectura de la base de datos. Un hilo de monitoreo mide el retraso de
+    cada una cada `check_interval` segundos; `choose` solo considera las que respondieron
+    en la última medición con un retraso de hasta `max_lag` segundos y, si no queda
+    ninguna, devuelve None para que la lectura vaya al primario.
+
+    Args:
+        selection (str): "round_robin" o "least_busy" (la réplica con menos conexiones
+            en uso en su pool).
+        max_lag (float): Retraso máximo aceptable, en segundos.
+        check_interval (float): Segundos entre mediciones del retraso.
+    """
+
+    def __init__(
+        self,
+        selection: str = REPLICA_SELECTION_ROUND_ROBIN,
+        max_lag: float = 5.0,
+        check_interval: float = 1.0,
+    ):
+        if selection not in (
+            REPLICA_SELECTION_ROUND_ROBIN,
+            REPLICA_SELECTION_LEAST_BUSY,
+        ):
+            raise ValueError(f"Invalid REPLICA_SELECTION: {selection}")
+        self.selection = selection
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.replicas: list[Replica] = []
+        self._counter = itertools.count()
+        self._monitor: threading.Thread | None = None
+
+    @classmethod
+    def from_env(cls):
+        """
+        Crea el conjunto de réplicas (sin engines) a partir de REPLICA_SELECTION,
+        REPLICA_MAX_LAG_SECONDS y REPLICA_LAG_CHECK_INTERVAL.
+        """
+        return cls(
+            selection=os.getenv(
+                "REPLICA_SELECTION", REPLICA_SELECTION_ROUND_ROBIN
+            ).lower(),
+            max_lag=float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5")),
+            check_interval=float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "1")),
+        )
+
+    @property
+    def sticky_seconds(self) -> int:
+        """
+        Segundos que un cliente lee del primario después de escribir: el retraso
+        máximo aceptado más un intervalo de medición, redondeado hacia arriba.
+        """
+        return int(self.max_lag + self.check_interval) + 1
+
+    def add(self, engine: Engine, stats=None) -> Replica:
+        replica = Replica(engine, stats)
+        self.replicas.append(replica)
+        return replica
+
+    def check(self):
+        """
+        Mide el retraso de cada réplica; las que no responden quedan sin retraso y las
+        que no replican del primario, con retraso infinito (ver LAG_QUERY).
+        """
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    lag = float(connection.execute(LAG_QUERY).scalar())
+                if lag == float("inf") and replica.lag != lag:
+                    logger.warning(
+                        "Replica %s is not streaming from the primary", replica.name
+                    )
+                replica.lag = lag
+            except Exception as e:
+                if replica.lag is not None:
+                    logger.warning("Replica %s unavailable: %s", replica.name, e)
+                replica.lag = None
+            replica.checked_at = time.monotonic()
+
+    def start(self):
+        """Inicia el hilo de monitoreo del retraso (una vez por proceso)."""
+        if self._monitor is not None or not self.replicas:
+            return
+        self.check()
+
+        def monitor():
+            while True:
+                time.sleep(self.check_interval)
+                self.check()
+
+        self._monitor = threading.Thread(
+            target=monitor, name="replica-lag-monitor", daemon=True
+        )
+        self._monitor.start()
+
+    def available(self) -> list[Replica]:
+        """
+        Réplicas que se pueden usar: respondieron en la última medición, con un retraso
+        de hasta max_lag, y la medición es reciente (si el monitoreo se detiene, se
+        deja de confiar en ellas).
+        """
+        now = time.monotonic()
+        return [
+            replica
+            for replica in self.replicas
+            if replica.lag is not None
+            and replica.lag <= self.max_lag
+            and now - replica.checked_at <= 3 * self.check_interval
+        ]
+
+    def choose(self) -> Engine | None:
+        """
+        Elige la réplica para una lectura.
+
+        Returns:
+            Engine | None: El engine de la réplica elegida, o None si ninguna está
+                disponible.
+        """
+        replicas = self.available()
+        if not replicas:
+            return None
+        if self.selection == REPLICA_SELECTION_LEAST_BUSY:
+            return min(replicas, key=lambda r: r.engine.pool.checkedout()).engine
+        return replicas[next(self._counter) % len(replicas)].engine
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas de las peticiones GET/HEAD a una réplica (ver
+    ReplicaRoutingMiddleware) y todo lo demás al primario: escrituras (INSERT, UPDATE,
+    DELETE, flush), SELECT ... FOR UPDATE y cualquier sentencia de otras peticiones.
+    La réplica se elige una vez por sesión, de modo que todas las lecturas de una
+    petición ven el mismo estado.
+
+    Args:
+        replicas (ReplicaSet, optional): Réplicas disponibles.
+    """
+
+    def __init__(self, *args, replicas: ReplicaSet = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self._replica_bind = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self.replicas is None or not read_from_replica.get() or self._flushing:
+            return primary
+        if clause is not None and (
+            clause.is_dml or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            return primary
+        if self._replica_bind is None:
+            self._replica_bind = self.replicas.choose() or primary
+        return self._replica_bind
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware ASGI que marca las peticiones GET/HEAD como lecturas de réplica, salvo
+    que el cliente haya escrito hace poco: las respuestas exitosas a peticiones de
+    escritura agregan la cookie read_primary por ReplicaSet.sticky_seconds, y el
+    encabezado X-Read-Primary fuerza la lectura del primario.
+    """
+
+    def __init__(self, app, replicas: ReplicaSet):
+        self.app = app
+        self.replicas = replicas
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.replicas.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in ("GET", "HEAD"):
+            token = read_from_replica.set(not _reads_primary(scope))
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                read_from_replica.reset(token)
+            return
+
+        cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={self.replicas.sticky_seconds}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        )
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _reads_primary(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == READ_PRIMARY_HEADER:
+            return True
+        if name == b"cookie":
+            try:
+                if READ_PRIMARY_COOKIE in SimpleCookie(value.decode("latin-1")):
+                    return True
+            except CookieError:
+                continue
+    return False
@@ -1,5 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from fastapi import Query
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import date, datetime
+from typing import Literal
+
+BookSort = Literal["id", "-id", "title", "-title", "date_published", "-date_published"]
 
 
 class SchemaAuthor(BaseModel):
@@ -10,10 +14,20 @@ class SchemaAuthor(BaseModel):
     }
 
 
+class SchemaAuthorUpdate(BaseModel):
+    # Actualización parcial (PATCH): solo se modifican los campos enviados.
+    full_name: str = None
+
+    model_config = {
+        "json_schema_extra": {"examples": [{"full_name": "Gabriel García Márquez"}]}
+    }
+
+
 class SchemaAuthorResponse(BaseModel):
     id: int
     full_name: str
     date_created: datetime
+    updated_at: datetime | None = None
 
     model_config = {
         "json_schema_extra": {
@@ -28,6 +42,31 @@ class SchemaAuthorResponse(BaseModel):
     }
 
 
+class SchemaAuthorSuggestion(BaseModel):
+    id: int
+    full_name: str
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"id": 1, "full_name": "Gabriel García Márquez"}]
+        }
+    }
+
+
+class SchemaBulkAuthorResult(BaseModel):
+    full_name: str
+    id: int
+    created: bool
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {"full_name": "Gabriel García Márquez", "id": 1, "created": False}
+            ]
+        }
+    }
+
+
 class SchemaBook(BaseModel):
     title: str
     author_id: int
@@ -48,6 +87,19 @@ class SchemaBook(BaseModel):
     }
 
 
+class SchemaBookUpdate(BaseModel):
+    # Actualización parcial (PATCH): solo se modifican los campos enviados. Los campos
+    # obligatorios no aceptan null.
+    title: str = None
+    author_id: int = None
+    ISBN: str = None
+    date_published: date | None = None
+
+    model_config = {
+        "json_schema_extra": {"examples": [{"date_published": "1967-05-30"}]}
+    }
+
+
 class SchemaBookResponse(BaseModel):
     id: int
     date_created: datetime
@@ -55,6 +107,7 @@ class SchemaBookResponse(BaseModel):
     author_id: int
     ISBN: str
     date_published: date | None = None
+    updated_at: datetime | None = None
 
     model_config = {
         "json_schema_extra": {
@@ -70,3 +123,169 @@ class SchemaBookResponse(BaseModel):
             ]
         }
     }
+
+
+class SchemaAuthorDetailResponse(SchemaAuthorResponse):
+    book_count: int | None = None
+    books: list[SchemaBookResponse] | None = None
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "id": 1,
+                    "date_created": "2021-08-02T00:00:00",
+                    "full_name": "Gabriel García Márquez",
+                    "book_count": 1,
+                    "books": [
+                        {
+                            "id": 1,
+                            "date_created": "2021-08-02T00:00:00",
+                            "title": "Cien años de soledad",
+                            "author_id": 1,
+                            "ISBN": "978-3-16-148410-0",
+                            "date_published": "1967-05-30",
+                        }
+                    ],
+                }
+            ]
+        }
+    }
+
+
+class SchemaBookFilters(BaseModel):
+    author_id: list[int] | None = None
+    year_from: int | None = None
+    year_to: int | None = None
+    published_from: date | None = None
+    published_before: date | None = None
+    sort: BookSort = "id"
+
+    @classmethod
+    def as_query(
+        cls,
+        author_id: list[int] = Query(None, description="IDs de autor (uno o varios)."),
+        year_from: int = Query(None, ge=1, le=9998, description="Año inicial."),
+        year_to: int = Query(None, ge=1, le=9998, description="Año final (incluido)."),
+        published_from: date = Query(None, description="Publicados desde esta fecha."),
+        published_before: date = Query(
+            None, description="Publicados antes de esta fecha (excluida)."
+        ),
+        sort: BookSort = Query(
+            "id", description="Orden: id, title o date_published; '-' descendente."
+        ),
+    ):
+        """
+        Dependencia de FastAPI que construye los filtros de listado de libros a partir
+        de los parámetros de consulta.
+        """
+        return cls(
+            author_id=author_id,
+            year_from=year_from,
+            year_to=year_to,
+            published_from=published_from,
+            published_before=published_before,
+            sort=sort,
+        )
+
+
+class SchemaBulkBookResult(BaseModel):
+    index: int
+    status: Literal["created", "duplicate_isbn", "unknown_author"]
+    id: int | None = None
+    ISBN: str
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "index": 0,
+                    "status": "created",
+                    "id": 1,
+                    "ISBN": "978-3-16-148410-0",
+                }
+            ]
+        }
+    }
+
+
+class SchemaBulkDelete(BaseModel):
+    ids: list[int]
+
+    model_config = {"json_schema_extra": {"examples": [{"ids": [1, 2, 3]}]}}
+
+
+class SchemaBulkDeleteResult(BaseModel):
+    deleted: list[int]
+
+    model_config = {"json_schema_extra": {"examples": [{"deleted": [1, 3]}]}}
+
+
+class SchemaCacheStats(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int | None
+    expirations: int | None
+    invalidations: int
+    size: int | None
+    max_entries: int | None
+    ttl_seconds: float
+
+
+class SchemaPoolStatus(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    checkouts: int
+    timeouts: int
+    wait_ms_avg: float
+    wait_ms_max: float
+    wait_ms_p50: float
+    wait_ms_p95: float
+    wait_ms_p99: float
+
+
+class SchemaReplicaPoolStatus(SchemaPoolStatus):
+    name: str
+    lag_seconds: float | None = None
+    available: bool
+
+
+class SchemaPoolStatusResponse(BaseModel):
+    sync: SchemaPoolStatus
+    async_: SchemaPoolStatus | None = Field(default=None, alias="async")
+    replicas: list[SchemaReplicaPoolStatus] | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class SchemaBooksByYear(BaseModel):
+    year: int
+    book_count: int
+
+    model_config = {
+        "json_schema_extra": {"examples": [{"year": 1967, "book_count": 3}]}
+    }
+
+
+class SchemaBooksByAuthor(BaseModel):
+    author_id: int
+    full_name: str
+    book_count: int
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "author_id": 1,
+                    "full_name": "Gabriel García Márquez",
+                    "book_count": 12,
+                }
+            ]
+        }
+    }
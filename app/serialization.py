@@ -0,0 +1,66 @@
+import functools
+import os
+from typing import Any
+from fastapi import Response
+from pydantic import TypeAdapter
+
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def dump_list_json(items: list, schema, exclude_unset: bool = False) -> bytes:
+    """
+    Serializa una lista de objetos ORM a JSON con el serializador de pydantic-core,
+    validando cada fila una sola vez (from_attributes).
+
+    Args:
+        items (list): Objetos ORM (o instancias del esquema) a serializar.
+        schema: Esquema de respuesta de cada elemento (por ejemplo, SchemaBookResponse).
+        exclude_unset (bool): Omitir los campos que no se asignaron (como
+            response_model_exclude_unset).
+
+    Returns:
+        bytes: Arreglo JSON con los elementos.
+    """
+    adapter = _list_adapter(schema)
+    return adapter.dump_json(
+        adapter.validate_python(items, from_attributes=True),
+        exclude_unset=exclude_unset,
+    )
+
+
+def list_response(
+    items: list, schema, response: Response, exclude_unset: bool = False
+) -> Any:
+    """
+    Construye la respuesta de un listado. Con FAST_SERIALIZATION activo, el JSON se
+    genera directamente con dump_list_json y se devuelve en una Response, evitando que
+    FastAPI vuelva a validar cada fila contra response_model y la pase por
+    jsonable_encoder. Los encabezados ya agregados a `response` (Link, ETag, etc.) se
+    conservan.
+
+    Args:
+        items (list): Objetos ORM a devolver.
+        schema: Esquema de respuesta de cada elemento.
+        response (Response): Respuesta temporal del endpoint, con sus encabezados.
+        exclude_unset (bool): Omitir los campos que no se asignaron.
+
+    Returns:
+        Response | list: La respuesta serializada, o los objetos sin modificar si la
+            serialización rápida está desactivada.
+    """
+    if not FAST_SERIALIZATION:
+        return items
+    return Response(
+        content=dump_list_json(items, schema, exclude_unset),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
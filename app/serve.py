@@ -0,0 +1,174 @@
+"""
+Punto de entrada de producción: varios workers de uvicorn, sin recarga automática.
+
+El número de workers sale de WEB_CONCURRENCY o, por defecto, de los CPU disponibles
+para el proceso. El presupuesto de conexiones de PostgreSQL (max_connections menos las
+reservadas) se reparte entre los workers: si DB_POOL_SIZE + DB_MAX_OVERFLOW por worker
+no cabe, se reducen para todos (y, si ni siquiera alcanza una conexión por worker, se
+reducen los workers), de modo que workers × pool nunca supera max_connections.
+
+Uso:
+    python -m app.serve --host 0.0.0.0 --port 8000
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import uvicorn
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from app.database import DB_MODE_ASYNC, get_db_mode, get_pool_options
+
+logger = logging.getLogger("app.serve")
+
+
+def get_worker_count() -> int:
+    """
+    Obtiene el número de workers: WEB_CONCURRENCY o, si no está definido, los CPU que
+    puede usar el proceso (respetando la afinidad y los límites del contenedor).
+
+    Returns:
+        int: Número de workers, al menos 1.
+    """
+    workers = os.getenv("WEB_CONCURRENCY")
+    if workers:
+        return max(1, int(workers))
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def get_connection_budget(database_url: str) -> int:
+    """
+    Obtiene las conexiones que pueden abrir los workers: DB_MAX_CONNECTIONS o el
+    max_connections del servidor menos superuser_reserved_connections, y en ambos
+    casos menos DB_RESERVED_CONNECTIONS (10 por defecto) para migraciones, psql y
+    monitoreo. Si varias instancias comparten la base de datos, DB_MAX_CONNECTIONS
+    debe ser la parte de esta instancia.
+
+    Args:
+        database_url (str): URL de la base de datos principal.
+
+    Returns:
+        int: Conexiones disponibles para todos los workers.
+    """
+    max_connections = os.getenv("DB_MAX_CONNECTIONS")
+    if max_connections:
+        available = int(max_connections)
+    else:
+        engine = create_engine(database_url, poolclass=NullPool)
+        try:
+            with engine.connect() as connection:
+                available = int(
+                    connection.execute(text("SHOW max_connections")).scalar()
+                ) - int(
+                    connection.execute(
+                        text("SHOW superuser_reserved_connections")
+                    ).scalar()
+                )
+        finally:
+            engine.dispose()
+    return available - int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+
+
+def split_connection_budget(
+    budget: int, workers: int, pool_size: int, max_overflow: int, engines: int = 1
+) -> tuple[int, int, int]:
+    """
+    Reparte el presupuesto de conexiones entre los workers. Cada worker puede abrir
+    hasta pool_size + max_overflow conexiones en cada uno de sus `engines` pools; si no
+    caben, se reduce primero el overflow y luego el tamaño del pool.
+
+    Args:
+        budget (int): Conexiones disponibles para todos los workers.
+        workers (int): Workers deseados.
+        pool_size (int): DB_POOL_SIZE configurado.
+        max_overflow (int): DB_MAX_OVERFLOW configurado.
+        engines (int): Pools por worker que pueden usar el presupuesto (2 en el modo
+            asíncrono, que también conserva el engine síncrono).
+
+    Returns:
+        tuple[int, int, int]: Workers, pool_size y max_overflow a usar.
+
+    Raises:
+        ValueError: Si el presupuesto no alcanza ni para una conexión por pool.
+    """
+    if budget < engines:
+        raise ValueError(
+            f"Connection budget ({budget}) is too small for one worker; "
+            "check DB_MAX_CONNECTIONS and DB_RESERVED_CONNECTIONS"
+        )
+    workers = min(workers, budget // engines)
+    per_pool = budget // (workers * engines)
+    if pool_size + max_overflow > per_pool:
+        pool_size = min(pool_size, per_pool)
+        max_overflow = per_pool - pool_size
+    return workers, pool_size, max_overflow
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inicia la API en modo producción.")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+
+    requested = args.workers or get_worker_count()
+    options = get_pool_options()
+    engines = 2 if get_db_mode() == DB_MODE_ASYNC else 1
+    budget = get_connection_budget(os.getenv("DATABASE_URL"))
+    workers, pool_size, max_overflow = split_connection_budget(
+        budget, requested, options["pool_size"], options["max_overflow"], engines
+    )
+    if workers < requested:
+        logger.warning(
+            "Connection budget %d only allows %d of %d workers",
+            budget,
+            workers,
+            requested,
+        )
+    if (pool_size, max_overflow) != (options["pool_size"], options["max_overflow"]):
+        logger.warning(
+            "Pool per worker reduced from %d+%d to %d+%d to fit %d connections",
+            options["pool_size"],
+            options["max_overflow"],
+            pool_size,
+            max_overflow,
+            budget,
+        )
+    # Los workers heredan el entorno del proceso principal.
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    logger.info(
+        "Starting %d workers (%s, %s), pool %d+%d per worker, %d connections at most",
+        workers,
+        loop,
+        http,
+        pool_size,
+        max_overflow,
+        workers * engines * (pool_size + max_overflow),
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        reload=False,
+        lifespan="on",
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
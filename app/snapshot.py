@@ -0,0 +1,302 @@
+"""
+Snapshots de solo lectura del catálogo en un archivo SQLite.
+
+`export_snapshot` copia las tablas authors, books y collection_versions (con sus
+índices B-tree) desde PostgreSQL, en una sola transacción REPEATABLE READ, a un archivo
+temporal que luego reemplaza al anterior con os.replace. Con READ_MODE=snapshot, los
+endpoints de lectura se sirven desde ese archivo (ver app.snapshot_endpoints), abierto
+en modo de solo lectura y con E/S por mmap, sin conexiones a PostgreSQL.
+
+Uso:
+    python -m app.snapshot --output /var/lib/biblioteca/catalog.sqlite3
+"""
+
+import argparse
+import os
+import threading
+import time
+from datetime import timezone
+from fastapi import HTTPException, status
+from sqlalchemy import MetaData, create_engine, event, insert, select
+from sqlalchemy.dialects.sqlite import DATETIME
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql import sqltypes
+from app.models import Author, Book, CollectionVersion
+
+READ_MODE_PRIMARY = "primary"
+READ_MODE_SNAPSHOT = "snapshot"
+SNAPSHOT_BATCH_SIZE = int(os.getenv("SNAPSHOT_BATCH_SIZE", "10000"))
+
+
+def get_read_mode() -> str:
+    """
+    Obtiene el origen de las lecturas configurado en READ_MODE ("primary" o
+    "snapshot").
+
+    Returns:
+        str: El modo configurado, "primary" por defecto.
+
+    Raises:
+        ValueError: Si READ_MODE tiene un valor distinto de "primary" o "snapshot".
+    """
+    mode = os.getenv("READ_MODE", READ_MODE_PRIMARY).lower()
+    if mode not in (READ_MODE_PRIMARY, READ_MODE_SNAPSHOT):
+        raise ValueError(f"Invalid READ_MODE: {mode}")
+    return mode
+
+
+class UTCDateTime(DATETIME):
+    """
+    DATETIME de SQLite que conserva la zona horaria: las fechas se guardan en UTC y se
+    leen como datetime con tzinfo=UTC, igual que las columnas timestamptz de PostgreSQL.
+    """
+
+    def bind_processor(self, dialect):
+        process = super().bind_processor(dialect)
+
+        def bind(value):
+            if value is not None and value.tzinfo is not None:
+                value = value.astimezone(timezone.utc)
+            return process(value)
+
+        return bind
+
+    def result_processor(self, dialect, coltype):
+        process = super().result_processor(dialect, coltype)
+
+        def result(value):
+            value = process(value)
+            if value is not None and self.timezone:
+                value = value.replace(tzinfo=timezone.utc)
+            return value
+
+        return result
+
+
+def snapshot_tables() -> list:
+    """
+    Copia las tablas del catálogo a una MetaData propia, sin los índices específicos
+    de PostgreSQL (GIN de trigramas), que en SQLite serían índices B-tree redundantes.
+    Sirven para crear el catálogo en cualquier base de datos, aunque no tenga la
+    extensión pg_trgm.
+
+    Returns:
+        list[Table]: Tablas authors, books y collection_versions.
+    """
+    metadata = MetaData()
+    tables = []
+    for model in (Author, Book, CollectionVersion):
+        table = model.__table__.to_metadata(metadata)
+        for index in list(table.indexes):
+            if index.dialect_options["postgresql"].get("using"):
+                table.indexes.discard(index)
+        tables.append(table)
+    return tables
+
+
+def create_snapshot_engine(
+    path: str, readonly: bool = True, mmap_size: int = 0, pool_size: int = 5
+) -> Engine:
+    """
+    Crea un engine de SQLAlchemy sobre un archivo de snapshot.
+
+    Args:
+        path (str): Ruta del archivo SQLite.
+        readonly (bool): Abrir en modo de solo lectura (mode=ro, query_only).
+        mmap_size (int): Bytes del archivo que SQLite lee por mmap (PRAGMA mmap_size).
+        pool_size (int): Conexiones que conserva el pool.
+
+    Returns:
+        Engine: Engine de SQLite con fechas con zona horaria (UTCDateTime).
+    """
+    mode = "ro" if readonly else "rwc"
+    engine = create_engine(
+        f"sqlite:///file:{path}?mode={mode}&uri=true",
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=0 if readonly else 10,
+        connect_args={"check_same_thread": False},
+    )
+    engine.dialect.colspecs = {
+        **engine.dialect.colspecs,
+        sqltypes.DateTime: UTCDateTime,
+    }
+
+    @event.listens_for(engine, "connect")
+    def configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if readonly:
+            cursor.execute("PRAGMA query_only = ON")
+        if mmap_size:
+            cursor.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        cursor.close()
+
+    return engine
+
+
+def export_snapshot(source: Engine, path: str) -> dict:
+    """
+    Exporta el catálogo a un archivo SQLite y lo publica de forma atómica: se escribe
+    en un archivo temporal en el mismo directorio y se reemplaza el anterior con
+    os.replace. Los lectores que ya tenían abierto el archivo anterior lo siguen
+    leyendo hasta que cambian al nuevo.
+
+    Args:
+        source (Engine): Engine de PostgreSQL.
+        path (str): Ruta final del snapshot.
+
+    Returns:
+        dict: Filas copiadas por tabla y duración de la exportación.
+    """
+    start = time.perf_counter()
+    temporary = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+    target = create_snapshot_engine(temporary, readonly=False)
+    tables = snapshot_tables()
+    rows = {}
+    try:
+        with target.begin() as target_connection:
+            target_connection.exec_driver_sql("PRAGMA journal_mode = OFF")
+            target_connection.exec_driver_sql("PRAGMA synchronous = OFF")
+            # Las tablas se cargan sin índices y los índices se crean al final.
+            indexes = []
+            for table in tables:
+                indexes.extend(table.indexes)
+                table.indexes.clear()
+                table.create(target_connection)
+
+            # Una sola transacción REPEATABLE READ: las versiones de las colecciones
+            # corresponden exactamente a las filas copiadas.
+            with source.connect().execution_options(
+                isolation_level="REPEATABLE READ"
+            ) as source_connection:
+                for table in tables:
+                    result = source_connection.execution_options(
+                        yield_per=SNAPSHOT_BATCH_SIZE
+                    ).execute(select(table).order_by(*table.primary_key))
+                    rows[table.name] = 0
+                    for batch in result.partitions():
+                        target_connection.execute(
+                            insert(table), [row._asdict() for row in batch]
+                        )
+                        rows[table.name] += len(batch)
+
+            for index in indexes:
+                index.create(target_connection)
+            target_connection.exec_driver_sql("ANALYZE")
+        target.dispose()
+        os.replace(temporary, path)
+    except BaseException:
+        target.dispose()
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return {**rows, "seconds": time.perf_counter() - start}
+
+
+class Snapshot:
+    """
+    Snapshot publicado en `path`. Cada `engine()` comprueba, como máximo una vez cada
+    `check_interval` segundos, si el archivo fue reemplazado (otro inode o fecha de
+    modificación) y en ese caso abre un engine nuevo; las peticiones en curso terminan
+    con el engine anterior.
+
+    Args:
+        path (str): Ruta del archivo SQLite.
+        mmap_size (int): Bytes del archivo que SQLite lee por mmap.
+        pool_size (int): Conexiones por engine (una por hilo del threadpool).
+        check_interval (float): Segundos entre comprobaciones del archivo.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mmap_size: int = 1 << 30,
+        pool_size: int = 40,
+        check_interval: float = 1.0,
+    ):
+        self.path = path
+        self.mmap_size = mmap_size
+        self.pool_size = pool_size
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._engine: Engine | None = None
+        self._file_id = None
+        self._checked_at = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Crea el snapshot a partir de SNAPSHOT_PATH, SNAPSHOT_MMAP_SIZE,
+        SNAPSHOT_POOL_SIZE y SNAPSHOT_CHECK_INTERVAL.
+        """
+        return cls(
+            path=os.getenv("SNAPSHOT_PATH", "/var/lib/biblioteca/catalog.sqlite3"),
+            mmap_size=int(os.getenv("SNAPSHOT_MMAP_SIZE", str(1 << 30))),
+            pool_size=int(os.getenv("SNAPSHOT_POOL_SIZE", "40")),
+            check_interval=float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "1.0")),
+        )
+
+    def engine(self) -> Engine:
+        """
+        Obtiene el engine del snapshot publicado actualmente.
+
+        Returns:
+            Engine: Engine de solo lectura sobre el archivo.
+
+        Raises:
+            HTTPException:
+                - 503: Si todavía no se ha publicado ningún snapshot.
+        """
+        now = time.monotonic()
+        if self._engine is not None and now - self._checked_at < self.check_interval:
+            return self._engine
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                if self._engine is not None:
+                    return self._engine
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Snapshot not available",
+                )
+            file_id = (stat.st_ino, stat.st_mtime_ns)
+            if file_id != self._file_id:
+                previous = self._engine
+                self._engine = create_snapshot_engine(
+                    self.path, mmap_size=self.mmap_size, pool_size=self.pool_size
+                )
+                self._file_id = file_id
+                if previous is not None:
+                    # Cierra las conexiones libres; las que están en uso se cierran
+                    # al devolverse.
+                    previous.dispose()
+            return self._engine
+
+
+snapshot = Snapshot.from_env()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta un snapshot del catálogo.")
+    parser.add_argument("--output", default=snapshot.path)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    source = create_engine(args.database_url or os.getenv("DATABASE_URL"))
+    try:
+        result = export_snapshot(source, args.output)
+    finally:
+        source.dispose()
+    print(
+        f"{args.output}: {result['authors']:,} autores, {result['books']:,} libros "
+        f"en {result['seconds']:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
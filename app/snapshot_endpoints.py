@@ -0,0 +1,183 @@
+from fastapi import APIRouter, Depends, FastAPI, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from app.schemas import *
+from app.async_endpoints import replace_routes
+from app.conditional import collection_response, conditional_response, make_etag
+from app.crud import snapshot as snapshot_crud
+from app.crud.authors import parse_author_include
+from app.crud.books import search_books
+from app.pagination import DEFAULT_PAGE_LIMIT, add_pagination_headers
+from app.serialization import list_response
+from app.snapshot import snapshot
+
+router = APIRouter()
+
+
+def get_snapshot_session():
+    """
+    Dependencia de FastAPI que abre una sesión sobre el snapshot publicado al inicio de
+    la petición; toda la petición lee del mismo archivo aunque se publique otro.
+
+    Yields:
+        Session: Sesión de solo lectura sobre el snapshot.
+    """
+    with Session(snapshot.engine()) as session:
+        yield session
+
+
+# Endpoints Autores
+
+
+@router.get(
+    "/authors/",
+    response_model=list[SchemaAuthorDetailResponse],
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener todos los autores",
+    description="Obtiene una página de los autores registrados en la base de datos. "
+    "Con `include=books` se incluyen los libros de cada autor y con "
+    "`include=book_count` su número de libros (se pueden combinar separados por "
+    "comas). Si existen más resultados, la respuesta incluye los encabezados `Link` "
+    '(rel="next") y `X-Next-Cursor` con el cursor para el parámetro `after`.',
+)
+def get_authors_endpoint(
+    request: Request,
+    response: Response,
+    after: str = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    include: str = None,
+    session: Session = Depends(get_snapshot_session),
+):
+    include = parse_author_include(include)
+    versions = [snapshot_crud.get_collection_version(session, "authors")]
+    if include:
+        versions.append(snapshot_crud.get_collection_version(session, "books"))
+    not_modified = collection_response(request, response, *versions)
+    if not_modified:
+        return not_modified
+    authors, next_cursor = snapshot_crud.get_authors(session, after, limit, include)
+    add_pagination_headers(request, response, next_cursor)
+    return list_response(
+        authors, SchemaAuthorDetailResponse, response, exclude_unset=True
+    )
+
+
+@router.get(
+    "/authors/{author_id}",
+    response_model=SchemaAuthorDetailResponse,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener un autor específico",
+    description="Obtiene un autor específico por su ID. Con `include=books` se "
+    "incluyen sus libros y con `include=book_count` su número de libros.",
+)
+def get_author_endpoint(
+    author_id: int,
+    request: Request,
+    response: Response,
+    include: str = None,
+    session: Session = Depends(get_snapshot_session),
+):
+    include = parse_author_include(include)
+    author = snapshot_crud.get_author(session, author_id, include)
+    etag_parts = ["author", author.id, author.updated_at]
+    last_modified = author.updated_at
+    if include:
+        books_version = snapshot_crud.get_collection_version(session, "books")
+        etag_parts += [*sorted(include), books_version.version]
+        last_modified = max(last_modified, books_version.updated_at)
+    etag = make_etag(*etag_parts)
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    return author
+
+
+# Endpoints Libros
+
+
+@router.get(
+    "/books/",
+    response_model=list[SchemaBookResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Obtener todos los libros",
+    description="Obtiene una página de los libros registrados en la base de datos, "
+    "opcionalmente filtrada por autores (`author_id`), años (`year_from`, `year_to`) o "
+    "fechas de publicación (`published_from`, `published_before`) y ordenada según "
+    "`sort`. Si existen más resultados, la respuesta incluye los encabezados `Link` "
+    '(rel="next") y `X-Next-Cursor` con el cursor para el parámetro `after`.',
+)
+def get_books_endpoint(
+    request: Request,
+    response: Response,
+    after: str = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    session: Session = Depends(get_snapshot_session),
+    filters: SchemaBookFilters = Depends(SchemaBookFilters.as_query),
+):
+    version = snapshot_crud.get_collection_version(session, "books")
+    not_modified = collection_response(request, response, version)
+    if not_modified:
+        return not_modified
+    books, next_cursor = snapshot_crud.get_books(session, after, limit, filters)
+    add_pagination_headers(request, response, next_cursor)
+    return list_response(books, SchemaBookResponse, response)
+
+
+@router.get(
+    "/books/{book_id}",
+    response_model=SchemaBookResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Obtener un libro específico",
+    description="Obtiene un libro específico por su ID.",
+)
+def get_book_endpoint(
+    book_id: int,
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_snapshot_session),
+):
+    book = snapshot_crud.get_book(session, book_id)
+    etag = make_etag("book", book.id, book.updated_at)
+    not_modified = conditional_response(request, response, etag, book.updated_at)
+    if not_modified:
+        return not_modified
+    return book
+
+
+@router.get(
+    "/books/search/",
+    response_model=list[SchemaBookResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Buscar libros",
+    description="Busca libros por nombre de autor y/o año de publicación. Con el "
+    "parámetro `q` se hace una búsqueda aproximada por título y nombre de autor, "
+    "ordenada por relevancia y limitada a `limit` resultados.",
+)
+def search_books_endpoint(
+    response: Response,
+    author_name: str = None,
+    # Mismos límites que year_from/year_to: date(year + 1, 1, 1) debe ser válida.
+    year: int = Query(None, ge=1, le=9998),
+    q: str = None,
+    limit: int = None,
+    session: Session = Depends(get_snapshot_session),
+):
+    if q:
+        # La búsqueda por relevancia usa los índices de trigramas de PostgreSQL.
+        books = search_books(author_name, year, q, limit)
+    else:
+        books = snapshot_crud.search_books(session, author_name, year)
+    return list_response(books, SchemaBookResponse, response)
+
+
+def use_snapshot_endpoints(app: FastAPI):
+    """
+    Reemplaza los endpoints de lectura de autores y libros por versiones que leen del
+    snapshot SQLite (app.snapshot). Las escrituras, la exportación y la búsqueda por
+    `q` siguen usando PostgreSQL.
+
+    Args:
+        app (FastAPI): Aplicación cuyas rutas se reemplazan.
+    """
+    replace_routes(app, router)
@@ -0,0 +1,318 @@
+"""
+Índice en memoria de los nombres de autores para el autocompletado
+(GET /authors/suggest).
+
+Cada nombre se normaliza (sin acentos, en minúsculas y con los espacios unificados) y
+se indexa por cada una de sus palabras hasta el final del nombre: "Gabriel García
+Márquez" se encuentra con "gab", "garc" o "marq". Las entradas se guardan en una lista
+ordenada, por lo que una sugerencia es una búsqueda binaria (bisect) más la lectura de
+las entradas que comparten el prefijo, sin consultar la base de datos.
+
+Las escrituras de autores de este worker actualizan el índice al confirmarse. Las de
+otros workers se incorporan cuando un hilo detecta, cada SUGGEST_REFRESH_INTERVAL
+segundos, que la versión de la colección de autores avanzó más que las escrituras
+propias (ver PrefixIndex.own_write), y entonces reconstruye el índice.
+"""
+
+import logging
+import os
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from app.models import Author, CollectionVersion
+
+logger = logging.getLogger("app.suggest")
+
+
+def normalize(text: str) -> str:
+    """
+    Normaliza un texto para compararlo por prefijo: sin acentos ni diacríticos, en
+    minúsculas (casefold) y con los espacios consecutivos reducidos a uno.
+
+    Args:
+        text (str): Texto a normalizar.
+
+    Returns:
+        str: Texto normalizado, por ejemplo "gabriel garcia marquez".
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def _keys(full_name: str) -> list[str]:
+    words = normalize(full_name).split(" ")
+    return list(
+        dict.fromkeys(" ".join(words[i:]) for i in range(len(words)) if words[i])
+    )
+
+
+class PrefixIndex:
+    """
+    Índice de prefijos de los nombres de autores, seguro entre hilos.
+
+    Args:
+        max_results (int): Máximo de sugerencias por búsqueda.
+        refresh_interval (float): Segundos entre comprobaciones de la versión de la
+            colección de autores; 0 desactiva la reconstrucción periódica.
+    """
+
+    def __init__(self, max_results: int = 50, refresh_interval: float = 30.0):
+        self.max_results = max_results
+        self.refresh_interval = refresh_interval
+        self.version: int | None = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        # Entradas (clave normalizada, ID) ordenadas, y nombre y claves de cada autor.
+        self._entries: list[tuple[str, int]] = []
+        self._authors: dict[int, tuple[str, list[str]]] = {}
+        # Cambios recibidos mientras se reconstruye el índice, para aplicarlos también
+        # al índice nuevo (None si no hay una reconstrucción en curso).
+        self._pending: list[tuple[int, str | None]] | None = None
+        self._refresher: threading.Thread | None = None
+        # Sentencias sobre authors confirmadas por este worker (que cambiaron filas) y
+        # commits en curso; cuántas de ellas incluye `version` (None si no se sabe).
+        self._own_writes = 0
+        self._writes_in_flight = 0
+        self._own_at_version: int | None = None
+        self.reloads = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Crea el índice a partir de SUGGEST_MAX_RESULTS y SUGGEST_REFRESH_INTERVAL.
+        """
+        return cls(
+            max_results=int(os.getenv("SUGGEST_MAX_RESULTS", "50")),
+            refresh_interval=float(os.getenv("SUGGEST_REFRESH_INTERVAL", "30")),
+        )
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
+    def load(self, engine: Engine) -> int:
+        """
+        Reconstruye el índice con todos los autores. La versión de la colección y los
+        autores se leen en la misma transacción REPEATABLE READ; el índice nuevo se
+        arma fuera del lock y reemplaza al anterior de una vez, con los cambios que
+        llegaron mientras tanto.
+
+        Args:
+            engine (Engine): Engine de la base de datos principal.
+
+        Returns:
+            int: Número de autores indexados.
+        """
+        with self._load_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                return self._load(engine)
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def _read_version(self, connection) -> tuple[int, int | None]:
+        # Versión de la colección y escrituras propias que incluye: se sabe solo si
+        # ningún commit propio estuvo en curso ni terminó durante la lectura.
+        with self._lock:
+            before = (self._writes_in_flight, self._own_writes)
+        version = connection.scalar(
+            select(CollectionVersion.version).where(CollectionVersion.name == "authors")
+        )
+        with self._lock:
+            after = (self._writes_in_flight, self._own_writes)
+        own = before[1] if before == after and before[0] == 0 else None
+        return version or 0, own
+
+    def _load(self, engine: Engine) -> int:
+        with engine.connect().execution_options(
+            isolation_level="REPEATABLE READ"
+        ) as connection:
+            version, own = self._read_version(connection)
+            rows = connection.execute(select(Author.id, Author.full_name)).all()
+        authors = {}
+        entries = []
+        for author_id, full_name in rows:
+            keys = _keys(full_name)
+            authors[author_id] = (full_name, keys)
+            entries.extend((key, author_id) for key in keys)
+        entries.sort()
+        with self._lock:
+            self._entries = entries
+            self._authors = authors
+            pending, self._pending = self._pending, None
+            for author_id, full_name in pending:
+                self._apply(author_id, full_name)
+            self.version = version
+            self._own_at_version = own
+            self.reloads += 1
+            return len(self._authors)
+
+    def ensure_loaded(self, engine: Engine):
+        """Construye el índice si todavía no se ha cargado (una sola vez)."""
+        if self.loaded:
+            return
+        with self._load_lock:
+            if not self.loaded:
+                self.load(engine)
+
+    @contextmanager
+    def own_write(self, changed: bool = True):
+        """
+        Envuelve el commit de una sentencia de este worker sobre authors, para que
+        refresh distinga los cambios propios (que add y remove ya aplicaron) de los de
+        otros workers.
+
+        Args:
+            changed (bool): Si la sentencia modificó filas; las que no las modifican no
+                cambian la versión de la colección.
+        """
+        with self._lock:
+            self._writes_in_flight += 1
+        committed = False
+        try:
+            yield
+            committed = True
+        finally:
+            with self._lock:
+                self._writes_in_flight -= 1
+                if committed and changed:
+                    self._own_writes += 1
+
+    def refresh(self, engine: Engine) -> bool:
+        """
+        Reconstruye el índice si otro proceso modificó los autores: si la versión de la
+        colección solo avanzó por las escrituras de este worker, únicamente se anota la
+        versión nueva. Ante la duda (un commit propio simultáneo a la lectura) se
+        reconstruye.
+
+        Args:
+            engine (Engine): Engine de la base de datos principal.
+
+        Returns:
+            bool: Si se reconstruyó el índice.
+        """
+        with self._load_lock:
+            with engine.connect() as connection:
+                version, own = self._read_version(connection)
+            if version == self.version:
+                if own is not None:
+                    self._own_at_version = own
+                return False
+            if (
+                own is not None
+                and self._own_at_version is not None
+                and version - self.version == own - self._own_at_version
+            ):
+                self.version = version
+                self._own_at_version = own
+                return False
+            self.load(engine)
+            return True
+
+    def start(self, engine: Engine):
+        """
+        Inicia el hilo que llama a refresh cada refresh_interval segundos (una vez por
+        proceso).
+        """
+        if self._refresher is not None or self.refresh_interval <= 0:
+            return
+
+        def refresh():
+            while True:
+                time.sleep(self.refresh_interval)
+                try:
+                    self.refresh(engine)
+                except Exception as e:
+                    logger.warning("Author suggestions not refreshed: %s", e)
+
+        self._refresher = threading.Thread(
+            target=refresh, name="author-suggest-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def add(self, author_id: int, full_name: str):
+        """
+        Agrega un autor al índice, o actualiza su nombre si ya estaba.
+
+        Args:
+            author_id (int): ID del autor.
+            full_name (str): Nombre completo del autor.
+        """
+        with self._lock:
+            self._apply(author_id, full_name)
+
+    def remove(self, *author_ids: int):
+        """
+        Quita autores del índice; los que no estaban se ignoran.
+
+        Args:
+            *author_ids (int): IDs de los autores eliminados.
+        """
+        with self._lock:
+            for author_id in author_ids:
+                self._apply(author_id, None)
+
+    def _apply(self, author_id: int, full_name: str | None):
+        # Agrega o renombra un autor (full_name) o lo quita (None). Requiere el lock.
+        if self._pending is not None:
+            self._pending.append((author_id, full_name))
+        self._discard(author_id)
+        if full_name is not None:
+            keys = _keys(full_name)
+            self._authors[author_id] = (full_name, keys)
+            for key in keys:
+                insort(self._entries, (key, author_id))
+
+    def _discard(self, author_id: int):
+        author = self._authors.pop(author_id, None)
+        if author is None:
+            return
+        for key in author[1]:
+            position = bisect_left(self._entries, (key, author_id))
+            if position < len(self._entries) and self._entries[position] == (
+                key,
+                author_id,
+            ):
+                del self._entries[position]
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[dict]:
+        """
+        Busca los autores cuyo nombre, o alguna de sus palabras, empieza por `prefix`.
+
+        Args:
+            prefix (str): Texto escrito por el usuario (se normaliza igual que los
+                nombres).
+            limit (int): Número máximo de sugerencias (hasta max_results).
+
+        Returns:
+            list[dict]: Autores con su "id" y "full_name", en orden alfabético de la
+                coincidencia.
+        """
+        key = normalize(prefix)
+        limit = max(1, min(limit, self.max_results))
+        if not key:
+            return []
+        results = {}
+        with self._lock:
+            position = bisect_left(self._entries, (key,))
+            while position < len(self._entries) and len(results) < limit:
+                entry, author_id = self._entries[position]
+                if not entry.startswith(key):
+                    break
+                if author_id not in results:
+                    results[author_id] = self._authors[author_id][0]
+                position += 1
+        return [
+            {"id": author_id, "full_name": full_name}
+            for author_id, full_name in results.items()
+        ]
+
+
+author_index = PrefixIndex.from_env()
@@ -0,0 +1,97 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.main import app, create_app
+from app.diagnostics import QueryDiagnostics
+from app.warmup import get_warmup_connections
+
+client = TestClient(app)
+
+
+def test_pool_status():
+    client.get("/authors/")
+    response = client.get("/admin/pool")
+    assert response.status_code == 200
+    pool = response.json()["sync"]
+    assert pool["checkouts"] >= 1
+    assert pool["checked_out"] >= 0
+    assert pool["wait_ms_max"] >= pool["wait_ms_p50"]
+
+
+def test_cache_stats():
+    author_id = client.post(
+        "/authors/", json={"full_name": "Clarice Lispector"}
+    ).json()["id"]
+    before = client.get("/admin/cache").json()
+
+    # La primera lectura llena la caché y la segunda la usa.
+    assert client.get(f"/authors/{author_id}").status_code == 200
+    assert client.get(f"/authors/{author_id}").status_code == 200
+    client.put(f"/authors/{author_id}", json={"full_name": "Clarice Lispector (1920)"})
+    assert client.get(f"/authors/{author_id}").json()["full_name"] == (
+        "Clarice Lispector (1920)"
+    )
+
+    after = client.get("/admin/cache").json()
+    assert after["hits"] > before["hits"]
+    assert after["invalidations"] > before["invalidations"]
+
+    client.delete(f"/authors/{author_id}")
+
+
+def test_lifespan_warm_up():
+    warm_app = create_app()
+    with TestClient(warm_app) as warm_client:
+        assert {"mappers", "schemas", "connections", "total"} <= set(
+            warm_app.state.warmup
+        )
+        assert warm_app.openapi_schema is not None
+        pool = warm_client.get("/admin/pool").json()["sync"]
+        assert pool["checked_in"] + pool["checked_out"] >= get_warmup_connections()
+
+
+def test_metrics():
+    response = client.get("/books/0")
+    assert response.status_code == 404
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/books/{book_id}",'
+        'status="404"}' in metrics.text
+    )
+    assert 'http_request_db_queries_total{method="GET",route="/books/{book_id}"}' in (
+        metrics.text
+    )
+
+
+def test_query_diagnostics():
+    engine = create_engine(os.getenv("DATABASE_URL"))
+    query_diagnostics = QueryDiagnostics(
+        enabled=True, slow_query_ms=0, explain_sample_rate=1.0, n_plus_one_threshold=3
+    )
+    query_diagnostics.install(engine)
+
+    with query_diagnostics.track_request("GET /test"), engine.connect() as conn:
+        for author_id in range(5):
+            conn.execute(
+                text("SELECT id FROM authors WHERE id = :id"), {"id": author_id}
+            )
+    engine.dispose()
+
+    findings = query_diagnostics.findings()
+    assert findings["n_plus_one"] == [
+        {
+            "route": "GET /test",
+            "statement": "SELECT id FROM authors WHERE id = %(id)s",
+            "count": 5,
+        }
+    ]
+    slow = findings["slow_queries"][-1]
+    assert slow["route"] == "GET /test"
+    assert "Execution Time" in slow["plan"]
+
+    assert client.get("/admin/diagnostics").json()["enabled"] is False
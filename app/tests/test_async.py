@@ -0,0 +1,107 @@
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.async_endpoints import router
+from app.cache import SQLiteCache, entity_cache
+from app.database import get_async_engine
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    # Un solo event loop para todo el módulo: el pool de asyncpg está ligado a él.
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(get_async_engine().dispose)
+
+
+def test_async_author_and_book_crud(client):
+    author_response = client.post("/authors/", json={"full_name": "Ursula K. Le Guin"})
+    assert author_response.status_code == 201
+    author_id = author_response.json()["id"]
+
+    book_response = client.post(
+        "/books/",
+        json={
+            "title": "The Dispossessed",
+            "author_id": author_id,
+            "ISBN": "978-0-06-051275-0",
+            "date_published": "1974-05-01",
+        },
+    )
+    assert book_response.status_code == 201
+    book_id = book_response.json()["id"]
+
+    update_response = client.put(
+        f"/books/{book_id}",
+        json={
+            "title": "The Dispossessed: An Ambiguous Utopia",
+            "author_id": author_id,
+            "ISBN": "978-0-06-051275-0",
+            "date_published": "1974-05-01",
+        },
+    )
+    assert update_response.status_code == 200
+    assert update_response.json()["title"] == "The Dispossessed: An Ambiguous Utopia"
+
+    patch_response = client.patch(
+        f"/books/{book_id}", json={"date_published": "1974-06-01"}
+    )
+    assert patch_response.status_code == 200
+    assert patch_response.json()["date_published"] == "1974-06-01"
+    assert client.patch(f"/books/{book_id}", json={"author_id": 0}).status_code == 404
+
+    search_response = client.get("/books/search/", params={"author_name": "Le Guin"})
+    assert search_response.status_code == 200
+    assert [book["id"] for book in search_response.json()] == [book_id]
+
+    page = client.get("/books/", params={"limit": 1})
+    assert page.status_code == 200
+    assert len(page.json()) == 1
+
+    detail = client.get(f"/authors/{author_id}", params={"include": "books,book_count"})
+    assert detail.json()["book_count"] == 1
+    assert [book["id"] for book in detail.json()["books"]] == [book_id]
+
+    assert client.delete(f"/books/{book_id}").status_code == 204
+    assert client.get(f"/books/{book_id}").status_code == 404
+    assert client.delete(f"/authors/{author_id}").status_code == 204
+    assert client.get(f"/authors/{author_id}").status_code == 404
+
+
+def test_async_duplicate_author(client):
+    author_id = client.post("/authors/", json={"full_name": "Octavia Butler"}).json()[
+        "id"
+    ]
+    duplicate_response = client.post("/authors/", json={"full_name": "Octavia Butler"})
+    assert duplicate_response.status_code == 400
+
+    client.delete(f"/authors/{author_id}")
+
+
+def test_async_routes_call_blocking_cache_off_the_event_loop(
+    client, monkeypatch, tmp_path
+):
+    threads = []
+
+    class RecordingCache(SQLiteCache):
+        def _connection(self):
+            threads.append(threading.get_ident())
+            return super()._connection()
+
+    backend = RecordingCache(str(tmp_path / "cache.sqlite3"), max_entries=10, ttl=60)
+    monkeypatch.setattr(entity_cache, "backend", backend)
+    threads.clear()
+
+    author_id = client.post("/authors/", json={"full_name": "Stanisław Lem"}).json()[
+        "id"
+    ]
+    assert client.get(f"/authors/{author_id}").status_code == 200
+    assert client.get(f"/authors/{author_id}").status_code == 200
+    assert client.delete(f"/authors/{author_id}").status_code == 204
+
+    assert backend.stats()["hits"] == 1
+    loop_thread = client.portal.call(threading.get_ident)
+    assert threads and loop_thread not in threads
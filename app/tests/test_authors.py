@@ -1,6 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.pagination import encode_cursor
 
 
 client = TestClient(app)
@@ -15,11 +16,57 @@ def test_create_author():
     client.delete(f"/authors/{author_id}")
 
 
+def test_create_authors_bulk():
+    existing_id = client.post("/authors/", json={"full_name": "Italo Calvino"}).json()[
+        "id"
+    ]
+
+    response = client.post(
+        "/authors/bulk",
+        json=[
+            {"full_name": "Italo Calvino"},
+            {"full_name": "Umberto Eco"},
+            {"full_name": "Umberto Eco"},
+        ],
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0] == {
+        "full_name": "Italo Calvino",
+        "id": existing_id,
+        "created": False,
+    }
+    assert results[1]["created"] is True
+    assert results[2]["id"] == results[1]["id"]
+
+    client.delete(f"/authors/{existing_id}")
+    client.delete(f"/authors/{results[1]['id']}")
+
+
 def test_get_authors():
     response = client.get("/authors/")
     assert response.status_code in (200, 404)
 
 
+def test_get_authors_pagination():
+    author_ids = [
+        client.post("/authors/", json={"full_name": name}).json()["id"]
+        for name in ["Julio Cortázar", "Mario Benedetti"]
+    ]
+
+    first_page = client.get("/authors/", params={"limit": 1})
+    assert first_page.status_code == 200
+    assert len(first_page.json()) == 1
+
+    cursor = first_page.headers["x-next-cursor"]
+    second_page = client.get("/authors/", params={"limit": 1, "after": cursor})
+    assert second_page.status_code == 200
+    assert second_page.json()[0]["id"] > first_page.json()[0]["id"]
+
+    for author_id in author_ids:
+        client.delete(f"/authors/{author_id}")
+
+
 def test_get_author():
     create_response = client.post("/authors/", json={"full_name": "George Orwell"})
     author_id = create_response.json()["id"]
@@ -30,6 +77,54 @@ def test_get_author():
     client.delete(f"/authors/{author_id}")
 
 
+def test_get_author_include_books():
+    author_id = client.post(
+        "/authors/", json={"full_name": "Jorge Luis Borges"}
+    ).json()["id"]
+    book_ids = [
+        client.post(
+            "/books/",
+            json={"title": title, "author_id": author_id, "ISBN": isbn},
+        ).json()["id"]
+        for title, isbn in [("Ficciones", "INC-0001"), ("El Aleph", "INC-0002")]
+    ]
+
+    response = client.get(
+        f"/authors/{author_id}", params={"include": "books,book_count"}
+    )
+    assert response.status_code == 200
+    assert response.json()["book_count"] == 2
+    assert [book["id"] for book in response.json()["books"]] == book_ids
+
+    plain = client.get(f"/authors/{author_id}").json()
+    assert "books" not in plain and "book_count" not in plain
+
+    page = client.get(
+        "/authors/",
+        params={
+            "include": "book_count",
+            "after": encode_cursor([author_id - 1]),
+            "limit": 1,
+        },
+    )
+    assert page.json()[0]["book_count"] == 2
+    assert "books" not in page.json()[0]
+
+    etag = response.headers["etag"]
+    client.delete(f"/books/{book_ids[0]}")
+    response = client.get(
+        f"/authors/{author_id}",
+        params={"include": "books"},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert len(response.json()["books"]) == 1
+
+    assert client.get("/authors/", params={"include": "reviews"}).status_code == 400
+
+    client.delete(f"/authors/{author_id}")
+
+
 def test_update_author():
     create_response = client.post("/authors/", json={"full_name": "Ernest Hemingway"})
     author_id = create_response.json()["id"]
@@ -43,6 +138,26 @@ def test_update_author():
     client.delete(f"/authors/{author_id}")
 
 
+def test_patch_author():
+    author_id = client.post("/authors/", json={"full_name": "Jane Austen"}).json()["id"]
+    other_id = client.post("/authors/", json={"full_name": "Emily Brontë"}).json()["id"]
+
+    response = client.patch(f"/authors/{author_id}", json={"full_name": "J. Austen"})
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "J. Austen"
+    assert client.patch(f"/authors/{author_id}", json={}).status_code == 200
+    assert (
+        client.patch(
+            f"/authors/{author_id}", json={"full_name": "Emily Brontë"}
+        ).status_code
+        == 400
+    )
+    assert client.patch("/authors/0", json={"full_name": "Nadie"}).status_code == 404
+
+    client.delete(f"/authors/{author_id}")
+    client.delete(f"/authors/{other_id}")
+
+
 def test_delete_author():
     create_response = client.post(
         "/authors/", json={"full_name": "F. Scott Fitzgerald"}
@@ -1,6 +1,10 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 from app.main import app
+from app.cache import book_key, entity_cache
+from app.database import get_engine
 
 client = TestClient(app)
 
@@ -31,6 +35,135 @@ def test_get_books():
     assert response.status_code in (200, 404)
 
 
+def test_get_books_pagination():
+    author_response = client.post("/authors/", json={"full_name": "Jorge Luis Borges"})
+    author_id = author_response.json()["id"]
+
+    book_ids = []
+    for i, title in enumerate(["Ficciones", "El Aleph", "El hacedor"]):
+        book_response = client.post(
+            "/books/",
+            json={
+                "title": title,
+                "author_id": author_id,
+                "ISBN": f"978-84-206-{i}000-0",
+                "date_published": "1944-01-01",
+            },
+        )
+        book_ids.append(book_response.json()["id"])
+
+    first_page = client.get("/books/", params={"limit": 1})
+    assert first_page.status_code == 200
+    assert len(first_page.json()) == 1
+    assert 'rel="next"' in first_page.headers["link"]
+
+    cursor = first_page.headers["x-next-cursor"]
+    second_page = client.get("/books/", params={"limit": 1, "after": cursor})
+    assert second_page.status_code == 200
+    assert second_page.json()[0]["id"] > first_page.json()[0]["id"]
+
+    invalid_response = client.get("/books/", params={"after": "not-a-cursor"})
+    assert invalid_response.status_code == 400
+
+    for book_id in book_ids:
+        client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_get_books_filters_and_sort():
+    author_response = client.post("/authors/", json={"full_name": "Agatha Christie"})
+    author_id = author_response.json()["id"]
+
+    books = [
+        ("The Mysterious Affair at Styles", "978-0-00-000001-1", "1920-10-01"),
+        ("Murder on the Orient Express", "978-0-00-000002-2", "1934-01-01"),
+        ("And Then There Were None", "978-0-00-000003-3", "1939-11-06"),
+        ("Curtain", "978-0-00-000004-4", None),
+    ]
+    book_ids = []
+    for title, isbn, published in books:
+        book_response = client.post(
+            "/books/",
+            json={
+                "title": title,
+                "author_id": author_id,
+                "ISBN": isbn,
+                "date_published": published,
+            },
+        )
+        book_ids.append(book_response.json()["id"])
+
+    range_response = client.get(
+        "/books/",
+        params={"author_id": [author_id], "year_from": 1930, "year_to": 1939},
+    )
+    assert range_response.status_code == 200
+    assert [book["id"] for book in range_response.json()] == book_ids[1:3]
+
+    def all_pages(sort):
+        ids, params = [], {"author_id": author_id, "sort": sort, "limit": 1}
+        while True:
+            page = client.get("/books/", params=params)
+            assert page.status_code == 200
+            ids += [book["id"] for book in page.json()]
+            if "x-next-cursor" not in page.headers:
+                return ids
+            params["after"] = page.headers["x-next-cursor"]
+
+    assert all_pages("date_published") == book_ids
+    assert all_pages("-date_published") == [
+        book_ids[3],
+        book_ids[2],
+        book_ids[1],
+        book_ids[0],
+    ]
+    assert all_pages("title") == [book_ids[2], book_ids[3], book_ids[1], book_ids[0]]
+
+    for book_id in book_ids:
+        client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_get_books_date_sort_crosses_nulls():
+    author_response = client.post("/authors/", json={"full_name": "Georges Simenon"})
+    author_id = author_response.json()["id"]
+
+    published = ["1931-02-20", None, "1931-02-20", None, "1933-05-01", None, None]
+    book_ids = []
+    for index, date_published in enumerate(published):
+        book_response = client.post(
+            "/books/",
+            json={
+                "title": f"Maigret {index}",
+                "author_id": author_id,
+                "ISBN": f"978-0-00-000{index:03d}-9",
+                "date_published": date_published,
+            },
+        )
+        book_ids.append(book_response.json()["id"])
+    dated = [book_ids[0], book_ids[2], book_ids[4]]
+    undated = [book_ids[1], book_ids[3], book_ids[5], book_ids[6]]
+
+    def all_pages(sort, limit):
+        ids, params = [], {"author_id": author_id, "sort": sort, "limit": limit}
+        while True:
+            page = client.get("/books/", params=params)
+            assert page.status_code == 200
+            ids += [book["id"] for book in page.json()]
+            if "x-next-cursor" not in page.headers:
+                return ids
+            params["after"] = page.headers["x-next-cursor"]
+
+    # Con 2 y 3 libros por página hay páginas con fechas y NULLs a la vez.
+    for limit in (1, 2, 3):
+        assert all_pages("date_published", limit) == dated + undated
+        assert all_pages("-date_published", limit) == undated[::-1] + dated[::-1]
+
+    for book_id in book_ids:
+        client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
 def test_get_book():
     author_response = client.post("/authors/", json={"full_name": "George Orwell"})
     author_id = author_response.json()["id"]
@@ -132,3 +265,360 @@ def test_search_books():
 
     client.delete(f"/books/{book_id}")
     client.delete(f"/authors/{author_id}")
+
+
+def test_search_books_year_bounds():
+    for year in (0, -3, 9999):
+        response = client.get("/books/search/", params={"year": year})
+        assert response.status_code == 422
+    for year in (1, 9998):
+        response = client.get("/books/search/", params={"year": year})
+        assert response.status_code == 404
+
+
+def test_search_books_ranked():
+    author_response = client.post("/authors/", json={"full_name": "Frank Herbert"})
+    author_id = author_response.json()["id"]
+
+    book_ids = []
+    for title, isbn in [
+        ("Dune", "978-0-441-17271-9"),
+        ("Dune Messiah", "978-0-593-09823-5"),
+    ]:
+        book_response = client.post(
+            "/books/",
+            json={"title": title, "author_id": author_id, "ISBN": isbn},
+        )
+        book_ids.append(book_response.json()["id"])
+
+    title_response = client.get("/books/search/", params={"q": "Dune", "limit": 1})
+    assert title_response.status_code == 200
+    assert [book["id"] for book in title_response.json()] == [book_ids[0]]
+
+    author_response = client.get("/books/search/", params={"q": "Herbert"})
+    assert author_response.status_code == 200
+    assert {book["id"] for book in author_response.json()} == set(book_ids)
+
+    for book_id in book_ids:
+        client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_export_books():
+    author_response = client.post("/authors/", json={"full_name": "Ray Bradbury"})
+    author_id = author_response.json()["id"]
+
+    book_response = client.post(
+        "/books/",
+        json={
+            "title": "Fahrenheit 451",
+            "author_id": author_id,
+            "ISBN": "978-1-4516-7331-9",
+            "date_published": "1953-10-19",
+        },
+    )
+    book_id = book_response.json()["id"]
+
+    ndjson_response = client.get("/books/export")
+    assert ndjson_response.status_code == 200
+    assert ndjson_response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson_response.text.splitlines()]
+    row = next(row for row in rows if row["id"] == book_id)
+    assert row["author_full_name"] == "Ray Bradbury"
+    assert row["date_published"] == "1953-10-19"
+
+    csv_response = client.get("/books/export", params={"format": "csv"})
+    assert csv_response.status_code == 200
+    assert csv_response.text.splitlines()[0].startswith("id,title,author_id")
+    assert "978-1-4516-7331-9" in csv_response.text
+
+    client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_create_books_bulk():
+    author_response = client.post("/authors/", json={"full_name": "Ted Chiang"})
+    author_id = author_response.json()["id"]
+
+    existing_response = client.post(
+        "/books/",
+        json={
+            "title": "Exhalation",
+            "author_id": author_id,
+            "ISBN": "978-1-101-94788-3",
+            "date_published": "2019-05-07",
+        },
+    )
+    existing_id = existing_response.json()["id"]
+
+    response = client.post(
+        "/books/bulk",
+        json=[
+            {
+                "title": "Stories of Your Life",
+                "author_id": author_id,
+                "ISBN": "978-0-7653-0418-7",
+            },
+            {
+                "title": "Exhalation",
+                "author_id": author_id,
+                "ISBN": "978-1-101-94788-3",
+            },
+            {"title": "Orphan", "author_id": -1, "ISBN": "978-0-000-00000-1"},
+            {"title": "Repeated", "author_id": author_id, "ISBN": "978-0-7653-0418-7"},
+        ],
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == [
+        "created",
+        "duplicate_isbn",
+        "unknown_author",
+        "duplicate_isbn",
+    ]
+    created_id = results[0]["id"]
+    assert client.get(f"/books/{created_id}").json()["title"] == "Stories of Your Life"
+
+    client.delete(f"/books/{created_id}")
+    client.delete(f"/books/{existing_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_delete_author_invalidates_cached_books():
+    author_id = client.post("/authors/", json={"full_name": "Stanisław Lem"}).json()[
+        "id"
+    ]
+    book_id = client.post(
+        "/books/",
+        json={"title": "Solaris", "author_id": author_id, "ISBN": "978-0-15-602760-1"},
+    ).json()["id"]
+
+    assert client.get(f"/books/{book_id}").status_code == 200
+    client.delete(f"/authors/{author_id}")
+    assert client.get(f"/books/{book_id}").status_code == 404
+
+
+def test_get_book_does_not_cache_read_overtaken_by_write(monkeypatch):
+    author_id = client.post("/authors/", json={"full_name": "Joseph Conrad"}).json()[
+        "id"
+    ]
+    book_id = client.post(
+        "/books/",
+        json={"title": "Nostromo", "author_id": author_id, "ISBN": "RACE-0001"},
+    ).json()["id"]
+    # Crear no llena la caché: una escritura confirmada justo después quedaría tapada.
+    assert entity_cache.get(book_key(book_id), dict) is None
+
+    # Entre la lectura de la base de datos y el guardado en la caché, otra petición
+    # confirma un cambio e invalida la entrada.
+    set_entry = entity_cache.set
+
+    def set_after_write(key, value, type_, lease=None):
+        with get_engine().begin() as connection:
+            connection.execute(
+                text("UPDATE books SET title = 'Lord Jim' WHERE id = :id"),
+                {"id": book_id},
+            )
+        entity_cache.delete(book_key(book_id))
+        monkeypatch.setattr(entity_cache, "set", set_entry)
+        set_entry(key, value, type_, lease)
+
+    monkeypatch.setattr(entity_cache, "set", set_after_write)
+    assert client.get(f"/books/{book_id}").json()["title"] == "Nostromo"
+    assert client.get(f"/books/{book_id}").json()["title"] == "Lord Jim"
+
+    client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_patch_book():
+    author_id = client.post(
+        "/authors/", json={"full_name": "Clarice Lispector"}
+    ).json()["id"]
+    book = client.post(
+        "/books/",
+        json={"title": "La hora", "author_id": author_id, "ISBN": "PATCH-0001"},
+    ).json()
+
+    response = client.patch(
+        f"/books/{book['id']}", json={"title": "La hora de la estrella"}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "La hora de la estrella"
+    assert response.json()["ISBN"] == "PATCH-0001"
+    assert client.get(f"/books/{book['id']}").json()["title"] == (
+        "La hora de la estrella"
+    )
+
+    assert client.patch(f"/books/{book['id']}", json={"title": None}).status_code == 422
+    assert (
+        client.patch(f"/books/{book['id']}", json={"author_id": 0}).status_code == 404
+    )
+    assert client.patch("/books/0", json={"title": "x"}).status_code == 404
+    assert client.delete("/books/0").status_code == 404
+    assert (
+        client.post(
+            "/books/", json={"title": "x", "author_id": 0, "ISBN": "PATCH-0002"}
+        ).status_code
+        == 404
+    )
+
+    client.delete(f"/books/{book['id']}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_delete_books_bulk():
+    author_id = client.post("/authors/", json={"full_name": "Ray Bradbury"}).json()[
+        "id"
+    ]
+    book_ids = [
+        client.post(
+            "/books/",
+            json={"title": title, "author_id": author_id, "ISBN": isbn},
+        ).json()["id"]
+        for title, isbn in [("Fahrenheit 451", "DEL-0001"), ("Crónicas", "DEL-0002")]
+    ]
+    assert client.get(f"/books/{book_ids[0]}").status_code == 200
+
+    response = client.request(
+        "DELETE", "/books/bulk", json={"ids": [*book_ids, book_ids[-1] + 1000]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"deleted": book_ids}
+    assert client.get(f"/books/{book_ids[0]}").status_code == 404
+
+    response = client.request(
+        "DELETE", "/authors/bulk", json={"ids": [author_id, author_id]}
+    )
+    assert response.json() == {"deleted": [author_id]}
+    assert client.get(f"/authors/{author_id}").status_code == 404
+
+
+def test_delete_author_cascades_to_books_in_database():
+    author_id = client.post("/authors/", json={"full_name": "Ítalo Svevo"}).json()["id"]
+    book_ids = client.post(
+        "/books/bulk",
+        json=[
+            {"title": f"Libro {i}", "author_id": author_id, "ISBN": f"CAS-{i:04d}"}
+            for i in range(50)
+        ],
+    ).json()
+
+    assert client.delete(f"/authors/{author_id}").status_code == 204
+    for result in book_ids[:3]:
+        assert client.get(f"/books/{result['id']}").status_code == 404
+    assert client.request("DELETE", "/authors/bulk", json={"ids": []}).json() == {
+        "deleted": []
+    }
+
+
+def test_conditional_get_book():
+    author_id = client.post("/authors/", json={"full_name": "Mary Shelley"}).json()[
+        "id"
+    ]
+    book_payload = {
+        "title": "Frankenstein",
+        "author_id": author_id,
+        "ISBN": "978-0-486-28211-4",
+        "date_published": "1818-01-01",
+    }
+    book_id = client.post("/books/", json=book_payload).json()["id"]
+
+    response = client.get(f"/books/{book_id}")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    cached = client.get(f"/books/{book_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    since = client.get(
+        f"/books/{book_id}", headers={"If-Modified-Since": last_modified}
+    )
+    assert since.status_code == 304
+
+    client.put(
+        f"/books/{book_id}", json={**book_payload, "title": "Frankenstein (1831)"}
+    )
+    changed = client.get(f"/books/{book_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_conditional_get_books_collection():
+    response = client.get("/books/", params={"limit": 5})
+    etag = response.headers["etag"]
+
+    cached = client.get("/books/", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    other_page = client.get(
+        "/books/", params={"limit": 6}, headers={"If-None-Match": etag}
+    )
+    assert other_page.status_code == 200
+
+    author_id = client.post("/authors/", json={"full_name": "H. G. Wells"}).json()["id"]
+    book_id = client.post(
+        "/books/",
+        json={
+            "title": "The Time Machine",
+            "author_id": author_id,
+            "ISBN": "978-0-00-000005-5",
+        },
+    ).json()["id"]
+
+    changed = client.get(
+        "/books/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+
+    client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
+
+
+def test_collection_version_triggers():
+    author_id = client.post("/authors/", json={"full_name": "H. G. Wells"}).json()["id"]
+    book_ids = [
+        client.post(
+            "/books/",
+            json={"title": title, "author_id": author_id, "ISBN": isbn},
+        ).json()["id"]
+        for title, isbn in [("Kipps", "VER-0001"), ("Tono-Bungay", "VER-0002")]
+    ]
+    version_sql = text("SELECT version FROM collection_versions WHERE name = 'books'")
+    engine = get_engine()
+
+    # Una sentencia que no modifica filas no cambia la versión.
+    with engine.begin() as connection:
+        before = connection.scalar(version_sql)
+        connection.execute(text("UPDATE books SET title = title WHERE id = -1"))
+        connection.execute(text("DELETE FROM books WHERE id = -1"))
+    with engine.connect() as connection:
+        assert connection.scalar(version_sql) == before
+
+    # Dos escrituras concurrentes en conexiones distintas no esperan la misma fila.
+    update_sql = text("UPDATE books SET title = title WHERE id = :id")
+    slot_sql = text("SELECT pg_backend_pid() % 64")
+    first = engine.connect()
+    others = []
+    try:
+        first.execute(update_sql, {"id": book_ids[0]})
+        second = engine.connect()
+        others.append(second)
+        while second.scalar(slot_sql) == first.scalar(slot_sql):
+            second = engine.connect()
+            others.append(second)
+        second.execute(text("SET LOCAL lock_timeout = '2s'"))
+        second.execute(update_sql, {"id": book_ids[1]})
+        second.commit()
+        first.commit()
+    finally:
+        for connection in [first, *others]:
+            connection.close()
+    with engine.connect() as connection:
+        assert connection.scalar(version_sql) == before + 2
+
+    for book_id in book_ids:
+        client.delete(f"/books/{book_id}")
+    client.delete(f"/authors/{author_id}")
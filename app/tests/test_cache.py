@@ -0,0 +1,129 @@
+import time
+from datetime import datetime
+import fakeredis
+import pytest
+from app.cache import (
+    EntityCache,
+    LRUCache,
+    RedisCache,
+    SQLiteCache,
+    author_key,
+    book_key,
+)
+from app.schemas import SchemaBookResponse
+
+
+def test_lru_eviction():
+    cache = LRUCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiration():
+    cache = LRUCache(max_entries=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidation_and_counters():
+    cache = LRUCache(max_entries=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.delete("a", "missing")
+    cache.get("a")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["invalidations"] == 1
+    assert stats["size"] == 0
+
+
+def test_disabled_cache():
+    cache = LRUCache(max_entries=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_backend_shared_between_workers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = EntityCache(SQLiteCache(path, max_entries=10, ttl=60))
+    worker_b = EntityCache(SQLiteCache(path, max_entries=10, ttl=60))
+    book = SchemaBookResponse(
+        id=1,
+        date_created=datetime(2024, 1, 1),
+        title="Ficciones",
+        author_id=1,
+        ISBN="9788420633114",
+    )
+
+    worker_a.set(book_key(1), book, SchemaBookResponse)
+    assert worker_b.get(book_key(1), SchemaBookResponse) == book
+
+    worker_b.delete(book_key(1))
+    assert worker_a.get(book_key(1), SchemaBookResponse) is None
+    assert worker_b.stats()["invalidations"] == 1
+
+
+def test_sqlite_backend_prune(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=2, ttl=60)
+    for key in "abc":
+        cache.set(key, b"1")
+    cache.prune()
+
+    assert cache.get("a") is None
+    assert cache.get("c") == b"1"
+    assert cache.stats()["size"] == 2
+
+
+def test_redis_backend_shared_between_workers():
+    server = fakeredis.FakeServer()
+    worker_a = EntityCache(RedisCache(fakeredis.FakeRedis(server=server), ttl=60))
+    worker_b = EntityCache(RedisCache(fakeredis.FakeRedis(server=server), ttl=60))
+
+    worker_a.set(author_key(1), {"id": 1}, dict)
+    assert worker_b.get(author_key(1), dict) == {"id": 1}
+
+    worker_b.delete(author_key(1))
+    assert worker_a.get(author_key(1), dict) is None
+    assert worker_a.stats()["hits"] == 0
+    assert worker_b.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite", "redis"])
+def test_lease_rejects_set_after_invalidation(backend, tmp_path):
+    if backend == "memory":
+        reader = writer = EntityCache(LRUCache(max_entries=10, ttl=60))
+    elif backend == "sqlite":
+        path = str(tmp_path / "cache.sqlite3")
+        reader = EntityCache(SQLiteCache(path, max_entries=10, ttl=60))
+        writer = EntityCache(SQLiteCache(path, max_entries=10, ttl=60))
+    else:
+        server = fakeredis.FakeServer()
+        reader = EntityCache(RedisCache(fakeredis.FakeRedis(server=server), ttl=60))
+        writer = EntityCache(RedisCache(fakeredis.FakeRedis(server=server), ttl=60))
+
+    # El lector pide el lease y lee el valor; el escritor confirma e invalida antes
+    # de que el lector lo guarde.
+    lease = reader.lease(author_key(1))
+    writer.delete(author_key(1))
+    reader.set(author_key(1), {"full_name": "anterior"}, dict, lease)
+    assert writer.get(author_key(1), dict) is None
+
+    # Sin invalidaciones de por medio, el lease permite guardar una sola vez.
+    lease = reader.lease(author_key(1))
+    reader.set(author_key(1), {"full_name": "actual"}, dict, lease)
+    assert writer.get(author_key(1), dict) == {"full_name": "actual"}
+    writer.delete(author_key(1))
+    reader.set(author_key(1), {"full_name": "anterior"}, dict, lease)
+    assert writer.get(author_key(1), dict) is None
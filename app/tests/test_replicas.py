@@ -0,0 +1,136 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.engine import make_url
+from app.main import app
+from app.database import get_replica_set
+from app.models import Author
+from app.snapshot import snapshot_tables
+
+REPLICA_DATABASE = "biblioteca_replica_test"
+REPLICA_SHIM = """
+    CREATE SCHEMA replica_shim;
+    CREATE TABLE replica_shim.state (in_recovery boolean, receiver_status text);
+    INSERT INTO replica_shim.state VALUES (true, 'streaming');
+    CREATE FUNCTION replica_shim.pg_is_in_recovery() RETURNS boolean
+        AS 'SELECT in_recovery FROM replica_shim.state' LANGUAGE sql;
+    CREATE VIEW replica_shim.pg_stat_wal_receiver AS
+        SELECT receiver_status AS status FROM replica_shim.state
+        WHERE receiver_status IS NOT NULL;
+"""
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def replica():
+    # Una segunda base de datos local hace de réplica: tiene las mismas tablas pero
+    # datos distintos, de modo que se puede ver desde dónde se leyó.
+    url = make_url(os.getenv("DATABASE_URL"))
+    admin = create_engine(url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {REPLICA_DATABASE}"))
+        connection.execute(
+            text(
+                f"CREATE DATABASE {REPLICA_DATABASE} "
+                "ENCODING 'UTF8' TEMPLATE template0"
+            )
+        )
+        # La base de datos local no está en recuperación: pg_is_in_recovery y
+        # pg_stat_wal_receiver se reemplazan, en un esquema que precede a pg_catalog en
+        # el search_path, por su estado en replica_shim.state.
+        connection.execute(
+            text(
+                f"ALTER DATABASE {REPLICA_DATABASE} "
+                "SET search_path = public, replica_shim, pg_catalog"
+            )
+        )
+    engine = create_engine(url.set(database=REPLICA_DATABASE))
+    with engine.begin() as connection:
+        connection.execute(text(REPLICA_SHIM))
+        for table in snapshot_tables():
+            table.create(connection)
+        connection.execute(
+            insert(Author.__table__).values(id=900001, full_name="Solo en la réplica")
+        )
+        connection.execute(
+            text("INSERT INTO collection_versions (name) VALUES ('authors'), ('books')")
+        )
+
+    replica_set = get_replica_set()
+    replica = replica_set.add(engine)
+    replica_set.check()
+    yield replica
+
+    replica_set.replicas.remove(replica)
+    engine.dispose()
+    with admin.connect() as connection:
+        connection.execute(text(f"DROP DATABASE {REPLICA_DATABASE}"))
+    admin.dispose()
+
+
+def test_reads_go_to_replica(replica):
+    reader = TestClient(app)
+    assert reader.get("/authors/900001").json()["full_name"] == "Solo en la réplica"
+    assert (
+        reader.get("/authors/900001", headers={"X-Read-Primary": "1"}).status_code
+        == 404
+    )
+
+    # Después de escribir, el cliente lee del primario (read-your-writes).
+    response = reader.post("/authors/", json={"full_name": "Recién escrito"})
+    assert response.status_code == 201
+    assert "read_primary=1" in response.headers["set-cookie"]
+    author_id = response.json()["id"]
+    assert reader.get(f"/authors/{author_id}").status_code == 200
+    assert reader.get("/authors/900001").status_code == 404
+
+    # Una réplica atrasada no se usa: la lectura vuelve al primario.
+    replica.lag = 3600.0
+    assert client.get("/authors/900001").status_code == 404
+    get_replica_set().check()
+    assert client.get("/authors/900001").status_code == 200
+
+    status = client.get("/admin/pool").json()["replicas"][0]
+    assert status["available"] is True
+    assert status["checkouts"] >= 0
+
+    client.delete(f"/authors/{author_id}")
+
+
+def test_replica_not_streaming_falls_back_to_primary(replica):
+    def set_state(in_recovery, receiver_status):
+        with replica.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "UPDATE replica_shim.state "
+                    "SET in_recovery = :recovery, receiver_status = :status"
+                ),
+                {"recovery": in_recovery, "status": receiver_status},
+            )
+        get_replica_set().check()
+
+    # Un cliente sin la cookie read_primary de las escrituras de otras pruebas.
+    reader = TestClient(app)
+    assert reader.get("/authors/900001").status_code == 200
+
+    # El WAL receiver se detuvo: la réplica aplicó todo lo que recibió, pero ya no
+    # recibe nada del primario.
+    set_state(True, None)
+    assert replica.lag == float("inf")
+    assert reader.get("/authors/900001").status_code == 404
+    status = reader.get("/admin/pool").json()["replicas"][0]
+    assert status["available"] is False
+
+    set_state(True, "waiting")
+    assert reader.get("/authors/900001").status_code == 404
+
+    # Una URL de réplica que apunta a un servidor fuera de recuperación (un primario o
+    # una réplica promovida) tampoco se usa.
+    set_state(False, "streaming")
+    assert reader.get("/authors/900001").status_code == 404
+
+    set_state(True, "streaming")
+    assert replica.lag == 0
+    assert reader.get("/authors/900001").status_code == 200
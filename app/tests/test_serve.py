@@ -0,0 +1,19 @@
+import pytest
+from app.serve import split_connection_budget
+
+
+def test_split_connection_budget():
+    # El pool configurado cabe: no cambia.
+    assert split_connection_budget(90, 4, 5, 10) == (4, 5, 10)
+    # No cabe: se reduce primero el overflow y luego el pool.
+    assert split_connection_budget(90, 8, 5, 10) == (8, 5, 6)
+    assert split_connection_budget(20, 8, 5, 10) == (8, 2, 0)
+    # En el modo asíncrono cada worker tiene dos pools.
+    assert split_connection_budget(90, 4, 5, 10, engines=2) == (4, 5, 6)
+    # Menos conexiones que workers: se reducen los workers.
+    workers, pool_size, max_overflow = split_connection_budget(3, 8, 5, 10)
+    assert (workers, pool_size, max_overflow) == (3, 1, 0)
+    assert workers * (pool_size + max_overflow) <= 3
+
+    with pytest.raises(ValueError):
+        split_connection_budget(0, 4, 5, 10)
@@ -0,0 +1,81 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.main import app
+from app.database import get_engine
+from app.snapshot import Snapshot, export_snapshot
+from app.snapshot_endpoints import get_snapshot_session, router
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def snapshot_client(tmp_path):
+    path = str(tmp_path / "catalog.sqlite3")
+    snapshot = Snapshot(path, check_interval=0)
+
+    def snapshot_session():
+        with Session(snapshot.engine()) as session:
+            yield session
+
+    snapshot_app = FastAPI()
+    snapshot_app.include_router(router)
+    snapshot_app.dependency_overrides[get_snapshot_session] = snapshot_session
+    yield path, TestClient(snapshot_app)
+    snapshot.engine().dispose()
+
+
+def test_snapshot_reads(snapshot_client):
+    path, snapshot_client = snapshot_client
+    author_id = client.post("/authors/", json={"full_name": "Ana María Matute"}).json()[
+        "id"
+    ]
+    book_ids = [
+        client.post(
+            "/books/",
+            json={
+                "title": title,
+                "author_id": author_id,
+                "ISBN": isbn,
+                "date_published": published,
+            },
+        ).json()["id"]
+        for title, isbn, published in (
+            ("Primera memoria", "978-84-233-0000-1", "1960-01-01"),
+            ("Olvidado rey Gudú", "978-84-233-0000-2", None),
+        )
+    ]
+
+    export_snapshot(get_engine(), path)
+
+    for url in (
+        f"/books/{book_ids[0]}",
+        f"/authors/{author_id}",
+        f"/authors/{author_id}?include=books,book_count",
+        f"/books/?author_id={author_id}&sort=-date_published",
+        "/books/search/?author_name=matute",
+    ):
+        expected = client.get(url)
+        response = snapshot_client.get(url)
+        assert response.status_code == 200
+        assert response.json() == expected.json()
+        assert response.headers.get("etag") == expected.headers.get("etag")
+
+    # Paginación por fecha con NULLs, igual que en PostgreSQL.
+    page = snapshot_client.get(
+        f"/books/?author_id={author_id}&sort=date_published&limit=1"
+    )
+    assert page.json()[0]["id"] == book_ids[0]
+    after = page.headers["x-next-cursor"]
+    page = snapshot_client.get(
+        f"/books/?author_id={author_id}&sort=date_published&limit=1&after={after}"
+    )
+    assert page.json()[0]["id"] == book_ids[1]
+
+    # Las escrituras no se ven hasta publicar un snapshot nuevo.
+    client.delete(f"/authors/{author_id}")
+    assert snapshot_client.get(f"/books/{book_ids[0]}").status_code == 200
+    export_snapshot(get_engine(), path)
+    assert snapshot_client.get(f"/books/{book_ids[0]}").status_code == 404
+    assert snapshot_client.get(f"/authors/{author_id}").status_code == 404
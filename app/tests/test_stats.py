@@ -0,0 +1,119 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.database import get_engine
+
+client = TestClient(app)
+
+
+def books_by_year(year: int) -> int:
+    response = client.get(f"/stats/books-by-year?year_from={year}&year_to={year}")
+    assert response.status_code == 200
+    return sum(row["book_count"] for row in response.json())
+
+
+def test_stats_follow_book_writes():
+    author_id = client.post("/authors/", json={"full_name": "Elena Garro"}).json()["id"]
+    before = {year: books_by_year(year) for year in (1963, 1964)}
+
+    book_ids = [
+        result["id"]
+        for result in client.post(
+            "/books/bulk",
+            json=[
+                {
+                    "title": title,
+                    "author_id": author_id,
+                    "ISBN": isbn,
+                    "date_published": published,
+                }
+                for title, isbn, published in (
+                    ("Los recuerdos del porvenir", "978-968-16-0001-1", "1963-01-01"),
+                    ("La semana de colores", "978-968-16-0001-2", "1964-01-01"),
+                    ("Andamos huyendo Lola", "978-968-16-0001-3", None),
+                )
+            ],
+        ).json()
+    ]
+    assert books_by_year(1963) == before[1963] + 1
+    assert books_by_year(1964) == before[1964] + 1
+
+    newest = client.get("/stats/newest-books?limit=3").json()
+    assert [book["id"] for book in newest] == book_ids[::-1]
+
+    top = client.get("/stats/books-by-author?limit=1000").json()
+    assert {"author_id": author_id, "full_name": "Elena Garro", "book_count": 3} in top
+    counts = [row["book_count"] for row in top]
+    assert counts == sorted(counts, reverse=True)
+
+    # Cambiar el año mueve el libro de grupo; cambiar solo el título no cambia nada.
+    client.patch(f"/books/{book_ids[1]}", json={"date_published": "1963-06-01"})
+    client.patch(f"/books/{book_ids[0]}", json={"title": "Los recuerdos"})
+    assert books_by_year(1963) == before[1963] + 2
+    assert books_by_year(1964) == before[1964]
+
+    # El borrado en cascada del autor descuenta sus libros.
+    client.delete(f"/authors/{author_id}")
+    assert books_by_year(1963) == before[1963]
+    top = client.get("/stats/books-by-author?limit=1000").json()
+    assert author_id not in [row["author_id"] for row in top]
+
+
+def test_concurrent_book_writes_do_not_wait_on_counts():
+    author_id = client.post("/authors/", json={"full_name": "Juan Rulfo"}).json()["id"]
+    before = books_by_year(1955)
+    insert_sql = text("""
+        INSERT INTO books (title, author_id, "ISBN", date_published)
+        VALUES (:title, :author_id, :isbn, '1955-03-19')
+    """)
+    slot_sql = text("SELECT pg_backend_pid() % 64")
+    engine = get_engine()
+
+    # Dos transacciones abiertas agregan libros del mismo año y autor: cada una suma en
+    # la fila de su conexión, por lo que la segunda no espera a que la primera termine.
+    first = engine.connect()
+    others = []
+    try:
+        first.execute(
+            insert_sql,
+            {"title": "Pedro Páramo", "author_id": author_id, "isbn": "CNT-1"},
+        )
+        second = engine.connect()
+        others.append(second)
+        while second.scalar(slot_sql) == first.scalar(slot_sql):
+            second = engine.connect()
+            others.append(second)
+        second.execute(text("SET LOCAL lock_timeout = '2s'"))
+        second.execute(
+            insert_sql,
+            {"title": "El llano en llamas", "author_id": author_id, "isbn": "CNT-2"},
+        )
+        second.commit()
+        first.commit()
+    finally:
+        for connection in [first, *others]:
+            connection.close()
+
+    assert books_by_year(1955) == before + 2
+    top = client.get("/stats/books-by-author?limit=1000").json()
+    assert {"author_id": author_id, "full_name": "Juan Rulfo", "book_count": 2} in top
+
+    client.delete(f"/authors/{author_id}")
+    assert books_by_year(1955) == before
+
+
+def test_stats_match_books():
+    with get_engine().connect() as connection:
+        expected = connection.execute(text("""
+            SELECT EXTRACT(YEAR FROM date_published)::integer, count(*)
+            FROM books WHERE date_published IS NOT NULL
+            GROUP BY 1 ORDER BY 1
+        """)).all()
+    response = client.get("/stats/books-by-year")
+    assert [(row["year"], row["book_count"]) for row in response.json()] == [
+        tuple(row) for row in expected
+    ]
+
+    etag = response.headers["etag"]
+    cached = client.get("/stats/books-by-year", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
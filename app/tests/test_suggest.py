@@ -0,0 +1,96 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.database import get_engine
+from app.suggest import PrefixIndex, author_index, normalize
+
+client = TestClient(app)
+
+
+def suggested(prefix: str) -> list[str]:
+    response = client.get(f"/authors/suggest?prefix={prefix}&limit=50")
+    assert response.status_code == 200
+    return [author["full_name"] for author in response.json()]
+
+
+def test_prefix_index():
+    assert normalize("  José   Saramago ") == "jose saramago"
+    assert normalize("ÅSA LARSSON") == "asa larsson"
+
+    index = PrefixIndex()
+    index.add(1, "José Saramago")
+    index.add(2, "José Donoso")
+    index.add(3, "Josefina Vicens")
+    assert [a["id"] for a in index.suggest("jose")] == [2, 1, 3]
+    assert [a["id"] for a in index.suggest("JOSÉ S")] == [1]
+    assert [a["id"] for a in index.suggest("sara")] == [1]
+    assert index.suggest("jose", limit=1) == [{"id": 2, "full_name": "José Donoso"}]
+    assert index.suggest("  ") == []
+
+    index.add(1, "Pilar del Río")
+    index.remove(2, 99)
+    assert [a["id"] for a in index.suggest("jose")] == [3]
+    assert [a["id"] for a in index.suggest("rio")] == [1]
+    assert index.suggest("sara") == []
+
+
+def test_suggest_follows_author_writes():
+    author_id = client.post(
+        "/authors/", json={"full_name": "Ángeles Mastretta"}
+    ).json()["id"]
+    assert "Ángeles Mastretta" in suggested("angeles")
+    assert "Ángeles Mastretta" in suggested("mastre")
+
+    client.put(f"/authors/{author_id}", json={"full_name": "Ángeles Mastretta Guzmán"})
+    assert "Ángeles Mastretta Guzmán" in suggested("guzm")
+    assert "Ángeles Mastretta" not in suggested("angeles")
+
+    bulk = client.post(
+        "/authors/bulk",
+        json=[{"full_name": "Rosario Castellanos"}, {"full_name": "Rosa Chacel"}],
+    ).json()
+    assert {"Rosario Castellanos", "Rosa Chacel"} <= set(suggested("ros"))
+
+    client.request(
+        "DELETE",
+        "/authors/bulk",
+        json={"ids": [author_id, *(author["id"] for author in bulk)]},
+    )
+    assert not {"Rosario Castellanos", "Rosa Chacel"} & set(suggested("ros"))
+    assert "Ángeles Mastretta Guzmán" not in suggested("angeles")
+
+    # La ruta no se confunde con /authors/{author_id}.
+    assert client.get("/authors/suggest?prefix=").json() == []
+
+
+def test_refresh_skips_own_writes():
+    engine = get_engine()
+    author_index.ensure_loaded(engine)
+    author_index.refresh(engine)
+    reloads = author_index.reloads
+
+    # Las escrituras de este worker ya están en el índice: no se reconstruye.
+    author_id = client.post(
+        "/authors/", json={"full_name": "Lygia Fagundes Telles"}
+    ).json()["id"]
+    client.patch(
+        f"/authors/{author_id}", json={"full_name": "Lygia Fagundes Telles H."}
+    )
+    client.patch(f"/authors/{author_id + 100000}", json={"full_name": "Nadie"})
+    assert author_index.refresh(engine) is False
+    assert author_index.reloads == reloads
+    assert "Lygia Fagundes Telles H." in suggested("fagund")
+
+    # La escritura de otro worker sí reconstruye el índice.
+    with engine.begin() as connection:
+        other_id = connection.scalar(
+            text("INSERT INTO authors (full_name) VALUES ('Hilda Hilst') RETURNING id")
+        )
+    assert "Hilda Hilst" not in suggested("hilst")
+    assert author_index.refresh(engine) is True
+    assert author_index.reloads == reloads + 1
+    assert "Hilda Hilst" in suggested("hilst")
+
+    client.request("DELETE", "/authors/bulk", json={"ids": [author_id, other_id]})
+    assert author_index.refresh(engine) is False
+    assert not suggested("hilst")
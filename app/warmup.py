@@ -0,0 +1,177 @@
+"""
+Calentamiento del worker antes de aceptar tráfico.
+
+Lo ejecuta el lifespan de la aplicación (ver app.main.create_app): uvicorn no abre el
+socket hasta que termina, por lo que las primeras peticiones después de un despliegue
+no pagan la creación del engine, la apertura de conexiones (y la inicialización del
+dialecto en la primera), la configuración de los mappers ni la generación del esquema
+OpenAPI.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers
+from app.database import (
+    DB_MODE_ASYNC,
+    get_async_engine,
+    get_db_mode,
+    get_engine,
+    get_pool_options,
+    get_replica_set,
+)
+from app.schemas import (
+    SchemaAuthorDetailResponse,
+    SchemaAuthorResponse,
+    SchemaBookResponse,
+)
+from app.serialization import _list_adapter
+from app.snapshot import READ_MODE_SNAPSHOT, get_read_mode, snapshot
+
+logger = logging.getLogger("app.warmup")
+
+
+def warmup_enabled() -> bool:
+    """Indica si el calentamiento está activo (APP_WARMUP, true por defecto)."""
+    return os.getenv("APP_WARMUP", "true").lower() in ("1", "true", "yes")
+
+
+def get_warmup_connections() -> int:
+    """
+    Obtiene el número de conexiones que se abren por pool al iniciar el worker
+    (DB_POOL_WARMUP). Por defecto se llena el pool (DB_POOL_SIZE); nunca se abren más
+    conexiones que las que el pool conserva.
+
+    Returns:
+        int: Conexiones a abrir por pool.
+    """
+    pool_size = get_pool_options()["pool_size"]
+    return max(0, min(int(os.getenv("DB_POOL_WARMUP", str(pool_size))), pool_size))
+
+
+def open_connections(engine: Engine, count: int) -> int:
+    """
+    Abre `count` conexiones a la vez en el pool de `engine` y las devuelve al pool, que
+    las conserva abiertas para las primeras peticiones.
+
+    Args:
+        engine (Engine): Engine cuyo pool se llena.
+        count (int): Conexiones a abrir.
+
+    Returns:
+        int: Conexiones libres en el pool después del calentamiento.
+    """
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+    return engine.pool.checkedin()
+
+
+async def open_async_connections(count: int) -> int:
+    """
+    Versión de open_connections para el engine asíncrono: las conexiones se abren de
+    forma concurrente en el event loop del worker, al que queda ligado el pool.
+
+    Args:
+        count (int): Conexiones a abrir.
+
+    Returns:
+        int: Conexiones libres en el pool después del calentamiento.
+    """
+    engine = get_async_engine()
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for connection in opened:
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            await connection.close()
+    return engine.sync_engine.pool.checkedin()
+
+
+def _warm_up_sync(app: FastAPI, connections: int) -> dict:
+    timings = {}
+
+    start = time.perf_counter()
+    configure_mappers()
+    timings["mappers"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app.openapi()
+    for schema in (
+        SchemaAuthorResponse,
+        SchemaAuthorDetailResponse,
+        SchemaBookResponse,
+    ):
+        _list_adapter(schema)
+    timings["schemas"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if get_db_mode() != DB_MODE_ASYNC:
+        open_connections(get_engine(), connections)
+        for replica in get_replica_set().replicas:
+            try:
+                open_connections(replica.engine, connections)
+            except Exception as e:
+                # Una réplica caída no impide iniciar: el monitoreo la descarta.
+                logger.warning("Replica %s not warmed up: %s", replica.name, e)
+    if get_read_mode() == READ_MODE_SNAPSHOT:
+        try:
+            open_connections(snapshot.engine(), connections)
+        except HTTPException:
+            logger.warning("Snapshot %s not available yet", snapshot.path)
+    timings["connections"] = time.perf_counter() - start
+    return timings
+
+
+async def warm_up(app: FastAPI) -> dict:
+    """
+    Calienta el worker: configura los mappers de SQLAlchemy, genera el esquema OpenAPI
+    y los serializadores de los listados, y abre DB_POOL_WARMUP conexiones en cada pool
+    que usará el modo configurado (primario, réplicas, engine asíncrono o snapshot).
+    Las partes síncronas se ejecutan en el threadpool para no bloquear el event loop.
+
+    Args:
+        app (FastAPI): Aplicación a calentar.
+
+    Returns:
+        dict: Duración en segundos de cada etapa y el total.
+
+    Raises:
+        Exception: Si no se puede conectar a la base de datos principal; el worker no
+            debe aceptar tráfico en ese caso.
+    """
+    start = time.perf_counter()
+    connections = get_warmup_connections()
+    timings = await run_in_threadpool(_warm_up_sync, app, connections)
+    if get_db_mode() == DB_MODE_ASYNC:
+        async_start = time.perf_counter()
+        await open_async_connections(connections)
+        timings["connections"] += time.perf_counter() - async_start
+    timings["total"] = time.perf_counter() - start
+    logger.info(
+        "Warm-up completed in %.1f ms (%d connections per pool): %s",
+        timings["total"] * 1000,
+        connections,
+        ", ".join(
+            f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings.items()
+        ),
+    )
+    return timings
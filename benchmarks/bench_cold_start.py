@@ -0,0 +1,203 @@
+"""
+Benchmark del arranque en frío de un worker.
+
+Mide, en procesos nuevos:
+- el tiempo de importación de app.main (mediana de varias ejecuciones y, con
+  --importtime, los módulos que más tardan según `python -X importtime`);
+- el tiempo hasta que uvicorn acepta conexiones (incluye el lifespan de la aplicación);
+- la latencia de la primera petición a cada endpoint comparada con la del estado
+  estable (mediana de las siguientes),
+con y sin el calentamiento del lifespan (APP_WARMUP), para detectar los picos de
+latencia de un reinicio escalonado. Necesita la base de datos de DATABASE_URL.
+
+Uso:
+    python -m benchmarks.bench_cold_start --runs 5 --requests 20
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PATHS = (
+    "/authors/?limit=20",
+    "/books/?limit=20",
+    "/books/?sort=-date_published&limit=20",
+    "/books/search/?year=2000",
+    "/admin/pool",
+    "/openapi.json",
+)
+IMPORT_SCRIPT = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _run_python(args: list[str], env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure_import(runs: int, env: dict) -> list[float]:
+    """Segundos que tarda `import app.main` en cada uno de `runs` procesos nuevos."""
+    return [
+        float(_run_python(["-c", IMPORT_SCRIPT], env).stdout.strip())
+        for _ in range(runs)
+    ]
+
+
+def slowest_imports(env: dict, top: int = 10) -> list[tuple[float, str]]:
+    """
+    Módulos con mayor tiempo acumulado de importación según `python -X importtime`.
+
+    Returns:
+        list[tuple[float, str]]: Segundos acumulados y nombre del módulo.
+    """
+    stderr = _run_python(["-X", "importtime", "-c", "import app.main"], env).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_listening(process: subprocess.Popen, port: int, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError(f"uvicorn did not listen on port {port} in {timeout} s")
+
+
+def measure_cold_start(
+    paths: list[str], requests: int, warmup: bool, env: dict, timeout: float
+) -> dict:
+    """
+    Inicia un worker de uvicorn y mide el tiempo hasta que acepta conexiones y la
+    latencia de la primera petición a cada ruta frente a la mediana de las siguientes.
+    uvicorn ejecuta el lifespan antes de abrir el socket, por lo que el calentamiento
+    cuenta en el tiempo de arranque y no en las peticiones.
+
+    Args:
+        paths (list[str]): Rutas a consultar, en orden.
+        requests (int): Peticiones por ruta para el estado estable.
+        warmup (bool): Valor de APP_WARMUP para el worker.
+        env (dict): Entorno del proceso.
+        timeout (float): Segundos máximos de espera del arranque.
+
+    Returns:
+        dict: Segundos hasta aceptar conexiones y latencias (ms) por ruta.
+    """
+    port = _free_port()
+    env = {**env, "APP_WARMUP": "true" if warmup else "false"}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        _wait_until_listening(process, port, timeout)
+        ready = time.perf_counter() - start
+        results = {}
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            for path in paths:
+                latencies = []
+                for _ in range(requests + 1):
+                    request_start = time.perf_counter()
+                    response = client.get(path)
+                    latencies.append((time.perf_counter() - request_start) * 1000)
+                    # Una búsqueda sin resultados (404) también es una medición válida.
+                    if response.is_server_error:
+                        response.raise_for_status()
+                results[path] = {
+                    "first_ms": latencies[0],
+                    "steady_ms": statistics.median(latencies[1:]),
+                }
+        return {"ready_s": ready, "paths": results}
+    finally:
+        process.terminate()
+        process.wait(timeout=timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--importtime", action="store_true")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+    env = dict(os.environ)
+
+    imports = measure_import(args.runs, env)
+    print(
+        f"import app.main: mediana {statistics.median(imports) * 1000:.0f} ms, "
+        f"mínimo {min(imports) * 1000:.0f} ms ({args.runs} procesos)"
+    )
+    if args.importtime:
+        for seconds, name in slowest_imports(env):
+            print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    paths = args.paths or list(DEFAULT_PATHS)
+    runs = {
+        warmup: [
+            measure_cold_start(paths, args.requests, warmup, env, args.timeout)
+            for _ in range(args.runs)
+        ]
+        for warmup in (False, True)
+    }
+    print()
+    print(f"{'':40} {'sin calentamiento':>24} {'con calentamiento':>24}")
+    print(f"{'':40} {'primera':>11} {'estable':>12} {'primera':>11} {'estable':>12}")
+    ready = [statistics.median(r["ready_s"] for r in runs[w]) for w in (False, True)]
+    print(f"{'arranque (s)':40} {ready[0]:>11.2f} {'':>12} {ready[1]:>11.2f}")
+    for path in paths:
+        columns = []
+        for warmup in (False, True):
+            for key in ("first_ms", "steady_ms"):
+                columns.append(
+                    statistics.median(r["paths"][path][key] for r in runs[warmup])
+                )
+        print(
+            f"{path[:40]:40} {columns[0]:>9.1f}ms {columns[1]:>10.1f}ms "
+            f"{columns[2]:>9.1f}ms {columns[3]:>10.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
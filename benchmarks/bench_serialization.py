@@ -0,0 +1,83 @@
+"""
+Micro-benchmark de la serialización de listados de libros.
+
+Compara el camino por defecto de FastAPI (validar contra response_model y pasar el
+resultado por jsonable_encoder + json.dumps) con app.serialization.dump_list_json, que
+valida una vez y serializa con pydantic-core. No necesita base de datos: las filas son
+objetos Book transitorios.
+
+Uso:
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from app.models import Book
+from app.schemas import SchemaBookResponse
+from app.serialization import dump_list_json
+
+
+def make_books(rows: int) -> list[Book]:
+    now = datetime.now()
+    return [
+        Book(
+            id=i,
+            date_created=now,
+            updated_at=now,
+            title=f"Libro número {i}",
+            author_id=i % 500 + 1,
+            ISBN=f"978{i:010d}",
+            date_published=date(1900 + i % 120, 1 + i % 12, 1 + i % 28),
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+def fastapi_default(books: list[Book]) -> bytes:
+    field = create_model_field(
+        name="response", type_=list[SchemaBookResponse], mode="serialization"
+    )
+    content = asyncio.run(serialize_response(field=field, response_content=books))
+    # JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_path(books: list[Book]) -> bytes:
+    return dump_list_json(books, SchemaBookResponse)
+
+
+def measure(function, books: list[Book], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(books)
+        best = min(best, time.perf_counter() - start)
+    return len(books) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    books = make_books(args.rows)
+    assert json.loads(fastapi_default(books)) == json.loads(fast_path(books))
+
+    default_rate = measure(fastapi_default, books, args.repeat)
+    fast_rate = measure(fast_path, books, args.repeat)
+    print(f"filas: {args.rows}, mejor de {args.repeat}")
+    print(f"fastapi (response_model): {default_rate:12,.0f} filas/s")
+    print(f"dump_list_json:           {fast_rate:12,.0f} filas/s")
+    print(f"mejora:                   {fast_rate / default_rate:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,622 @@
+"""
+Benchmark de carga de la API con concurrencia fija.
+
+Recorre cada endpoint de app/main.py en una fase propia: N clientes envían peticiones
+una tras otra (lazo cerrado) durante --duration segundos, y se reporta el throughput y
+la latencia p50/p95/p99 por endpoint. Las escrituras crean sus propios autores y libros
+(con un prefijo único por corrida) y los eliminan en las fases de DELETE, por lo que el
+catálogo sembrado con benchmarks.seed queda igual.
+
+Los resultados se guardan en JSON; con --baseline se comparan contra una corrida
+anterior y el proceso termina con código 1 si algún endpoint empeoró más que
+--threshold.
+
+Uso:
+    python -m benchmarks.load --base-url http://localhost:8000 --concurrency 16 \\
+        --duration 10 --output results.json
+    python -m benchmarks.load --in-process --baseline results.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+import httpx
+
+
+@dataclass
+class Context:
+    """Estado compartido por las fases: IDs del catálogo y entidades creadas."""
+
+    run: str
+    rng: random.Random
+    author_ids: list[int] = field(default_factory=list)
+    book_ids: list[int] = field(default_factory=list)
+    author_names: list[str] = field(default_factory=list)
+    created: dict[str, deque] = field(default_factory=dict)
+    sequence: itertools.count = field(default_factory=itertools.count)
+
+    def pool(self, name: str) -> deque:
+        return self.created.setdefault(name, deque())
+
+    def unique(self) -> str:
+        return f"{self.run}-{next(self.sequence)}"
+
+
+@dataclass
+class Scenario:
+    """
+    Una fase del benchmark. `request` devuelve (método, URL, cuerpo JSON) o None si la
+    fase no tiene más trabajo (por ejemplo, no quedan entidades por eliminar);
+    `on_response` procesa la respuesta (por ejemplo, guarda el ID creado).
+    """
+
+    name: str
+    request: Callable[[Context], tuple | None]
+    on_response: Callable[[Context, httpx.Response], None] | None = None
+    # Las escrituras se limitan a un número de peticiones, además de la duración.
+    max_requests: int | None = None
+
+
+def _remember(pool: str, key: str = "id"):
+    def on_response(ctx: Context, response: httpx.Response):
+        if response.is_success:
+            body = response.json()
+            items = body if isinstance(body, list) else [body]
+            ctx.pool(pool).extend(item[key] for item in items)
+
+    return on_response
+
+
+def _take(pool: str, count: int = 1) -> Callable[[Context], list | None]:
+    def take(ctx: Context) -> list | None:
+        items = ctx.pool(pool)
+        if not items:
+            return None
+        return [items.popleft() for _ in range(min(count, len(items)))]
+
+    return take
+
+
+def _cycle(pool: str) -> Callable[[Context], int | None]:
+    def pick(ctx: Context) -> int | None:
+        items = ctx.pool(pool)
+        if not items:
+            return None
+        items.rotate(-1)
+        return items[0]
+
+    return pick
+
+
+def _new_book(ctx: Context) -> dict:
+    unique = ctx.unique()
+    return {
+        "title": f"Libro de benchmark {unique}",
+        "author_id": ctx.rng.choice(ctx.author_ids),
+        "ISBN": f"bench-{unique}",
+        "date_published": f"{ctx.rng.randint(1850, 2024)}-01-01",
+    }
+
+
+def _author_word(ctx: Context) -> str:
+    # Una palabra del nombre de un autor del catálogo (sin el número que agrega
+    # benchmarks.seed para que los nombres sean únicos).
+    words = [
+        word for word in ctx.rng.choice(ctx.author_names).split() if not word.isdigit()
+    ]
+    return ctx.rng.choice(words)
+
+
+def _with(pick, build):
+    def request(ctx: Context):
+        value = pick(ctx)
+        return None if value is None else build(ctx, value)
+
+    return request
+
+
+def build_scenarios(write_requests: int, bulk_size: int) -> list[Scenario]:
+    """
+    Fases del benchmark, en orden de ejecución: lecturas, escrituras (crear, actualizar
+    y eliminar lo creado) y endpoints de administración.
+
+    Args:
+        write_requests (int): Máximo de peticiones de cada fase de escritura.
+        bulk_size (int): Elementos por petición de los endpoints en lote.
+
+    Returns:
+        list[Scenario]: Fases del benchmark.
+    """
+    take_created_authors = _take("authors")
+    take_created_books = _take("books")
+    return [
+        # Lecturas
+        Scenario("GET /authors/", lambda ctx: ("GET", "/authors/?limit=100", None)),
+        Scenario(
+            "GET /authors/?include=book_count",
+            lambda ctx: ("GET", "/authors/?limit=100&include=book_count", None),
+        ),
+        Scenario(
+            "GET /authors/{author_id}",
+            lambda ctx: ("GET", f"/authors/{ctx.rng.choice(ctx.author_ids)}", None),
+        ),
+        Scenario(
+            "GET /authors/{author_id}?include=books",
+            lambda ctx: (
+                "GET",
+                f"/authors/{ctx.rng.choice(ctx.author_ids)}?include=books",
+                None,
+            ),
+        ),
+        Scenario("GET /books/", lambda ctx: ("GET", "/books/?limit=100", None)),
+        Scenario(
+            "GET /books/?author_id&sort",
+            lambda ctx: (
+                "GET",
+                f"/books/?author_id={ctx.rng.choice(ctx.author_ids)}"
+                "&sort=-date_published&limit=50",
+                None,
+            ),
+        ),
+        Scenario(
+            "GET /books/?year_from&year_to",
+            lambda ctx: (
+                "GET",
+                "/books/?year_from={0}&year_to={0}&limit=50".format(
+                    ctx.rng.randint(1850, 2024)
+                ),
+                None,
+            ),
+        ),
+        Scenario(
+            "GET /books/{book_id}",
+            lambda ctx: ("GET", f"/books/{ctx.rng.choice(ctx.book_ids)}", None),
+        ),
+        Scenario(
+            "GET /books/search/?author_name",
+            lambda ctx: (
+                "GET",
+                "/books/search/?author_name=" + _author_word(ctx),
+                None,
+            ),
+        ),
+        Scenario(
+            "GET /authors/suggest",
+            lambda ctx: (
+                "GET",
+                "/authors/suggest?prefix=" + _author_word(ctx)[:3],
+                None,
+            ),
+        ),
+        Scenario(
+            "GET /books/search/?q",
+            lambda ctx: (
+                "GET",
+                "/books/search/?q=" + ctx.rng.choice(("soledad", "laberinto", "rio")),
+                None,
+            ),
+        ),
+        Scenario(
+            "GET /books/export",
+            lambda ctx: ("GET", "/books/export", None),
+            max_requests=20,
+        ),
+        Scenario(
+            "GET /stats/books-by-year",
+            lambda ctx: ("GET", "/stats/books-by-year", None),
+        ),
+        Scenario(
+            "GET /stats/books-by-author",
+            lambda ctx: ("GET", "/stats/books-by-author?limit=20", None),
+        ),
+        Scenario(
+            "GET /stats/newest-books",
+            lambda ctx: ("GET", "/stats/newest-books?limit=20", None),
+        ),
+        # Escrituras: crear
+        Scenario(
+            "POST /authors/",
+            lambda ctx: ("POST", "/authors/", {"full_name": f"Autor {ctx.unique()}"}),
+            _remember("authors"),
+            write_requests,
+        ),
+        Scenario(
+            "POST /authors/bulk",
+            lambda ctx: (
+                "POST",
+                "/authors/bulk",
+                [{"full_name": f"Autor {ctx.unique()}"} for _ in range(bulk_size)],
+            ),
+            _remember("authors_bulk"),
+            write_requests,
+        ),
+        Scenario(
+            "POST /books/",
+            lambda ctx: ("POST", "/books/", _new_book(ctx)),
+            _remember("books"),
+            write_requests,
+        ),
+        Scenario(
+            "POST /books/bulk",
+            lambda ctx: (
+                "POST",
+                "/books/bulk",
+                [_new_book(ctx) for _ in range(bulk_size)],
+            ),
+            _remember("books_bulk"),
+            write_requests,
+        ),
+        # Escrituras: actualizar lo creado
+        Scenario(
+            "PUT /authors/{author_id}",
+            _with(
+                _cycle("authors"),
+                lambda ctx, author_id: (
+                    "PUT",
+                    f"/authors/{author_id}",
+                    {"full_name": f"Autor {ctx.unique()}"},
+                ),
+            ),
+            max_requests=write_requests,
+        ),
+        Scenario(
+            "PATCH /authors/{author_id}",
+            _with(
+                _cycle("authors"),
+                lambda ctx, author_id: (
+                    "PATCH",
+                    f"/authors/{author_id}",
+                    {"full_name": f"Autor {ctx.unique()}"},
+                ),
+            ),
+            max_requests=write_requests,
+        ),
+        Scenario(
+            "PUT /books/{book_id}",
+            _with(
+                _cycle("books"),
+                lambda ctx, book_id: ("PUT", f"/books/{book_id}", _new_book(ctx)),
+            ),
+            max_requests=write_requests,
+        ),
+        Scenario(
+            "PATCH /books/{book_id}",
+            _with(
+                _cycle("books"),
+                lambda ctx, book_id: (
+                    "PATCH",
+                    f"/books/{book_id}",
+                    {"title": f"Libro de benchmark {ctx.unique()}"},
+                ),
+            ),
+            max_requests=write_requests,
+        ),
+        # Escrituras: eliminar lo creado
+        Scenario(
+            "DELETE /books/{book_id}",
+            _with(
+                take_created_books,
+                lambda ctx, ids: ("DELETE", f"/books/{ids[0]}", None),
+            ),
+        ),
+        Scenario(
+            "DELETE /books/bulk",
+            _with(
+                _take("books_bulk", bulk_size),
+                lambda ctx, ids: ("DELETE", "/books/bulk", {"ids": ids}),
+            ),
+        ),
+        Scenario(
+            "DELETE /authors/{author_id}",
+            _with(
+                take_created_authors,
+                lambda ctx, ids: ("DELETE", f"/authors/{ids[0]}", None),
+            ),
+        ),
+        Scenario(
+            "DELETE /authors/bulk",
+            _with(
+                _take("authors_bulk", bulk_size),
+                lambda ctx, ids: ("DELETE", "/authors/bulk", {"ids": ids}),
+            ),
+        ),
+        # Administración
+        Scenario("GET /admin/pool", lambda ctx: ("GET", "/admin/pool", None)),
+        Scenario("GET /admin/cache", lambda ctx: ("GET", "/admin/cache", None)),
+        Scenario(
+            "GET /admin/diagnostics", lambda ctx: ("GET", "/admin/diagnostics", None)
+        ),
+        Scenario("GET /metrics", lambda ctx: ("GET", "/metrics", None)),
+    ]
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """
+    Resume una fase.
+
+    Args:
+        latencies (list[float]): Latencia de cada petición, en segundos.
+        errors (int): Peticiones con error de red o código >= 400.
+        elapsed (float): Duración de la fase, en segundos.
+
+    Returns:
+        dict: Peticiones, errores, throughput (peticiones/s) y latencias en ms.
+    """
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": len(values) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ctx: Context,
+    concurrency: int,
+    duration: float,
+    record: bool = True,
+) -> dict:
+    """
+    Ejecuta una fase con `concurrency` clientes en lazo cerrado hasta que se cumple la
+    duración, se alcanza max_requests o la fase se queda sin trabajo.
+
+    Returns:
+        dict: Resumen de la fase (ver summarize).
+    """
+    latencies: list[float] = []
+    errors = 0
+    budget = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            if scenario.max_requests is not None:
+                if next(budget) >= scenario.max_requests:
+                    return
+            request = scenario.request(ctx)
+            if request is None:
+                return
+            method, url, body = request
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latency = time.perf_counter() - start
+            if response.status_code >= 400:
+                errors += 1
+            if record:
+                latencies.append(latency)
+            if scenario.on_response is not None:
+                scenario.on_response(ctx, response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def discover(client: httpx.AsyncClient, ctx: Context, sample: int = 1000):
+    """
+    Toma una muestra de IDs del catálogo para las lecturas de detalle.
+
+    Raises:
+        SystemExit: Si el catálogo está vacío.
+    """
+    authors = (await client.get(f"/authors/?limit={sample}")).json()
+    books = (await client.get(f"/books/?limit={sample}")).json()
+    if not authors or not books:
+        raise SystemExit("El catálogo está vacío; siémbrelo con benchmarks.seed.")
+    ctx.author_ids = [author["id"] for author in authors]
+    ctx.author_names = [author["full_name"] for author in authors]
+    ctx.book_ids = [book["id"] for book in books]
+
+
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    write_requests: int,
+    bulk_size: int,
+    only: str | None = None,
+    seed: int = 42,
+) -> dict:
+    """
+    Ejecuta todas las fases y devuelve los resultados por endpoint.
+
+    Returns:
+        dict: Resumen de cada fase, por nombre.
+    """
+    ctx = Context(run=uuid.uuid4().hex[:8], rng=random.Random(seed))
+    await discover(client, ctx)
+    scenarios = build_scenarios(write_requests, bulk_size)
+    if only:
+        pattern = re.compile(only)
+        selected = [scenario for scenario in scenarios if pattern.search(scenario.name)]
+        # Las escrituras necesitan las fases que crean y eliminan sus entidades.
+        writes = any(not scenario.name.startswith("GET ") for scenario in selected)
+        scenarios = [
+            scenario
+            for scenario in scenarios
+            if scenario in selected
+            or (writes and scenario.name.startswith(("POST ", "DELETE ")))
+        ]
+
+    results = {}
+    for scenario in scenarios:
+        if warmup and scenario.max_requests is None and scenario.name.startswith("GET"):
+            await run_scenario(client, scenario, ctx, concurrency, warmup, record=False)
+        result = await run_scenario(client, scenario, ctx, concurrency, duration)
+        results[scenario.name] = result
+        print(
+            f"{scenario.name:42} {result['throughput_rps']:9.1f} req/s  "
+            f"p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  "
+            f"p99 {result['p99_ms']:8.2f} ms  errores {result['errors']}",
+            flush=True,
+        )
+    await cleanup(client, ctx)
+    return results
+
+
+async def cleanup(client: httpx.AsyncClient, ctx: Context, batch: int = 500):
+    """Elimina las entidades creadas que no alcanzaron a eliminar las fases DELETE."""
+    for path, pools in (
+        ("/books/bulk", ("books", "books_bulk")),
+        ("/authors/bulk", ("authors", "authors_bulk")),
+    ):
+        ids = [item for pool in pools for item in ctx.pool(pool)]
+        for start in range(0, len(ids), batch):
+            await client.request(
+                "DELETE", path, json={"ids": ids[start : start + batch]}
+            )
+        for pool in pools:
+            ctx.pool(pool).clear()
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Compara dos corridas. Un endpoint presente en ambas empeora si su p95 aumentó o
+    su throughput disminuyó más que `threshold` (fracción, por ejemplo 0.1 = 10 %).
+
+    Args:
+        baseline (dict): Resultados de referencia (el JSON de una corrida anterior).
+        current (dict): Resultados actuales.
+        threshold (float): Tolerancia relativa.
+
+    Returns:
+        list[str]: Descripción de cada regresión encontrada.
+    """
+    regressions = []
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if not before or not before["requests"] or not now["requests"]:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']:.2f} -> {now['p95_ms']:.2f} ms"
+            )
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']:.1f} -> "
+                f"{now['throughput_rps']:.1f} req/s"
+            )
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _client(args) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.in_process:
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=args.timeout
+        )
+    return httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Ejecutar la API en este proceso (httpx.ASGITransport), sin servidor",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--write-requests", type=int, default=500)
+    parser.add_argument("--bulk-size", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--only", help="Expresión regular sobre el nombre de la fase")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", help="Etiqueta libre de la corrida")
+    parser.add_argument("--output", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", help="Resultados JSON de referencia")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    async def run():
+        async with _client(args) as client:
+            return await run_benchmark(
+                client,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                write_requests=args.write_requests,
+                bulk_size=args.bulk_size,
+                only=args.only,
+                seed=args.seed,
+            )
+
+    results = {
+        "meta": {
+            "label": args.label,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "target": "in-process" if args.in_process else args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "python": platform.python_version(),
+        },
+        "endpoints": asyncio.run(run()),
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(json.load(baseline_file), results, args.threshold)
+        if regressions:
+            print(f"\nRegresiones (tolerancia {args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nSin regresiones respecto de {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
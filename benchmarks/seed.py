@@ -0,0 +1,262 @@
+"""
+Generador de catálogos sintéticos para los benchmarks.
+
+Carga autores y libros con COPY (en bloques, dentro de una sola transacción), con una
+distribución de libros por autor sesgada (Zipf): unos pocos autores concentran gran
+parte del catálogo, como en una biblioteca real. Con la misma semilla se genera
+exactamente el mismo catálogo, por lo que los resultados de distintas corridas son
+comparables.
+
+Las tablas deben estar vacías, o se debe pasar --truncate para vaciarlas (TRUNCATE ...
+RESTART IDENTITY). Después de cargar, reinicie la API: las cachés de entidades no se
+enteran de un TRUNCATE.
+
+Uso:
+    python -m benchmarks.seed --books 10000 --truncate
+    python -m benchmarks.seed --books 1000000 --authors 50000 --zipf 1.2 --truncate
+"""
+
+import argparse
+import io
+import itertools
+import os
+import random
+import time
+from datetime import date, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+PRESETS = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+CHUNK_ROWS = 100_000
+
+# fmt: off
+FIRST_NAMES = (
+    "Gabriel", "Isabel", "Jorge", "Julio", "Clarice", "Octavio", "Elena", "Mario",
+    "Rosario", "Juan", "Alejandra", "Roberto", "María", "Carlos", "Silvina", "Pablo",
+    "Laura", "Ernesto", "Teresa", "Andrés", "Rómulo", "Gioconda", "Horacio", "Ángeles",
+)
+LAST_NAMES = (
+    "García", "Allende", "Borges", "Cortázar", "Lispector", "Paz", "Garro", "Vargas",
+    "Castellanos", "Rulfo", "Pizarnik", "Bolaño", "Luiselli", "Fuentes", "Ocampo",
+    "Neruda", "Esquivel", "Sábato", "de la Parra", "Caicedo", "Gallegos", "Belli",
+    "Quiroga", "Mastretta", "Onetti", "Mutis",
+)
+TITLE_WORDS = (
+    "soledad", "laberinto", "casa", "espíritus", "noche", "río", "sombra", "ciudad",
+    "perros", "amor", "tiempo", "cólera", "memoria", "tinta", "silencio", "viento",
+    "jardín", "senderos", "espejo", "isla", "pasos", "llano", "fuego", "agua", "sal",
+)
+# fmt: on
+TITLE_PATTERNS = (
+    "{a} de {b}",
+    "El {a} y la {b}",
+    "Cien años de {a}",
+    "La {a} del {b}",
+    "Crónica de una {a}",
+    "{a}",
+)
+
+
+def zipf_cum_weights(count: int, exponent: float) -> list[float]:
+    """
+    Pesos acumulados de una distribución de Zipf: el autor de rango k recibe un peso
+    proporcional a 1 / k^exponent.
+
+    Args:
+        count (int): Número de autores.
+        exponent (float): Exponente de la distribución (0 = uniforme).
+
+    Returns:
+        list[float]: Pesos acumulados, para random.choices.
+    """
+    return list(
+        itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1))
+    )
+
+
+def author_rows(count: int, rng: random.Random):
+    for author_id in range(1, count + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {author_id}"
+        yield author_id, name
+
+
+def book_rows(books: int, authors: int, exponent: float, rng: random.Random):
+    # El rango de popularidad no coincide con el ID: los autores más prolíficos quedan
+    # repartidos por toda la tabla, no concentrados en los primeros IDs.
+    by_rank = list(range(1, authors + 1))
+    rng.shuffle(by_rank)
+    cum_weights = zipf_cum_weights(authors, exponent)
+    first_day = date(1850, 1, 1)
+    days = (date(2025, 1, 1) - first_day).days
+
+    for start in range(1, books + 1, CHUNK_ROWS):
+        size = min(CHUNK_ROWS, books - start + 1)
+        ranks = rng.choices(range(authors), cum_weights=cum_weights, k=size)
+        for book_id, rank in zip(range(start, start + size), ranks):
+            pattern = rng.choice(TITLE_PATTERNS)
+            title = pattern.format(
+                a=rng.choice(TITLE_WORDS), b=rng.choice(TITLE_WORDS)
+            ).capitalize()
+            published = (
+                None
+                if rng.random() < 0.05
+                else first_day + timedelta(days=rng.randrange(days))
+            )
+            isbn = f"978{book_id:010d}"
+            yield book_id, f"{title} {book_id}", by_rank[rank], isbn, published
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return r"\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(cursor, table: str, columns: tuple, rows) -> int:
+    """
+    Carga filas con COPY FROM STDIN (formato de texto), en bloques de CHUNK_ROWS para
+    no acumular el catálogo completo en memoria.
+
+    Args:
+        cursor: Cursor de psycopg2.
+        table (str): Tabla destino.
+        columns (tuple): Columnas en el orden de cada fila.
+        rows: Iterable de tuplas.
+
+    Returns:
+        int: Número de filas cargadas.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, CHUNK_ROWS)):
+        buffer = io.StringIO()
+        for row in chunk:
+            buffer.write("\t".join(map(_copy_value, row)))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        total += len(chunk)
+    return total
+
+
+def seed(
+    database_url: str,
+    books: int,
+    authors: int,
+    exponent: float = 1.1,
+    seed_value: int = 42,
+    truncate: bool = False,
+) -> dict:
+    """
+    Genera y carga un catálogo sintético.
+
+    Args:
+        database_url (str): URL de SQLAlchemy de la base de datos (psycopg2).
+        books (int): Número de libros.
+        authors (int): Número de autores.
+        exponent (float): Exponente de Zipf para los libros por autor.
+        seed_value (int): Semilla del generador.
+        truncate (bool): Vaciar las tablas antes de cargar.
+
+    Raises:
+        SystemExit: Si las tablas tienen datos y no se pidió vaciarlas.
+
+    Returns:
+        dict: Filas cargadas y duración de cada fase.
+    """
+    rng = random.Random(seed_value)
+    engine = create_engine(database_url)
+    connection = engine.raw_connection()
+    timings = {}
+    try:
+        cursor = connection.cursor()
+        # La carga es reproducible: si falla, se vuelve a generar.
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        if truncate:
+            cursor.execute("TRUNCATE books, authors RESTART IDENTITY")
+        else:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM authors)")
+            if cursor.fetchone()[0]:
+                raise SystemExit(
+                    "La tabla authors tiene datos; use --truncate para reemplazarlos."
+                )
+
+        start = time.perf_counter()
+        copy_rows(cursor, "authors", ("id", "full_name"), author_rows(authors, rng))
+        timings["authors_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        copy_rows(
+            cursor,
+            "books",
+            ("id", "title", "author_id", '"ISBN"', "date_published"),
+            book_rows(books, authors, exponent, rng),
+        )
+        timings["books_s"] = time.perf_counter() - start
+
+        for table in ("authors", "books"):
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)"
+            )
+        connection.commit()
+
+        # ANALYZE fuera de la transacción de carga, para que el planificador conozca
+        # el nuevo tamaño de las tablas antes del benchmark.
+        start = time.perf_counter()
+        cursor.execute("ANALYZE authors")
+        cursor.execute("ANALYZE books")
+        connection.commit()
+        timings["analyze_s"] = time.perf_counter() - start
+    finally:
+        connection.close()
+        engine.dispose()
+    return {"authors": authors, "books": books, **timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--books",
+        default="10k",
+        help="Número de libros, o uno de: " + ", ".join(PRESETS),
+    )
+    parser.add_argument(
+        "--authors",
+        type=int,
+        default=None,
+        help="Número de autores (por defecto, uno por cada 20 libros)",
+    )
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    load_dotenv(".env")
+    books = PRESETS.get(args.books.lower()) or int(args.books)
+    authors = args.authors or max(1, books // 20)
+    result = seed(
+        args.database_url or os.getenv("DATABASE_URL"),
+        books=books,
+        authors=authors,
+        exponent=args.zipf,
+        seed_value=args.seed,
+        truncate=args.truncate,
+    )
+    print(
+        f"autores: {result['authors']:,} en {result['authors_s']:.1f} s, "
+        f"libros: {result['books']:,} en {result['books_s']:.1f} s, "
+        f"ANALYZE: {result['analyze_s']:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()